@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+SPIKE Prime Mission Time Estimator
+Estimates how long each launch takes - without booking table time
+
+Reads a season folder on your computer (season_config.py plus every
+launch_*.py file and its MISSION_CONFIG) and adds up:
+    • every drivebase.straight()/turn()/arc(), robot.straight_hold() and
+      attachment run_angle(),
+      using trapezoid speed profiles (accelerate, cruise, decelerate)
+      from the configured speeds and accelerations
+    • every explicit wait()
+
+Usage:
+    # Estimate all launches in a season folder
+    python estimate_season.py unearthed
+
+    # Show the time of every single step
+    python estimate_season.py unearthed --steps
+
+    # Estimate other mission files too
+    python estimate_season.py unearthed --pattern "mission_*.py"
+
+The numbers are estimates: they ignore wheel slip, motor settling time and
+the time spent in loops (line squaring, warm-up, while loops, ...), which
+are listed as "not estimated". Where a launch has if/else, the longer branch
+is counted.
+"""
+
+import argparse
+import ast
+import glob
+import math
+import os
+import sys
+
+# Acceleration RobotController sets on attachment motors (deg/s²)
+ATTACHMENT_ACCELERATION = 2000
+
+
+def trapezoid_time(distance, speed, acceleration):
+    """
+    Time (s) to move a distance from standstill to standstill
+
+    The motion accelerates to `speed`, cruises and decelerates again. Short
+    moves never reach full speed and become a triangle profile instead.
+
+    Args:
+        distance: Distance to travel (mm or degrees)
+        speed: Maximum speed (mm/s or deg/s)
+        acceleration: Acceleration and deceleration (mm/s² or deg/s²)
+    """
+    distance = abs(distance)
+    speed = abs(speed)
+    if distance == 0 or speed == 0 or acceleration <= 0:
+        return 0.0
+
+    ramp_distance = speed * speed / acceleration    # accelerate + decelerate
+    if distance >= ramp_distance:
+        return distance / speed + speed / acceleration
+    return 2 * math.sqrt(distance / acceleration)
+
+
+def literal(node):
+    """Evaluate a constant expression node, or return None if it is not constant"""
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return None
+
+
+def load_class_constants(tree, class_name):
+    """Read NAME = constant assignments from a class in a parsed module"""
+    values = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            for item in node.body:
+                if isinstance(item, ast.Assign) and isinstance(item.targets[0], ast.Name):
+                    value = literal(item.value)
+                    if value is not None:
+                        values[item.targets[0].id.lower()] = value
+    return values
+
+
+def load_module_constant(tree, name):
+    """Return the constant value assigned to a module-level name, or None"""
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            if node.targets[0].id == name:
+                return literal(node.value)
+    return None
+
+
+def call_path(func):
+    """Dotted name of a call target, e.g. robot.drivebase.straight"""
+    parts = []
+    while isinstance(func, ast.Attribute):
+        parts.append(func.attr)
+        func = func.value
+    if isinstance(func, ast.Name):
+        parts.append(func.id)
+    return ".".join(reversed(parts))
+
+
+class MissionEstimator:
+    """Walks one mission's run() function and times every motion and wait"""
+
+    def __init__(self, config):
+        """
+        Args:
+            config: Merged season defaults + MISSION_CONFIG (lower-case keys)
+        """
+        self.straight_speed = config.get("drive_speed", 200)
+        self.straight_acceleration = config.get("drive_acceleration", 800)
+        self.turn_rate = config.get("turn_rate", 60)
+        self.turn_acceleration = config.get("turn_acceleration", 120)
+        self.steps = []     # (description, seconds, is_wait)
+
+    def add(self, description, seconds, is_wait=False):
+        self.steps.append((description, seconds, is_wait))
+
+    def straight(self, distance):
+        return trapezoid_time(distance, self.straight_speed, self.straight_acceleration)
+
+    def turn(self, angle):
+        return trapezoid_time(angle, self.turn_rate, self.turn_acceleration)
+
+    def arc(self, radius, angle):
+        return self.straight(radius * math.radians(angle))
+
+    def plan_step(self, step):
+        """Time one mission_plan step tuple"""
+        op, args = step[0], step[1:]
+        text = f"{op}{args}"
+        if op == "straight":
+            self.add(text, self.straight(args[0]))
+        elif op == "hold":
+            speed = args[1] if len(args) > 1 else self.straight_speed
+            self.add(text, trapezoid_time(args[0], speed, self.straight_acceleration))
+        elif op == "turn":
+            self.add(text, self.turn(args[0]))
+        elif op == "arc":
+            self.add(text, self.arc(args[0], args[1]))
+        elif op in ("left", "right"):
+            self.add(text, trapezoid_time(args[1], args[0], ATTACHMENT_ACCELERATION))
+        elif op == "wait":
+            self.add(text, args[0] / 1000, is_wait=True)
+        elif op == "speed":
+            self.straight_speed = args[0]
+        elif op == "flow":
+            self.sequence(args[0], text)
+        elif op in ("mark", "pose"):
+            pass
+        else:
+            self.add(f"{text} (not estimated)", 0.0)
+
+    def sequence(self, segments, text):
+        """
+        Time a run_sequence() chain
+
+        Moves inside a chain do not stop in between, so each one is counted
+        at cruise speed plus one accelerate/decelerate ramp per stop.
+        """
+        total = 0.0
+        moving = False
+        for segment in segments:
+            op = segment[0]
+            if op in ("stop", "wait"):
+                if moving:
+                    total += self.straight_speed / self.straight_acceleration
+                    moving = False
+                if op == "wait":
+                    self.add(f"wait({segment[1]})", segment[1] / 1000, is_wait=True)
+                continue
+            if op == "turn":
+                total += abs(segment[1]) / self.turn_rate
+            elif op == "arc":
+                total += abs(segment[1] * math.radians(segment[2])) / self.straight_speed
+            else:
+                total += abs(segment[1]) / self.straight_speed
+            moving = True
+        if moving:
+            total += self.straight_speed / self.straight_acceleration
+        self.add(text, total)
+
+    def call(self, node, constants):
+        """Time one call found in run()"""
+        path = call_path(node.func)
+        name = path.split(".")[-1]
+        args = [literal(arg) for arg in node.args]
+        keywords = {kw.arg: literal(kw.value) for kw in node.keywords}
+        text = f"{path.replace('robot.', '')}({', '.join(str(a) for a in args)})"
+
+        if None in args and name != "run_plan":
+            self.add(f"{text} (not estimated)", 0.0)
+        elif path.endswith("drivebase.straight"):
+            self.add(text, self.straight(args[0]))
+        elif path.endswith("straight_hold"):
+            speed = args[1] if len(args) > 1 else keywords.get("speed") or self.straight_speed
+            self.add(text, trapezoid_time(args[0], speed, self.straight_acceleration))
+        elif path.endswith("drivebase.turn"):
+            self.add(text, self.turn(args[0]))
+        elif path.endswith("drivebase.arc") and len(args) >= 2:
+            self.add(text, self.arc(args[0], args[1]))
+        elif path.endswith("drivebase.settings"):
+            self.straight_speed = keywords.get("straight_speed") or self.straight_speed
+            self.straight_acceleration = keywords.get("straight_acceleration") or self.straight_acceleration
+            self.turn_rate = keywords.get("turn_rate") or self.turn_rate
+            self.turn_acceleration = keywords.get("turn_acceleration") or self.turn_acceleration
+        elif path.endswith("attachment.run_angle"):
+            self.add(text, trapezoid_time(args[1], args[0], ATTACHMENT_ACCELERATION))
+        elif path == "wait":
+            self.add(text, args[0] / 1000, is_wait=True)
+        elif path.endswith("run_sequence"):
+            self.sequence(args[0], "run_sequence(...)")
+        elif name == "run_plan":
+            plan = constants.get(getattr(node.args[1], "id", None))
+            if plan is None:
+                self.add("run_plan (not estimated)", 0.0)
+            else:
+                for step in plan:
+                    self.plan_step(step)
+        elif path.startswith("robot.") or path.startswith("line_moves."):
+            self.add(f"{text} (not estimated)", 0.0)
+
+    def walk(self, statements, constants):
+        """
+        Visit statements in execution order
+
+        Loops with a constant range are repeated, if/else counts the longer
+        branch, try/with bodies are walked and while loops are listed as
+        "not estimated" (how often they run depends on the robot).
+        """
+        for statement in statements:
+            if isinstance(statement, (ast.Expr, ast.Assign, ast.AugAssign, ast.AnnAssign, ast.Return)):
+                value = statement.value
+                if isinstance(value, ast.Await):
+                    value = value.value
+                if isinstance(value, ast.Call):
+                    self.call(value, constants)
+            elif isinstance(statement, ast.For):
+                repeats = None
+                if isinstance(statement.iter, ast.Call) and call_path(statement.iter.func) == "range":
+                    bounds = [literal(arg) for arg in statement.iter.args]
+                    if None not in bounds:
+                        repeats = len(range(*bounds))
+                if repeats is None:
+                    self.add("for loop (not estimated)", 0.0)
+                else:
+                    for _ in range(repeats):
+                        self.walk(statement.body, constants)
+            elif isinstance(statement, ast.While):
+                self.add("while loop (not estimated)", 0.0)
+            elif isinstance(statement, ast.If):
+                branch = self.branch(statement.body, constants)
+                other = self.branch(statement.orelse, constants)
+                if sum(seconds for _, seconds, _ in other) > sum(seconds for _, seconds, _ in branch):
+                    branch = other
+                self.steps.extend(branch)
+            elif isinstance(statement, ast.Try):
+                self.walk(statement.body, constants)
+                self.walk(statement.orelse, constants)
+                self.walk(statement.finalbody, constants)
+            elif isinstance(statement, ast.With):
+                self.walk(statement.body, constants)
+
+    def branch(self, statements, constants):
+        """Steps of one if/else branch, without adding them yet"""
+        steps = self.steps
+        self.steps = []
+        self.walk(statements, constants)
+        branch, self.steps = self.steps, steps
+        return branch
+
+
+def estimate_mission(path, defaults):
+    """
+    Estimate one mission file
+
+    Returns:
+        List of (description, seconds, is_wait) steps, or None if the file has no run()
+    """
+    with open(path, "r") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    config = dict(defaults)
+    mission_config = load_module_constant(tree, "MISSION_CONFIG") or {}
+    for key, value in mission_config.items():
+        config[key.lower()] = value
+
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            value = literal(node.value)
+            if value is not None:
+                constants[node.targets[0].id] = value
+
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "run":
+            estimator = MissionEstimator(config)
+            estimator.walk(node.body, constants)
+            return estimator.steps
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Estimate how long each launch in a season takes",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("season", nargs="?", default=".", help="Path to season folder")
+    parser.add_argument("--pattern", default="launch_*.py",
+                        help="Mission files to estimate (default: launch_*.py)")
+    parser.add_argument("--steps", action="store_true", help="Show the time of every step")
+    args = parser.parse_args()
+
+    config_path = os.path.join(args.season, "season_config.py")
+    if not os.path.exists(config_path):
+        print(f"❌ season_config.py not found in {args.season}")
+        return 1
+
+    with open(config_path, "r") as f:
+        defaults = load_class_constants(ast.parse(f.read()), "SeasonDefaults")
+
+    files = sorted(glob.glob(os.path.join(args.season, args.pattern)))
+    if not files:
+        print(f"❌ No files match {args.pattern} in {args.season}")
+        return 1
+
+    print("=" * 60)
+    print(f"⏱  Mission time estimate: {os.path.basename(os.path.abspath(args.season))}")
+    print("=" * 60)
+
+    season_total = 0.0
+    for path in files:
+        steps = estimate_mission(path, defaults)
+        if steps is None:
+            continue
+
+        total = sum(seconds for _, seconds, _ in steps)
+        idle = sum(seconds for _, seconds, is_wait in steps if is_wait)
+        skipped = sum(1 for text, _, _ in steps if text.endswith("(not estimated)"))
+        season_total += total
+
+        print(f"\n{os.path.basename(path)}")
+        if args.steps:
+            for text, seconds, is_wait in steps:
+                marker = "  (idle)" if is_wait else ""
+                print(f"    {seconds:6.2f} s  {text}{marker}")
+        share = 100 * idle / total if total else 0
+        print(f"  Total: {total:6.2f} s   Waiting: {idle:5.2f} s ({share:.0f}%)")
+        if skipped:
+            print(f"  ⚠ {skipped} step(s) not estimated (loops, sensors, non-constant values)")
+
+    print("\n" + "-" * 60)
+    print(f"All launches: {season_total:.2f} s (menu time between launches not included)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
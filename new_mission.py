@@ -13,10 +13,14 @@ Usage:
     # Headless mode (for AI/scripting)
     python new_mission.py --season path/to/season --name "Mission Name" \
         --description "Description" --speed 200 --turn-rate 60 --template guided
+
+    # Plan-style mission (steps listed as data, run by mission_plan.py)
+    python new_mission.py --season path/to/season --name "Mission Name" --template plan
 """
 
 import os
 import re
+import shutil
 import sys
 import argparse
 
@@ -186,9 +190,14 @@ def update_season_menu(folder, mission_num, mission_name, mission_desc, mission_
     # Extract mission module name (without .py)
     mission_module = mission_filename.replace(".py", "")
 
+    # Lazy-loading menus register missions by module name and need no import
+    lazy_menu = '"module": "' in content
+
     # Add import
     import_line = f"import {mission_module}"
-    if "# No missions yet" in content:
+    if lazy_menu:
+        pass
+    elif "# No missions yet" in content:
         # First mission - replace the placeholder
         content = content.replace(
             "# No missions yet - use new_mission.py to add missions",
@@ -206,10 +215,14 @@ def update_season_menu(folder, mission_num, mission_name, mission_desc, mission_
         content = "\n".join(lines)
 
     # Add to missions dictionary
+    if lazy_menu:
+        mission_ref = f'"module": "{mission_module}"'
+    else:
+        mission_ref = f'"run_function": {mission_module}'
     mission_entry = f'''            "{mission_num}": {{
                 "name": "{mission_name}",
                 "description": "{mission_desc}",
-                "run_function": {mission_module}
+                {mission_ref}
             }}'''
 
     if "# No missions yet" in content:
@@ -267,7 +280,17 @@ def update_season_menu(folder, mission_num, mission_name, mission_desc, mission_
 
     existing_missions.sort()
     mission_range = f"1-{max(existing_missions)}" if existing_missions else "none"
-    mission_options = ', '.join([f'"{m}"' for m in existing_missions] + ['"Q"'])
+
+    # Keep extra menu options (e.g. "T" for launch times) in front of "Q"
+    extra_options = []
+    menu_call = re.search(r'selected = hub_menu\(([^)]+)\)', content)
+    if menu_call:
+        for option in re.findall(r'"([^"]+)"', menu_call.group(1)):
+            if not option.isdigit() and option != "Q" and option not in extra_options:
+                extra_options.append(option)
+
+    mission_options = ', '.join([f'"{m}"' for m in existing_missions] +
+                                [f'"{o}"' for o in extra_options] + ['"Q"'])
 
     # Update the mission range in the print statement
     # Match either literal \n or actual newline in the f-string
@@ -300,7 +323,7 @@ def create_mission(season_folder, mission_name, mission_desc=None, drive_speed=2
         mission_desc: Description (defaults to mission_name)
         drive_speed: Drive speed in mm/s (default: 200)
         turn_rate: Turn rate in degrees/s (default: 60)
-        template_style: "simple" or "guided" (default: "guided")
+        template_style: "simple", "guided" or "plan" (default: "guided")
         quiet: If True, suppress output (default: False)
 
     Returns:
@@ -331,6 +354,8 @@ def create_mission(season_folder, mission_name, mission_desc=None, drive_speed=2
     # Determine template
     if template_style.lower() in ["simple", "1"]:
         template_name = "_template_mission_simple.py"
+    elif template_style.lower() in ["plan", "3"]:
+        template_name = "_template_mission_plan.py"
     else:
         template_name = "_template_mission_guided.py"
 
@@ -351,6 +376,16 @@ def create_mission(season_folder, mission_name, mission_desc=None, drive_speed=2
         TURN_RATE=turn_rate
     )
 
+    # Plan-style missions need the shared step runner in the season folder
+    if template_name == "_template_mission_plan.py":
+        runner_path = os.path.join(season_folder, "mission_plan.py")
+        if not os.path.exists(runner_path):
+            runner_file = find_template_file("mission_plan.py", season_folder)
+            if not runner_file:
+                return False, None, "Template not found: mission_plan.py"
+            shutil.copy(runner_file, runner_path)
+            log("✅ Copied: mission_plan.py (plan step runner)")
+
     # Write mission file
     with open(mission_filepath, "w") as f:
         f.write(mission_content)
@@ -394,7 +429,7 @@ Examples:
     parser.add_argument("--description", help="Mission description")
     parser.add_argument("--speed", type=int, help="Drive speed (mm/s, default: 200)")
     parser.add_argument("--turn-rate", type=int, help="Turn rate (deg/s, default: 60)")
-    parser.add_argument("--template", choices=["simple", "guided"],
+    parser.add_argument("--template", choices=["simple", "guided", "plan"],
                        help="Template style (default: guided)")
     parser.add_argument("--quiet", action="store_true",
                        help="Suppress output (for scripting)")
@@ -472,8 +507,9 @@ Examples:
         print("  Choose how much help you want:")
         print("    1. Simple  - Minimal template with quick start examples")
         print("    2. Guided  - Full examples with detailed comments (recommended for beginners)")
-        template_choice = get_input("  Template style (1/2)", "2", valid_options=["1", "2"])
-        template_style = "simple" if template_choice == "1" else "guided"
+        print("    3. Plan    - Mission written as a list of steps (compact and timed)")
+        template_choice = get_input("  Template style (1/2/3)", "2", valid_options=["1", "2", "3"])
+        template_style = {"1": "simple", "2": "guided", "3": "plan"}[template_choice]
 
         print("\n" + "=" * 50)
         print("Creating mission...")
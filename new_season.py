@@ -114,7 +114,8 @@ def create_season(season_name, team_name, description=None,
 
     # Copy shared utility files
     template_dir = "season_template"
-    for util_file in ["robot_controller.py", "display_patterns.py", "line_movements.py"]:
+    for util_file in ["robot_controller.py", "display_patterns.py", "line_movements.py",
+                      "mission_plan.py"]:
         shutil.copy(
             os.path.join(template_dir, util_file),
             os.path.join(folder_name, util_file)
@@ -3,7 +3,7 @@ Line Movements
 Functions for line detection and line-following behaviors
 """
 
-from pybricks.tools import wait
+from pybricks.tools import wait, StopWatch
 
 
 class LineMovements:
@@ -198,3 +198,134 @@ class LineMovements:
         print(f"  Final readings - Left: {left_reflection}% | Right: {right_reflection}%")
         print(f"  Difference: {abs(left_reflection - right_reflection)}%")
         print()
+
+    def follow_line_edge(self, distance, speed=None, sensor='left', target_reflection=None,
+                         edge='left', kp=None, ki=None, kd=None):
+        """
+        Follow the edge of a line with a PID controller for a set distance
+
+        The sensor rides on the boundary between black and white, where it
+        reads about target_reflection. Too bright means it drifted off the
+        line, too dark means it drifted onto it, and the robot steers back.
+
+        The loop runs at a fixed period (LINE_LOOP_PERIOD) so the gains
+        behave the same at every speed. The faster the robot drives, the
+        further it moves between two corrections: raise the speed until it
+        starts to wobble off the line, then back off a little.
+
+        Args:
+            distance: Distance to follow the line in mm (measured by the drivebase)
+            speed: Speed along the line in mm/s (default: LINE_SPEED from config)
+            sensor: 'left' or 'right' color sensor
+            target_reflection: Reflection % on the edge (default: LINE_TARGET from config)
+            edge: Which edge of the line to follow: 'left' (white on the left)
+                  or 'right' (white on the right)
+            kp, ki, kd: PID gains (default: LINE_KP, LINE_KI, LINE_KD from config)
+
+        Returns:
+            Dictionary with loop statistics:
+                loops: Number of control loops
+                average_period: Average loop period in ms
+                max_period: Longest loop period in ms
+                overruns: Loops that took longer than LINE_LOOP_PERIOD
+
+        Example usage:
+            line_moves = LineMovements(robot)
+
+            # Follow the left edge of a line for 500 mm with the left sensor
+            stats = line_moves.follow_line_edge(distance=500, speed=150, sensor='left')
+            print(stats['average_period'])
+        """
+        if not self.robot.is_initialized:
+            raise RuntimeError("Robot not initialized. Call robot.initialize() first!")
+
+        if sensor == 'left':
+            color_sensor = self.robot.left_color_sensor
+        elif sensor == 'right':
+            color_sensor = self.robot.right_color_sensor
+        else:
+            raise ValueError(f"sensor must be 'left' or 'right', not {sensor}")
+
+        if not color_sensor:
+            raise RuntimeError(
+                f"This function needs the {sensor} color sensor!\n"
+                "  Make sure your sensors are plugged in and ports are correct in season_config.py"
+            )
+
+        config = self.config
+        if speed is None:
+            speed = config.get('line_speed', 150)
+        if target_reflection is None:
+            target_reflection = config.get('line_target', 45)
+        if kp is None:
+            kp = config.get('line_kp', 2.0)
+        if ki is None:
+            ki = config.get('line_ki', 0.0)
+        if kd is None:
+            kd = config.get('line_kd', 8.0)
+        max_turn = config.get('line_max_turn', 200)
+        period = config.get('line_loop_period', 10)
+
+        # Left edge: white is on the left, so "too bright" means steer right (positive)
+        if edge == 'right':
+            kp, ki, kd = -kp, -ki, -kd
+        elif edge != 'left':
+            raise ValueError(f"edge must be 'left' or 'right', not {edge}")
+
+        print(f"=== Follow Line Edge ===")
+        print(f"{distance} mm at {speed} mm/s, {sensor} sensor on the {edge} edge")
+
+        # Bind methods to locals: attribute lookups are slow in MicroPython
+        reflection = color_sensor.reflection
+        drive = self.drivebase.drive
+        travelled = self.drivebase.distance
+        timer = StopWatch()
+        now = timer.time
+
+        # Integral is limited so it alone can never ask for more than max_turn
+        integral_limit = abs(max_turn / ki) if ki else 0
+        start = travelled()
+        distance = abs(distance)
+        integral = 0
+        last_error = reflection() - target_reflection
+        loops = 0
+        overruns = 0
+        max_period = 0
+        last_time = 0
+        deadline = period
+
+        while abs(travelled() - start) < distance:
+            error = reflection() - target_reflection
+            if ki:
+                integral = max(-integral_limit, min(integral_limit, integral + error))
+            turn = kp * error + ki * integral + kd * (error - last_error)
+            last_error = error
+            drive(speed, max(-max_turn, min(max_turn, turn)))
+
+            # Keep a fixed period; if a loop ran late, start timing again from now
+            time = now()
+            loops += 1
+            if time - last_time > max_period:
+                max_period = time - last_time
+            if time >= deadline:
+                overruns += 1
+                deadline = time + period
+            else:
+                wait(deadline - time)
+                deadline += period
+            last_time = time
+
+        self.drivebase.stop()
+
+        stats = {
+            "loops": loops,
+            "average_period": timer.time() / loops if loops else 0,
+            "max_period": max_period,
+            "overruns": overruns,
+        }
+        print(f"✓ Followed line {distance} mm: {loops} loops, "
+              f"avg {stats['average_period']:.1f} ms, max {max_period} ms, {overruns} overruns")
+        if overruns * 10 > loops:
+            print(f"  ⚠ Loop can't keep up with {period} ms - raise LINE_LOOP_PERIOD")
+        print()
+        return stats
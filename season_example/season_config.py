@@ -34,7 +34,16 @@ class SeasonDefaults:
     TURN_RATE = 60             # degrees/s
     DRIVE_ACCELERATION = 800    # mm/s²
     TURN_ACCELERATION = 120     # degrees/s²
-    
+
+    # Line edge follower (LineMovements.follow_line_edge)
+    LINE_TARGET = 45            # Reflection % on the edge of the line (half black, half white)
+    LINE_SPEED = 150            # mm/s along the line
+    LINE_KP = 2.0               # deg/s of steering per % reflection error
+    LINE_KI = 0.0               # deg/s per % of error summed over loops
+    LINE_KD = 8.0               # deg/s per % change since the previous loop
+    LINE_MAX_TURN = 200         # deg/s steering limit
+    LINE_LOOP_PERIOD = 10       # ms per control loop (fixed, so the gains mean the same at any speed)
+
     # Display settings
     DISPLAY_DELAY = 500         # ms between display updates
     COMPLETION_BEEP_FREQ = 800  # Hz
@@ -0,0 +1,47 @@
+"""
+Mission {MISSION_NUM}: {MISSION_NAME}
+{MISSION_DESCRIPTION}
+"""
+
+from mission_plan import run_plan, run_standalone
+
+# Mission-specific configuration
+# The menu system will use these settings when initializing the robot
+MISSION_CONFIG = {{
+    "drive_speed": {DRIVE_SPEED},      # Speed in mm/s
+    "turn_rate": {TURN_RATE},          # Turn speed in degrees/s
+}}
+
+# ========================================
+# MISSION PLAN - one step per line:
+# ========================================
+#   ("straight", 500)        # Drive forward 500mm (negative = backward)
+#   ("turn", 90)             # Turn right 90 degrees (negative = left)
+#   ("arc", 150, 90)         # Drive 90 degrees along a 150mm circle
+#   ("left", 200, -105)      # Left attachment: 200 deg/s, turn -105 degrees
+#   ("right", 200, 90)       # Right attachment: 200 deg/s, turn 90 degrees
+#   ("wait", 250)            # Pause 250ms
+#   ("speed", 400)           # Drive faster from here on (mm/s)
+#
+# 💡 TIP: Steps are timed - the menu prints how long each one took!
+# ========================================
+PLAN = (
+    ("straight", 300),
+    ("turn", 90),
+    ("straight", -300),
+)
+
+def run(robot, display=None):
+    """
+    Main mission execution function
+
+    Args:
+        robot: RobotController object (already initialized and ready to use!)
+        display: DisplayPatterns object (optional)
+    """
+    print("=== Mission {MISSION_NUM}: {MISSION_NAME} ===")
+    run_plan(robot, PLAN)
+
+# Standalone testing support - allows running this mission directly
+if __name__ == "__main__":
+    run_standalone(MISSION_CONFIG, run)
@@ -0,0 +1,169 @@
+"""
+Mission Plans
+Describe a mission as a compact tuple of steps and run it with one shared runner
+
+Only steps this season's RobotController supports are listed (unearthed/
+mission_plan.py has more, for its bigger controller).
+
+A plan is a tuple of (op, args...) steps:
+    ("straight", 500)           Drive straight (mm, negative = backward)
+    ("turn", -40)               Turn in place (degrees, positive = right)
+    ("arc", 150, 90)            Drive an arc (radius mm, angle degrees)
+    ("left", 200, -105)         Run left attachment (speed deg/s, angle degrees)
+    ("right", 220, -160)        Run right attachment (speed deg/s, angle degrees)
+    ("wait", 250)               Pause (ms)
+    ("speed", 500)              Change straight speed (mm/s) for the next moves
+    ("mark", "brush down")      Timing checkpoint (see robot.mark, skipped if missing)
+
+Example mission file:
+    from mission_plan import run_plan, run_standalone
+
+    MISSION_CONFIG = {"drive_speed": 300}
+
+    PLAN = (
+        ("straight", 280),
+        ("right", 200, -220),
+        ("straight", -125),
+    )
+
+    def run(robot, display=None):
+        run_plan(robot, PLAN)
+
+    if __name__ == "__main__":
+        run_standalone(MISSION_CONFIG, run)
+"""
+
+from pybricks.tools import wait, StopWatch
+
+# Matches LogLevel.INFO in season_config (seasons without log levels always print)
+INFO = 1
+
+
+def optimize_plan(plan):
+    """
+    Merge and drop steps that do not change what the robot does
+
+    - Adjacent straights (or turns) in the same direction become one move
+    - Adjacent waits are added together, zero-length moves/waits are dropped
+    - Waits at the very end of the plan are dropped
+
+    Moves in opposite directions are never merged, so "push then back off"
+    stays two moves.
+
+    Args:
+        plan: Tuple/list of (op, args...) steps
+
+    Returns:
+        List of optimized steps
+    """
+    steps = []
+    for step in plan:
+        op = step[0]
+        if op in ("straight", "turn", "wait") and step[1] == 0:
+            continue
+
+        if steps and steps[-1][0] == op:
+            previous = steps[-1][1]
+            if op == "wait" or (op in ("straight", "turn") and (previous > 0) == (step[1] > 0)):
+                steps[-1] = (op, previous + step[1])
+                continue
+
+        steps.append(step)
+
+    while steps and steps[-1][0] == "wait":
+        steps.pop()
+
+    return steps
+
+
+def run_step(robot, step):
+    """
+    Execute a single plan step
+
+    Args:
+        robot: RobotController object (already initialized)
+        step: (op, args...) tuple
+    """
+    op = step[0]
+    if op == "straight":
+        robot.drivebase.straight(step[1])
+    elif op == "turn":
+        robot.drivebase.turn(step[1])
+    elif op == "arc":
+        robot.drivebase.arc(step[1], step[2])
+    elif op == "left":
+        robot.left_attachment.run_angle(step[1], step[2])
+    elif op == "right":
+        robot.right_attachment.run_angle(step[1], step[2])
+    elif op == "wait":
+        wait(step[1])
+    elif op == "speed":
+        robot.drivebase.settings(straight_speed=step[1])
+    elif op == "mark":
+        if hasattr(robot, "mark"):
+            robot.mark(step[1])
+    else:
+        raise ValueError(f"Unknown plan step: {op}")
+
+
+def run_plan(robot, plan, start=0, skip=(), optimize=True):
+    """
+    Run a mission plan step by step, timing every step
+
+    Args:
+        robot: RobotController object (already initialized)
+        plan: Tuple/list of (op, args...) steps
+        start: Index of the first step to run (resume part-way through a plan)
+        skip: Indexes of steps to leave out (e.g. while tuning one section)
+        optimize: Merge adjacent moves and drop redundant waits first
+
+    Returns:
+        List of (step, time_ms) pairs in the order they ran
+    """
+    steps = [plan[i] for i in range(start, len(plan)) if i not in skip]
+    if optimize:
+        steps = optimize_plan(steps)
+
+    timer = StopWatch()
+    timings = []
+    for step in steps:
+        timer.reset()
+        run_step(robot, step)
+        timings.append((step, timer.time()))
+
+    if robot.config.get('log_level', INFO) >= INFO:
+        total = 0
+        print("Plan step times:")
+        for step, time_ms in timings:
+            total += time_ms
+            print(f"  {step[0]:<9}{time_ms:>6} ms")
+        print(f"  {'total':<9}{total:>6} ms")
+
+    return timings
+
+
+def run_standalone(mission_config, run):
+    """
+    Standard standalone test for a mission file (replaces the usual __main__ block)
+
+    Args:
+        mission_config: The mission's MISSION_CONFIG dictionary
+        run: The mission's run(robot, display) function
+    """
+    from robot_controller import RobotController
+    from display_patterns import DisplayPatterns
+    from season_config import SeasonDefaults
+
+    robot = RobotController(SeasonDefaults, mission_config)
+    try:
+        robot.initialize()
+        display = DisplayPatterns(robot.hub)
+        robot.mission_start_signal()
+        run(robot, display)
+        robot.mission_success_signal()
+    except Exception as e:
+        print(f"Mission failed: {e}")
+        robot.mission_error_signal()
+        raise e
+    finally:
+        robot.cleanup()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for estimate_season.py on a computer
+Builds a small fake season and checks the estimated steps and times
+"""
+
+import math
+import os
+import shutil
+import sys
+
+from estimate_season import estimate_mission, trapezoid_time
+
+TEST_FOLDER = "test_estimate_fake"
+
+# Straight speed 200 mm/s, acceleration 800 mm/s², turn rate 60 deg/s, turn acceleration 120 deg/s²
+DEFAULTS = {"drive_speed": 200, "drive_acceleration": 800, "turn_rate": 60, "turn_acceleration": 120}
+
+LAUNCH = '''
+from pybricks.tools import wait
+
+PLAN = (("straight", 400), ("wait", 300))
+
+def run(robot, display):
+    robot.drivebase.straight(400)
+    for i in range(2):
+        robot.drivebase.turn(90)
+    stats = line_moves.square_on_line()
+    if stats["aligned"]:
+        robot.drivebase.straight(100)
+    else:
+        robot.drivebase.straight(600)
+        wait(500)
+    try:
+        robot.drivebase.straight(200)
+    finally:
+        wait(100)
+    while robot.drivebase.distance() < 900:
+        robot.drivebase.straight(10)
+    run_plan(robot, PLAN)
+'''
+
+
+def check(description, ok):
+    print(f"  {'✅' if ok else '❌'} {description}")
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("🧪 Testing Mission Time Estimates")
+    print("=" * 60)
+
+    if os.path.exists(TEST_FOLDER):
+        shutil.rmtree(TEST_FOLDER)
+    os.makedirs(TEST_FOLDER)
+    path = os.path.join(TEST_FOLDER, "launch_01_test.py")
+    with open(path, "w") as f:
+        f.write(LAUNCH)
+
+    ok = True
+    try:
+        print("\n📐 Trapezoid profiles")
+        ok &= check("400 mm at 200 mm/s, 800 mm/s²: cruise + one ramp",
+                    math.isclose(trapezoid_time(400, 200, 800), 400 / 200 + 200 / 800))
+        ok &= check("10 mm never reaches full speed: triangle profile",
+                    math.isclose(trapezoid_time(10, 200, 800), 2 * math.sqrt(10 / 800)))
+        ok &= check("Zero distance takes no time", trapezoid_time(0, 200, 800) == 0)
+
+        steps = estimate_mission(path, DEFAULTS)
+        texts = [text for text, _, _ in steps]
+
+        print("\n🚶 Statements the estimator walks into")
+        ok &= check("for range() loop repeated", texts.count("drivebase.turn(90)") == 2)
+        ok &= check("Assigned call listed as not estimated",
+                    "line_moves.square_on_line() (not estimated)" in texts)
+        ok &= check("if/else counts the longer branch",
+                    "drivebase.straight(600)" in texts and "drivebase.straight(100)" not in texts)
+        ok &= check("try body and finally walked",
+                    "drivebase.straight(200)" in texts and "wait(100)" in texts)
+        ok &= check("while loop listed as not estimated",
+                    "while loop (not estimated)" in texts and "drivebase.straight(10)" not in texts)
+        ok &= check("run_plan steps timed", "straight(400,)" in texts and "wait(300,)" in texts)
+
+        print("\n⏱  Total")
+        expected = (2 * trapezoid_time(400, 200, 800) + 2 * trapezoid_time(90, 60, 120)
+                    + trapezoid_time(600, 200, 800) + 0.5 + trapezoid_time(200, 200, 800) + 0.1 + 0.3)
+        total = sum(seconds for _, seconds, _ in steps)
+        ok &= check(f"{total:.2f} s (expected {expected:.2f} s)", math.isclose(total, expected))
+    finally:
+        shutil.rmtree(TEST_FOLDER)
+
+    print("\n" + "=" * 60)
+    if ok:
+        print("✅ All estimate tests passed!")
+        return 0
+    print("❌ Some estimate tests failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
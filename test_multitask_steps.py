@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Test script for the step generators in unearthed/ on a computer
+Runs the LineMovements methods blocking and through their *_async versions
+
+Under multitask/run_task a Pybricks sensor or wait() call returns something
+to await instead of its result. This test fakes just enough of pybricks for
+a robot driving along a straight strip of mat: in async mode every fake
+sensor read and wait() returns an awaitable, like on the hub, so a step
+generator that reads a sensor without yielding it fails here too.
+"""
+
+import math
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "unearthed"))
+
+WHEEL_CIRCUMFERENCE = math.pi * 56
+
+
+class World:
+    """Virtual clock and async flag shared by every fake device"""
+    time = 0
+    in_task = False
+    awaited = 0
+    motors = []
+
+    @classmethod
+    def advance(cls, ms):
+        for motor in cls.motors:
+            motor.position += motor.rate * ms / 1000
+        cls.time += ms
+
+
+class Awaitable:
+    """What a Pybricks call returns inside run_task()"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __await__(self):
+        World.awaited += 1
+        yield
+        return self.value
+
+
+def result(value):
+    return Awaitable(value) if World.in_task else value
+
+
+def wait(ms):
+    # Every loop takes some time on the hub, even with wait(0)
+    World.advance(max(ms, 1))
+    return result(None)
+
+
+class StopWatch:
+    def __init__(self):
+        self.start = World.time
+
+    def time(self):
+        return World.time - self.start
+
+    def reset(self):
+        self.start = World.time
+
+
+class Motor:
+    def __init__(self, *args, **kwargs):
+        self.position = 0.0
+        self.rate = 0
+        World.motors.append(self)
+
+    def run(self, speed):
+        self.rate = speed
+
+    def hold(self):
+        self.rate = 0
+
+    def angle(self):
+        return int(self.position)
+
+    def speed(self):
+        return int(self.rate)
+
+
+class DriveBase:
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def drive(self, speed, turn_rate):
+        self.left.rate = self.right.rate = speed * 360 / WHEEL_CIRCUMFERENCE
+
+    def stop(self):
+        self.left.rate = self.right.rate = 0
+
+    brake = stop
+
+    def distance(self):
+        return (self.left.position + self.right.position) / 2 * WHEEL_CIRCUMFERENCE / 360
+
+    def angle(self):
+        return 0.0
+
+
+class Color:
+    def __init__(self, h, s, v):
+        self.h, self.s, self.v = h, s, v
+
+
+class ColorSensor:
+    """Sensor next to one wheel, over a mat with black lines at LINES mm"""
+
+    def __init__(self, wheel, lines=(), zone_start=None):
+        self.wheel = wheel
+        self.lines = lines
+        self.zone_start = zone_start
+
+    def _position(self):
+        return self.wheel.position * WHEEL_CIRCUMFERENCE / 360
+
+    def reflection(self):
+        position = self._position()
+        value = 90
+        for line in self.lines:
+            # 20 mm wide black line with 5 mm soft edges
+            edge = abs(position - line) - 10
+            if edge <= 0:
+                value = 10
+            elif edge < 5:
+                value = min(value, int(10 + edge * 16))
+        return result(value)
+
+    def hsv(self):
+        if self.zone_start is not None and self._position() >= self.zone_start:
+            return result(Color(0, 90, 80))
+        return result(Color(0, 0, 100))
+
+
+class Hub:
+    class system:
+        @staticmethod
+        def storage(offset, read=None, write=None):
+            raise OSError("no storage on a computer")
+
+
+class Names:
+    """Parameters such as Port.A or Stop.HOLD, only passed through"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, attribute):
+        return f"{self.name}.{attribute}"
+
+
+def fake_module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+
+
+fake_module("pybricks")
+fake_module("pybricks.tools", wait=wait, StopWatch=StopWatch, multitask=None, run_task=None)
+fake_module("pybricks.hubs", PrimeHub=Hub)
+fake_module("pybricks.pupdevices", Motor=Motor, ColorSensor=ColorSensor)
+fake_module("pybricks.robotics", DriveBase=DriveBase)
+fake_module("pybricks.parameters", **{name: Names(name) for name in
+                                      ("Direction", "Port", "Color", "Stop", "Button", "Icon")})
+fake_module("umath", **{name: getattr(math, name) for name in dir(math) if not name.startswith("_")})
+fake_module("ustruct", pack=__import__("struct").pack, unpack=__import__("struct").unpack)
+
+from multitask_utils import run_steps, run_steps_async
+from season_config import SeasonDefaults, LogLevel, Zones
+from robot_controller import RobotController
+from line_movements import LineMovements
+from color_zones import ColorZones
+
+
+def run_async(coroutine):
+    """Drive a coroutine like run_task() does, with every fake call awaitable"""
+    World.in_task = True
+    try:
+        while True:
+            coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    finally:
+        World.in_task = False
+
+
+def new_robot(lines=(), zone_start=None):
+    """Initialized RobotController on fake devices, at the start of the strip"""
+    World.time = 0
+    World.awaited = 0
+    World.motors = []
+    robot = RobotController(SeasonDefaults, {"log_level": LogLevel.SILENT})
+    robot.left_wheel = Motor()
+    robot.right_wheel = Motor()
+    robot.drivebase = DriveBase(robot.left_wheel, robot.right_wheel)
+    robot.left_color_sensor = ColorSensor(robot.left_wheel, lines, zone_start)
+    robot.right_color_sensor = ColorSensor(robot.right_wheel, lines, zone_start)
+    robot.is_initialized = True
+    line_moves = LineMovements(robot)
+    line_moves.zones = ColorZones(robot.hub)
+    line_moves.zones.add_sample(0, 90, 80, Zones.RED)
+    line_moves.zones.is_trained = True
+    return line_moves
+
+
+def both_ways(name, setup, call):
+    """Run one LineMovements method blocking and async, return both results"""
+    line_moves = new_robot(**setup)
+    blocking = getattr(line_moves, name)(**call)
+    line_moves = new_robot(**setup)
+    awaited = run_async(getattr(line_moves, name + "_async")(**call))
+    return blocking, awaited, World.awaited
+
+
+def check(description, ok):
+    print(f"  {'✅' if ok else '❌'} {description}")
+    return ok
+
+
+def reads(sensor):
+    """Step generator that adds up three readings of a sensor"""
+    total = 0
+    for i in range(3):
+        total += yield sensor.reflection()
+        yield wait(10)
+    return total
+
+
+def main():
+    print("=" * 60)
+    print("🧪 Testing Step Generators (blocking and async)")
+    print("=" * 60)
+
+    ok = True
+
+    print("\n🔁 Step runners")
+    sensor = ColorSensor(Motor())
+    ok &= check("run_steps sends plain readings back", run_steps(reads(sensor)) == 270)
+    World.awaited = 0
+    ok &= check("run_steps_async awaits readings and sends them back",
+                run_async(run_steps_async(reads(sensor))) == 270 and World.awaited == 6)
+
+    print("\n📏 LineMovements, blocking vs async")
+    blocking, awaited, count = both_ways("drive_until_line", {"lines": (100, 250)}, {"count": 2})
+    ok &= check(f"drive_until_line: lines at {blocking} mm both ways",
+                blocking == awaited and len(blocking) == 2 and count > 0)
+
+    blocking, awaited, count = both_ways("square_on_line", {"lines": (150,)}, {})
+    ok &= check(f"square_on_line: aligned after {blocking['line_distance']:.0f} mm both ways",
+                blocking["aligned"] and awaited["aligned"]
+                and blocking["line_distance"] == awaited["line_distance"] and count > 0)
+
+    blocking, awaited, count = both_ways("follow_line_edge", {}, {"distance": 200})
+    ok &= check("follow_line_edge: same number of loops both ways",
+                blocking["loops"] == awaited["loops"] > 0 and count > 0)
+
+    blocking, awaited, count = both_ways("follow_line", {}, {"distance": 200})
+    ok &= check("follow_line: same number of loops both ways",
+                blocking["loops"] == awaited["loops"] > 0 and count > 0)
+
+    blocking, awaited, count = both_ways("drive_until_zone", {"zone_start": 180}, {"zone": Zones.RED})
+    ok &= check(f"drive_until_zone: zone at {blocking:.0f} mm both ways",
+                blocking == awaited and blocking >= 180 and count > 0)
+
+    print("\n" + "=" * 60)
+    if ok:
+        print("✅ All step generator tests passed!")
+        return 0
+    print("❌ Some step generator tests failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
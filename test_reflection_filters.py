@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for unearthed/reflection_filters.py on a computer
+Runs every filter over a reflection trace and checks it against a plain Python version
+
+Usage:
+    # Built-in trace (white -> black line -> white, with noise and spikes)
+    python test_reflection_filters.py
+
+    # Your own trace: paste the line printed by reflection_filters.record()
+    # on the hub into a text file
+    python test_reflection_filters.py my_trace.txt
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "unearthed"))
+
+from reflection_filters import MovingAverage, Median, Exponential, FilteredSensor
+
+# Sensor driving across a black line: mat ~85%, line ~10%, with
+# +/-2% noise and two single-sample glare spikes (samples 8 and 41)
+BUILT_IN_TRACE = [
+    86, 84, 85, 87, 85, 84, 86, 85, 99, 85, 84, 86,
+    80, 66, 47, 29, 16, 11, 10, 9, 11, 10, 12, 9, 10, 11,
+    14, 27, 45, 63, 78, 84, 85, 86, 84, 85, 87, 85, 84, 86, 85, 2, 85, 86, 84,
+]
+
+
+def load_trace(path):
+    """Read comma/whitespace separated samples from a text file"""
+    with open(path, "r") as f:
+        text = f.read().replace(",", " ")
+    return [int(value) for value in text.split()]
+
+
+def reference_moving_average(trace, size):
+    return [sum(trace[max(0, i - size + 1):i + 1]) // min(i + 1, size) for i in range(len(trace))]
+
+
+def reference_median(trace, size):
+    result = []
+    for i in range(len(trace)):
+        window = sorted(trace[max(0, i - size + 1):i + 1])
+        result.append(window[len(window) // 2])
+    return result
+
+
+def reference_exponential(trace, shift):
+    result = []
+    value = None
+    for sample in trace:
+        value = sample * 256 if value is None else value + ((sample * 256 - value) >> shift)
+        result.append((value + 128) >> 8)
+    return result
+
+
+def run_filter(reflection_filter, trace):
+    return [reflection_filter.update(sample) for sample in trace]
+
+
+def check(description, actual, expected):
+    if actual == expected:
+        print(f"  ✅ {description}")
+        return True
+    first = next(i for i in range(len(expected)) if actual[i] != expected[i])
+    print(f"  ❌ {description}: sample {first} is {actual[first]}, expected {expected[first]}")
+    return False
+
+
+class ReplaySensor:
+    """Stands in for a ColorSensor by replaying a trace"""
+
+    def __init__(self, trace):
+        self.trace = trace
+        self.index = 0
+
+    def reflection(self):
+        value = self.trace[self.index]
+        self.index += 1
+        return value
+
+
+def main():
+    print("=" * 60)
+    print("🧪 Testing Reflection Filters")
+    print("=" * 60)
+
+    if len(sys.argv) > 1:
+        trace = load_trace(sys.argv[1])
+        print(f"\nTrace: {sys.argv[1]} ({len(trace)} samples)")
+    else:
+        trace = BUILT_IN_TRACE
+        print(f"\nTrace: built-in line crossing ({len(trace)} samples)")
+
+    ok = True
+
+    print("\n📏 Filters match plain Python versions")
+    for size in (1, 3, 5):
+        ok &= check(f"MovingAverage({size})", run_filter(MovingAverage(size), trace),
+                    reference_moving_average(trace, size))
+        ok &= check(f"Median({size})", run_filter(Median(size), trace), reference_median(trace, size))
+    for shift in (1, 2, 3):
+        ok &= check(f"Exponential({shift})", run_filter(Exponential(shift), trace),
+                    reference_exponential(trace, shift))
+
+    print("\n🔁 reset() starts over")
+    for reflection_filter in (MovingAverage(3), Median(3), Exponential(2)):
+        first = run_filter(reflection_filter, trace)
+        reflection_filter.reset()
+        ok &= check(f"{type(reflection_filter).__name__} after reset",
+                    run_filter(reflection_filter, trace), first)
+
+    print("\n🔌 FilteredSensor wraps reflection()")
+    sensor = FilteredSensor(ReplaySensor(trace), Median(3))
+    ok &= check("FilteredSensor(Median(3))", [sensor.reflection() for _ in trace],
+                reference_median(trace, 3))
+
+    if len(sys.argv) == 1:
+        print("\n✨ Spike rejection on the built-in trace")
+        median = run_filter(Median(3), trace)
+        spikes_removed = median[8] < 90 and median[41] > 80
+        print(f"  {'✅' if spikes_removed else '❌'} Median(3) removes single-sample spikes")
+        ok &= spikes_removed
+
+    print("\n📈 Delay crossing the black threshold (20%)")
+    threshold = 20
+    raw_index = next(i for i, value in enumerate(trace) if value < threshold)
+    for reflection_filter in (MovingAverage(3), MovingAverage(5), Median(3), Median(5),
+                              Exponential(1), Exponential(2)):
+        output = run_filter(reflection_filter, trace)
+        index = next((i for i, value in enumerate(output) if value < threshold), None)
+        delay = "never" if index is None else f"{index - raw_index} samples"
+        print(f"  {type(reflection_filter).__name__}({getattr(reflection_filter, 'size', getattr(reflection_filter, 'shift', ''))}): {delay}")
+
+    print("\n" + "=" * 60)
+    if ok:
+        print("✅ All filter tests passed!")
+        print("💡 Cost per sample on the hub: run reflection_filters.benchmark() there")
+        return 0
+    print("❌ Some filter tests failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Test script to verify season and mission creation in headless mode
-Creates a fake season with 3 test missions
+Creates a fake season with 4 test missions
 """
 
 import subprocess
@@ -61,6 +61,7 @@ def main():
         "robot_controller.py",
         "display_patterns.py",
         "line_movements.py",
+        "mission_plan.py",
         "README.md"
     ]
 
@@ -121,12 +122,27 @@ def main():
     if not run_command(mission3_cmd, "Creating mission 3"):
         return 1
 
+    # Step 4b: Add Mission 4 (plan-style)
+    print("\n📦 Step 4b: Adding Mission 4 (plan template)")
+    mission4_cmd = [
+        "python", "new_mission.py",
+        "--season", test_folder,
+        "--name", "Plan Drive",
+        "--description", "Mission written as a step plan",
+        "--template", "plan",
+        "--quiet"
+    ]
+
+    if not run_command(mission4_cmd, "Creating mission 4"):
+        return 1
+
     # Verify mission files exist
     print("\n  📋 Verifying mission files:")
     expected_missions = [
         "mission_01_square_drive.py",
         "mission_02_line_following.py",
-        "mission_03_attachment_test.py"
+        "mission_03_attachment_test.py",
+        "mission_04_plan_drive.py"
     ]
 
     for mission in expected_missions:
@@ -147,12 +163,14 @@ def main():
         ("import mission_01_square_drive", "Mission 1 import"),
         ("import mission_02_line_following", "Mission 2 import"),
         ("import mission_03_attachment_test", "Mission 3 import"),
+        ("import mission_04_plan_drive", "Mission 4 import"),
         ('"1":', "Mission 1 entry"),
         ('"2":', "Mission 2 entry"),
         ('"3":', "Mission 3 entry"),
         ('Square Drive', "Mission 1 name"),
         ('Line Following', "Mission 2 name"),
         ('Attachment Test', "Mission 3 name"),
+        ('Plan Drive', "Mission 4 name"),
     ]
 
     all_passed = True
@@ -166,6 +184,23 @@ def main():
     if not all_passed:
         return 1
 
+    # Step 6: Verify the plan mission compiles and uses the step runner
+    print("\n📋 Step 6: Verifying plan-style mission")
+    plan_path = os.path.join(test_folder, "mission_04_plan_drive.py")
+    with open(plan_path, "r") as f:
+        plan_content = f.read()
+    try:
+        compile(plan_content, plan_path, "exec")
+        print("    ✅ Plan mission compiles")
+    except SyntaxError as e:
+        print(f"    ❌ Plan mission does not compile: {e}")
+        return 1
+    if "run_plan(robot, PLAN)" in plan_content:
+        print("    ✅ Plan mission runs its PLAN")
+    else:
+        print("    ❌ Plan mission does not call run_plan")
+        return 1
+
     # Success!
     print("\n" + "=" * 60)
     print("🎉 All tests passed!")
@@ -173,7 +208,7 @@ def main():
     print(f"\n📁 Test season created: {test_folder}/")
     print("📝 Contains:")
     print("   • 1 season configuration")
-    print("   • 3 test missions")
+    print("   • 4 test missions")
     print("   • Fully integrated menu system")
     print("\n💡 You can inspect the files or delete the folder when done.")
     print(f"   To delete: rm -rf {test_folder}/")
@@ -0,0 +1,159 @@
+"""
+Color Zones
+Recognize mat zones (base, colored mission markers, ...) from ColorSensor.hsv()
+
+Instead of comparing every reading with every zone's color, the classifier
+uses a 384-byte lookup table: hue, saturation and value are cut into
+buckets and each bucket stores the zone it belongs to. Classifying a
+reading is a few integer operations, fast enough to catch narrow color
+bands at cruise speed.
+
+The table is learned from samples (teach()) and kept in hub storage, so
+zones are taught once per event, like the black/white calibration:
+
+    from color_zones import ColorZones
+    from season_config import Zones
+
+    zones = ColorZones(robot.hub)
+    zones.clear()
+    # Put the left sensor over each zone in turn:
+    zones.teach(robot.left_color_sensor, Zones.BASE)
+    zones.teach(robot.left_color_sensor, Zones.RED)
+    zones.build()
+    zones.save()
+
+Then in a mission:
+    line_moves.drive_until_zone(Zones.RED, sensor='left')
+"""
+
+from pybricks.tools import wait
+from season_config import Storage
+
+# 24 hue buckets (15 degrees) x 4 saturation x 4 value buckets (32% each)
+HUE_STEP = 15
+TABLE_SIZE = 384
+
+ZONES_MARKER = 0x5A     # Marks the stored table as valid (fresh storage reads as zeros)
+
+
+def bucket(h, s, v):
+    """Table index of one HSV reading (h 0-359, s and v 0-100)"""
+    return (h // HUE_STEP) << 4 | (s >> 5) << 2 | (v >> 5)
+
+
+class ColorZones:
+    """HSV lookup-table classifier for mat zones"""
+
+    def __init__(self, hub):
+        """
+        Args:
+            hub: PrimeHub instance
+        """
+        self.hub = hub
+        self.table = bytearray(TABLE_SIZE)
+        self.is_trained = False
+        self.load()
+
+    def load(self):
+        """Read the zone table from hub storage (all UNKNOWN if none is stored)"""
+        try:
+            marker = self.hub.system.storage(Storage.COLOR_ZONES, read=1)
+        except Exception:
+            return
+        if marker[0] != ZONES_MARKER:
+            return
+        self.table = bytearray(self.hub.system.storage(Storage.COLOR_ZONES + 1, read=TABLE_SIZE))
+        self.is_trained = True
+
+    def save(self):
+        """Store the zone table in hub storage"""
+        self.hub.system.storage(Storage.COLOR_ZONES + 1, write=bytes(self.table))
+        self.hub.system.storage(Storage.COLOR_ZONES, write=bytes((ZONES_MARKER,)))
+        self.is_trained = True
+
+    def clear(self):
+        """Forget every zone (in memory; call save() to clear storage too)"""
+        for i in range(TABLE_SIZE):
+            self.table[i] = 0
+        self.is_trained = False
+
+    def add_sample(self, h, s, v, zone):
+        """
+        Mark the bucket of one HSV reading as belonging to a zone
+
+        A bucket already claimed by another zone keeps its first zone, so
+        teach the most important zones first.
+        """
+        index = bucket(h, s, v)
+        if self.table[index] == 0:
+            self.table[index] = zone
+
+    def teach(self, sensor, zone, samples=30, period=20):
+        """
+        Learn a zone from a sensor held (or slowly moved) over it
+
+        Args:
+            sensor: ColorSensor over the zone
+            zone: Zone number (see Zones in season_config.py), 1-255
+            samples: Number of readings to take
+            period: ms between readings
+        """
+        hsv = sensor.hsv
+        for i in range(samples):
+            color = hsv()
+            self.add_sample(color.h, color.s, color.v, zone)
+            wait(period)
+
+    def build(self):
+        """
+        Grow every taught zone into empty neighbouring buckets
+
+        Readings on the mat vary a little more than the teaching samples,
+        so each zone also claims the empty buckets next to its own (one
+        hue step either way, one saturation/value step up or down).
+        """
+        taught = bytes(self.table)
+        for index in range(TABLE_SIZE):
+            zone = taught[index]
+            if zone == 0:
+                continue
+            hue = index >> 4
+            sat = (index >> 2) & 3
+            val = index & 3
+            for dh in (-1, 0, 1):
+                h = (hue + dh) % (TABLE_SIZE >> 4)
+                for ds in (-1, 0, 1):
+                    s = sat + ds
+                    if s < 0 or s > 3:
+                        continue
+                    for dv in (-1, 0, 1):
+                        v = val + dv
+                        if 0 <= v <= 3:
+                            neighbour = h << 4 | s << 2 | v
+                            if self.table[neighbour] == 0 and taught[neighbour] == 0:
+                                self.table[neighbour] = zone
+
+    def classify(self, h, s, v):
+        """Zone number of one HSV reading (0 = unknown)"""
+        return self.table[(h // HUE_STEP) << 4 | (s >> 5) << 2 | (v >> 5)]
+
+    def reader(self, sensor):
+        """
+        Get a function that reads the zone under a sensor
+
+        Blocking code only; step generators yield sensor.hsv() and pass
+        the reading to classify() (see multitask_utils.py).
+
+        Args:
+            sensor: ColorSensor to read
+
+        Returns:
+            Function with no arguments returning a zone number (0 = unknown)
+        """
+        hsv = sensor.hsv
+        table = self.table
+
+        def read_zone():
+            color = hsv()
+            return table[(color.h // HUE_STEP) << 4 | (color.s >> 5) << 2 | (color.v >> 5)]
+        return read_zone
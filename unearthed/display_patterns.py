@@ -6,10 +6,115 @@ Common display patterns and utilities for robot screen display
 from pybricks.tools import wait
 from pybricks.parameters import Icon
 from season_config import SeasonDefaults
+from multitask_utils import run_steps, run_steps_async
+
+
+# Animation frames (built once at import instead of on every call)
+SQUARE_FRAMES = [
+    # Outer square
+    [
+        [100, 100, 100, 100, 100],
+        [100, 0, 0, 0, 100],
+        [100, 0, 0, 0, 100],
+        [100, 0, 0, 0, 100],
+        [100, 100, 100, 100, 100]
+    ],
+    # Inner square
+    [
+        [0, 0, 0, 0, 0],
+        [0, 100, 100, 100, 0],
+        [0, 100, 0, 100, 0],
+        [0, 100, 100, 100, 0],
+        [0, 0, 0, 0, 0]
+    ],
+    # Center dot
+    [
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 100, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0]
+    ]
+]
+
+CIRCLE_FRAMES = [
+    # Outer circle
+    [
+        [0, 100, 100, 100, 0],
+        [100, 0, 0, 0, 100],
+        [100, 0, 0, 0, 100],
+        [100, 0, 0, 0, 100],
+        [0, 100, 100, 100, 0]
+    ],
+    # Inner circle
+    [
+        [0, 0, 0, 0, 0],
+        [0, 100, 100, 100, 0],
+        [0, 100, 0, 100, 0],
+        [0, 100, 100, 100, 0],
+        [0, 0, 0, 0, 0]
+    ],
+    # Center dot
+    [
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 100, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0]
+    ]
+]
+
+TRIANGLE_FRAMES = [
+    # Outer triangle
+    [
+        [0, 0, 100, 0, 0],
+        [0, 100, 0, 100, 0],
+        [100, 0, 0, 0, 100],
+        [100, 100, 100, 100, 100],
+        [0, 0, 0, 0, 0]
+    ],
+    # Inner triangle
+    [
+        [0, 0, 0, 0, 0],
+        [0, 0, 100, 0, 0],
+        [0, 100, 0, 100, 0],
+        [0, 100, 100, 100, 0],
+        [0, 0, 0, 0, 0]
+    ],
+    # Center dot
+    [
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 100, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0]
+    ]
+]
+
+
+CHECKMARK = [
+    [0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 100],
+    [0, 0, 0, 100, 0],
+    [100, 0, 100, 0, 0],
+    [0, 100, 0, 0, 0]
+]
+
+ERROR_X = [
+    [100, 0, 0, 0, 100],
+    [0, 100, 0, 100, 0],
+    [0, 0, 100, 0, 0],
+    [0, 100, 0, 100, 0],
+    [100, 0, 0, 0, 100]
+]
 
 
 class DisplayPatterns:
-    """Collection of display patterns for robot missions"""
+    """Collection of display patterns for robot missions
+
+    Every pattern that waits also has an *_async version (e.g.
+    show_countdown_async) to await inside run_parallel()/multitask tasks.
+    """
     
     def __init__(self, hub, delay=None):
         """
@@ -28,120 +133,50 @@ class DisplayPatterns:
     
     def show_icon(self, icon, duration=None):
         """Show a built-in icon for specified duration"""
+        run_steps(self._show_icon_steps(icon, duration))
+
+    async def show_icon_async(self, icon, duration=None):
+        """Async version of show_icon()"""
+        await run_steps_async(self._show_icon_steps(icon, duration))
+
+    def _show_icon_steps(self, icon, duration):
+        """Step generator: show an icon, then optionally hold it"""
         self.hub.display.icon(icon)
         if duration:
-            wait(duration)
+            yield wait(duration)
     
     def animate_square(self, cycles=3):
         """Animate a square pattern on the display"""
-        patterns = [
-            # Outer square
-            [
-                [100, 100, 100, 100, 100],
-                [100, 0, 0, 0, 100],
-                [100, 0, 0, 0, 100],
-                [100, 0, 0, 0, 100],
-                [100, 100, 100, 100, 100]
-            ],
-            # Inner square
-            [
-                [0, 0, 0, 0, 0],
-                [0, 100, 100, 100, 0],
-                [0, 100, 0, 100, 0],
-                [0, 100, 100, 100, 0],
-                [0, 0, 0, 0, 0]
-            ],
-            # Center dot
-            [
-                [0, 0, 0, 0, 0],
-                [0, 0, 0, 0, 0],
-                [0, 0, 100, 0, 0],
-                [0, 0, 0, 0, 0],
-                [0, 0, 0, 0, 0]
-            ]
-        ]
-        
-        for cycle in range(cycles):
-            for pattern in patterns:
-                self.hub.display.icon(pattern)
-                wait(self.delay)
-        
-        # End with square icon
-        self.hub.display.icon(Icon.SQUARE)
+        run_steps(self._animate_steps(SQUARE_FRAMES, cycles, Icon.SQUARE))
+
+    async def animate_square_async(self, cycles=3):
+        """Async version of animate_square()"""
+        await run_steps_async(self._animate_steps(SQUARE_FRAMES, cycles, Icon.SQUARE))
     
     def animate_circle(self, cycles=3):
         """Animate a circle pattern on the display"""
-        patterns = [
-            # Outer circle
-            [
-                [0, 100, 100, 100, 0],
-                [100, 0, 0, 0, 100],
-                [100, 0, 0, 0, 100],
-                [100, 0, 0, 0, 100],
-                [0, 100, 100, 100, 0]
-            ],
-            # Inner circle
-            [
-                [0, 0, 0, 0, 0],
-                [0, 100, 100, 100, 0],
-                [0, 100, 0, 100, 0],
-                [0, 100, 100, 100, 0],
-                [0, 0, 0, 0, 0]
-            ],
-            # Center dot
-            [
-                [0, 0, 0, 0, 0],
-                [0, 0, 0, 0, 0],
-                [0, 0, 100, 0, 0],
-                [0, 0, 0, 0, 0],
-                [0, 0, 0, 0, 0]
-            ]
-        ]
-        
-        for cycle in range(cycles):
-            for pattern in patterns:
-                self.hub.display.icon(pattern)
-                wait(self.delay)
-        
-        # End with circle icon
-        self.hub.display.icon(Icon.CIRCLE)
+        run_steps(self._animate_steps(CIRCLE_FRAMES, cycles, Icon.CIRCLE))
+
+    async def animate_circle_async(self, cycles=3):
+        """Async version of animate_circle()"""
+        await run_steps_async(self._animate_steps(CIRCLE_FRAMES, cycles, Icon.CIRCLE))
     
     def animate_triangle(self, cycles=3):
         """Animate a triangle pattern on the display"""
-        patterns = [
-            # Outer triangle
-            [
-                [0, 0, 100, 0, 0],
-                [0, 100, 0, 100, 0],
-                [100, 0, 0, 0, 100],
-                [100, 100, 100, 100, 100],
-                [0, 0, 0, 0, 0]
-            ],
-            # Inner triangle
-            [
-                [0, 0, 0, 0, 0],
-                [0, 0, 100, 0, 0],
-                [0, 100, 0, 100, 0],
-                [0, 100, 100, 100, 0],
-                [0, 0, 0, 0, 0]
-            ],
-            # Center dot
-            [
-                [0, 0, 0, 0, 0],
-                [0, 0, 0, 0, 0],
-                [0, 0, 100, 0, 0],
-                [0, 0, 0, 0, 0],
-                [0, 0, 0, 0, 0]
-            ]
-        ]
-        
+        run_steps(self._animate_steps(TRIANGLE_FRAMES, cycles, Icon.TRIANGLE_UP))
+
+    async def animate_triangle_async(self, cycles=3):
+        """Async version of animate_triangle()"""
+        await run_steps_async(self._animate_steps(TRIANGLE_FRAMES, cycles, Icon.TRIANGLE_UP))
+
+    def _animate_steps(self, patterns, cycles, final_icon):
+        """Step generator: cycle through frames, then end on a built-in icon"""
         for cycle in range(cycles):
             for pattern in patterns:
                 self.hub.display.icon(pattern)
-                wait(self.delay)
+                yield wait(self.delay)
         
-        # End with triangle icon
-        self.hub.display.icon(Icon.TRIANGLE_UP)
+        self.hub.display.icon(final_icon)
     
     def show_progress_bar(self, percent):
         """
@@ -165,36 +200,34 @@ class DisplayPatterns:
     
     def show_countdown(self, seconds):
         """Show countdown on display"""
+        run_steps(self._countdown_steps(seconds))
+
+    async def show_countdown_async(self, seconds):
+        """Async version of show_countdown()"""
+        await run_steps_async(self._countdown_steps(seconds))
+
+    def _countdown_steps(self, seconds):
+        """Step generator: count down, then show the GO arrow"""
         for i in range(seconds, 0, -1):
             self.hub.display.number(i)
-            wait(1000)
+            yield wait(1000)
         
         # Show GO signal
         self.hub.display.icon(Icon.ARROW_RIGHT)
-        wait(500)
+        yield wait(500)
     
     def show_completion_checkmark(self):
         """Show completion checkmark pattern"""
-        checkmark = [
-            [0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 100],
-            [0, 0, 0, 100, 0],
-            [100, 0, 100, 0, 0],
-            [0, 100, 0, 0, 0]
-        ]
-        
-        self.hub.display.icon(checkmark)
-        wait(1000)
+        run_steps(self._show_icon_steps(CHECKMARK, 1000))
+
+    async def show_completion_checkmark_async(self):
+        """Async version of show_completion_checkmark()"""
+        await run_steps_async(self._show_icon_steps(CHECKMARK, 1000))
     
     def show_error_x(self):
         """Show error X pattern"""
-        error_x = [
-            [100, 0, 0, 0, 100],
-            [0, 100, 0, 100, 0],
-            [0, 0, 100, 0, 0],
-            [0, 100, 0, 100, 0],
-            [100, 0, 0, 0, 100]
-        ]
-        
-        self.hub.display.icon(error_x)
-        wait(1000)
+        run_steps(self._show_icon_steps(ERROR_X, 1000))
+
+    async def show_error_x_async(self):
+        """Async version of show_error_x()"""
+        await run_steps_async(self._show_icon_steps(ERROR_X, 1000))
@@ -1,8 +1,4 @@
-from robot_controller import RobotController
-from display_patterns import DisplayPatterns
-from season_config import SeasonDefaults
-from pybricks.tools import wait
-from line_movements import LineMovements
+from mission_plan import run_plan, run_standalone
 
 
 MISSION_CONFIG = {
@@ -10,6 +6,26 @@ MISSION_CONFIG = {
     "turn_rate": 60,
     "black threshold": 10,  } #this is the reflection percentage for black [TRIAL AND ERROR] higher=triggers on lighter surfaces
 
+PLAN = (
+    ("turn", -40),
+    ("straight", 245),
+    ("turn", -30),
+    ("straight", 310),
+    ("right", 1000, -175),
+    ("turn", -65),
+    ("right", 200, 175),
+    ("turn", 40),
+)
+
+# OG code for this (it was buns tho)
+# ("straight", 355),
+# ("turn", -36),
+# ("right", 1000, -175),
+# ("straight", 350),
+# ("turn", -58),
+# ("right", 200, 175),
+# ("turn", 70),
+
 def run(robot, display):
     """
     Main mission execution function
@@ -19,37 +35,8 @@ def run(robot, display):
         display: DisplayPatterns object for hub display
     """
     print("=== MISSION 07 ===")
-
-    robot.drivebase.turn(-40)
-    robot.drivebase.straight(245)
-    robot.drivebase.turn(-30)
-    robot.drivebase.straight(310)
-    robot.right_attachment.run_angle(1000, -175)
-    robot.drivebase.turn(-65)
-    robot.right_attachment.run_angle(200, 175)
-    robot.drivebase.turn(40)
-
-    # OG code for this (it was buns tho)
-    # robot.drivebase.straight(355) 
-    # robot.drivebase.turn(-36)
-    # robot.right_attachment.run_angle(1000,-175)
-    # robot.drivebase.straight(350)
-    # robot.drivebase.turn(-58)
-    # robot.right_attachment.run_angle(200,175)
-    # robot.drivebase.turn(70)
+    run_plan(robot, PLAN)
 
 if __name__ == "__main__":
-    # Standalone testing mode - initialize robot here
-    robot = RobotController(SeasonDefaults, MISSION_CONFIG)
-    try:
-        robot.initialize()
-        display = DisplayPatterns(robot.hub)
-        robot.mission_start_signal()
-        run(robot, display)
-        robot.mission_success_signal()
-    except Exception as e:
-        print(f"Mission failed: {e}")
-        robot.mission_error_signal()
-        raise e
-    finally:
-        robot.cleanup()
+    # Standalone testing mode
+    run_standalone(MISSION_CONFIG, run)
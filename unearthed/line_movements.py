@@ -3,24 +3,99 @@ Line Movements
 Functions for line detection and line-following behaviors
 """
 
-from pybricks.tools import wait
+from pybricks.tools import wait, StopWatch
+from season_config import LogLevel
+from multitask_utils import run_steps, run_steps_async
+from sensor_calibration import LEFT, RIGHT
+from color_zones import ColorZones
+from robot_controller import SNAP_DISTANCE, SNAP_LEFT_ANGLE, SNAP_RIGHT_ANGLE, SNAP_TIME, no_reading
+
+
+def _raw_reading(value):
+    """Converter for an uncalibrated, unfiltered sensor: the reading as it is"""
+    return value
+
+
+class LineNotFoundError(RuntimeError):
+    """The robot drove its maximum distance without finding the line"""
+
+
+class ZoneNotFoundError(RuntimeError):
+    """The robot drove its maximum distance without finding the color zone"""
 
 
 class LineMovements:
     """Collection of line-detection and line-following movement functions"""
 
-    def __init__(self, robot_controller):
+    def __init__(self, robot_controller, reflection_filter=None):
         """
         Initialize line movements
 
         Args:
             robot_controller: RobotController instance with configuration
+            reflection_filter: Optional function that makes a new filter, e.g.
+                lambda: Median(3) (see reflection_filters.py). Every sensor
+                read by these methods then goes through its own filter.
         """
         self.robot = robot_controller
         self.drivebase = robot_controller.drivebase
         self.config = robot_controller.config
+        self.calibration = robot_controller.calibration
+        self.reflection_filter = reflection_filter
+        self.zones = None           # ColorZones, loaded from hub storage on first use
+
+    def _converter(self, side):
+        """
+        Function turning a raw reflection reading into the value the loops use
+
+        Applies the sensor's calibration and, if set up, its own filter. The
+        step generators read the sensors themselves (raw = yield
+        sensor.reflection()) so they also work under multitask.
+        """
+        normalize = self.calibration.converter(side)
+        if self.reflection_filter is None:
+            return _raw_reading if normalize is None else normalize
+        update = self.reflection_filter().update
+        if normalize is None:
+            return update
+
+        def convert(raw):
+            return update(normalize(raw))
+        return convert
+
+    def _pick_sensor(self, sensor):
+        """
+        Color sensor and calibration side for sensor='left' or 'right'
+
+        Raises:
+            ValueError: sensor is not 'left' or 'right'
+            RuntimeError: That color sensor is not connected
+        """
+        if sensor == 'left':
+            color_sensor = self.robot.left_color_sensor
+            side = LEFT
+        elif sensor == 'right':
+            color_sensor = self.robot.right_color_sensor
+            side = RIGHT
+        else:
+            raise ValueError(f"sensor must be 'left' or 'right', not {sensor}")
+
+        if not color_sensor:
+            raise RuntimeError(
+                f"This function needs the {sensor} color sensor!\n"
+                "  Make sure your sensors are plugged in and ports are correct in season_config.py\n"
+                "  If you just plugged them in, hold LEFT while starting to re-probe all ports"
+            )
+        return color_sensor, side
 
-    def square_on_line(self, left_sensor=None, right_sensor=None, drive_speed=None, black_threshold=None):
+    def _motion_snapshot(self):
+        """Snapshot buffer and fill function for distance, wheels and time (sensors are yielded)"""
+        return self.robot.new_snapshot(), self.robot.snapshot_function(no_reading, no_reading)
+
+    def square_on_line(self, left_sensor=None, right_sensor=None, drive_speed=None, black_threshold=None,
+                       tolerance=None, settle_ms=None, timeout=None, expected_distance=None,
+                       capture_window=None, max_distance=None, cruise_speed=None,
+                       measure_overshoot=False):
         """
         Drive forward until BOTH color sensors detect a black line, then stop.
         This is called "squaring" because it lines up the robot perpendicular to the line.
@@ -30,6 +105,39 @@ class LineMovements:
             right_sensor: Right ColorSensor (default: uses robot.right_color_sensor)
             drive_speed: Speed to drive forward in mm/s (default: uses robot's drive_speed config)
             black_threshold: Reflection % below which is considered "black" (default: 20)
+            tolerance: How far (%) each sensor may be from black_threshold when aligned
+                (default: SQUARE_TOLERANCE from config)
+            settle_ms: How long both sensors must stay within tolerance (default: SQUARE_SETTLE)
+            timeout: Give up aligning after this many ms (default: SQUARE_TIMEOUT)
+            expected_distance: Roughly how far away the line is in mm. The robot drives
+                at cruise_speed until it is capture_window mm before that point, then
+                slows down to drive_speed to find the line (default: no hint, whole
+                approach at drive_speed)
+            capture_window: mm before expected_distance to slow down (default: LINE_CAPTURE_WINDOW)
+            max_distance: Raise LineNotFoundError if no line after this many mm
+                (default: expected_distance + capture_window, or no limit without a hint)
+            cruise_speed: Fast approach speed in mm/s (default: LINE_CRUISE_SPEED)
+            measure_overshoot: Wait (up to 200 ms) for both wheels to stop before
+                aligning, to measure how far they rolled past the line. Only for
+                tuning drive_speed - always on at LogLevel.DEBUG
+
+        Returns:
+            Dictionary with line detection statistics:
+                loops: Number of sensor checks while driving to the line
+                average_period, max_period: Time between checks in ms
+                left_overshoot, right_overshoot: How far (mm) each wheel rolled
+                    after its sensor saw black - if this grows when you raise
+                    drive_speed, the approach is too fast (None unless measured)
+                aligned: True if both sensors settled within tolerance before the timeout
+                alignment_error: Final difference between the sensors in %
+                alignment_time: How long aligning took in ms
+                line_distance: How far (mm) the robot drove until both wheels found the line
+
+        Raises:
+            LineNotFoundError: No line within max_distance (the robot is stopped first)
+
+        Reflection is normalized per sensor once the sensors are calibrated
+        (menu option "C"): 0 = that sensor's black, 100 = its white.
 
         How reflection values work:
             - White surface: 70-100%
@@ -46,6 +154,14 @@ class LineMovements:
             # Simple! Uses robot's built-in sensors
             line_moves.square_on_line()
 
+            # Line is about 400 mm away: drive fast to 340 mm, then find it slowly
+            line_moves.square_on_line(expected_distance=400)
+
+            # Only continue if the robot really ended up square
+            result = line_moves.square_on_line(tolerance=2, timeout=1000)
+            if not result["aligned"]:
+                robot.drivebase.straight(-50)
+
             # With custom speed (slower for precision)
             line_moves.square_on_line(drive_speed=80)
 
@@ -58,21 +174,35 @@ class LineMovements:
             custom_sensor = ColorSensor(Port.E)
             line_moves.square_on_line(left_sensor=custom_sensor)
         """
+        return run_steps(self._square_on_line_steps(left_sensor, right_sensor, drive_speed, black_threshold,
+                                                    tolerance, settle_ms, timeout, expected_distance,
+                                                    capture_window, max_distance, cruise_speed,
+                                                    measure_overshoot))
+
+    async def square_on_line_async(self, left_sensor=None, right_sensor=None, drive_speed=None,
+                                   black_threshold=None, tolerance=None, settle_ms=None, timeout=None,
+                                   expected_distance=None, capture_window=None, max_distance=None,
+                                   cruise_speed=None, measure_overshoot=False):
+        """Async version of square_on_line() for use with run_parallel()/multitask"""
+        return await run_steps_async(
+            self._square_on_line_steps(left_sensor, right_sensor, drive_speed, black_threshold,
+                                       tolerance, settle_ms, timeout, expected_distance,
+                                       capture_window, max_distance, cruise_speed,
+                                       measure_overshoot)
+        )
+
+    def _square_on_line_steps(self, left_sensor, right_sensor, drive_speed, black_threshold,
+                              tolerance, settle_ms, timeout, expected_distance, capture_window,
+                              max_distance, cruise_speed, measure_overshoot):
+        """Step generator shared by square_on_line() and square_on_line_async()"""
         if not self.robot.is_initialized:
             raise RuntimeError("Robot not initialized. Call robot.initialize() first!")
 
         # Use robot's sensors if not specified
         if left_sensor is None:
-            left_sensor = self.robot.left_color_sensor
+            left_sensor, _ = self._pick_sensor('left')
         if right_sensor is None:
-            right_sensor = self.robot.right_color_sensor
-
-        # Check we have sensors
-        if not (left_sensor and right_sensor):
-            raise RuntimeError(
-                "This function needs both color sensors!\n"
-                "  Make sure your sensors are plugged in and ports are correct in season_config.py"
-            )
+            right_sensor, _ = self._pick_sensor('right')
 
         # Use defaults from config if not specified
         if drive_speed is None:
@@ -81,10 +211,34 @@ class LineMovements:
         if black_threshold is None:
             black_threshold = self.config.get('black_threshold', 20)
 
-        print(f"=== Square on Line ===")
-        print(f"Drive speed: {drive_speed} mm/s")
-        print(f"Black threshold: {black_threshold}%")
-        print(f"Driving forward until both sensors detect black line...")
+        if tolerance is None:
+            tolerance = self.config.get('square_tolerance', 3)
+        if settle_ms is None:
+            settle_ms = self.config.get('square_settle', 100)
+        if timeout is None:
+            timeout = self.config.get('square_timeout', 1500)
+
+        # With a distance hint, cruise fast until close to the line, then slow down
+        if expected_distance is not None:
+            if capture_window is None:
+                capture_window = self.config.get('line_capture_window', 60)
+            if cruise_speed is None:
+                cruise_speed = self.config.get('line_cruise_speed', 400)
+            if max_distance is None:
+                max_distance = expected_distance + capture_window
+            cruise_distance = max(0, expected_distance - capture_window)
+        else:
+            cruise_speed = drive_speed
+            cruise_distance = 0
+
+        info = self.robot.log_level >= LogLevel.INFO
+        debug = self.robot.log_level >= LogLevel.DEBUG
+
+        if debug:
+            print(f"=== Square on Line ===")
+            print(f"Drive speed: {drive_speed} mm/s")
+            print(f"Black threshold: {black_threshold}%")
+            print(f"Driving forward until both sensors detect black line...")
 
         # Convert drive_speed from mm/s to motor deg/s
         # Formula: wheel_circumference = π * diameter
@@ -93,108 +247,683 @@ class LineMovements:
         import umath as math
         wheel_circumference = math.pi * Specifications.WHEEL_DIAMETER
         motor_speed = int((drive_speed / wheel_circumference) * 360)
+        cruise_motor_speed = int((cruise_speed / wheel_circumference) * 360)
+
+        # Distances as summed wheel angles (deg) so the loop only compares ints
+        cruise_angle = int(2 * cruise_distance * 360 / wheel_circumference)
+        max_angle = int(2 * max_distance * 360 / wheel_circumference) if max_distance else 0
 
         # Start both wheels driving forward independently
         # This allows us to stop each wheel separately when its sensor sees black
         left_motor = self.robot.left_wheel
         right_motor = self.robot.right_wheel
 
-        left_motor.run(motor_speed)
-        right_motor.run(motor_speed)
+        # Read wheels and time through one preallocated snapshot and keep only
+        # ints in the loop: allocations and float math slow MicroPython down
+        state, snapshot = self._motion_snapshot()
+        left_read = left_sensor.reflection
+        right_read = right_sensor.reflection
+        left_convert = self._converter(LEFT)
+        right_convert = self._converter(RIGHT)
+        timer = StopWatch()
+        now = timer.time
+
+        snapshot(state)
+        start_angle = state[SNAP_LEFT_ANGLE] + state[SNAP_RIGHT_ANGLE]
+        start_time = state[SNAP_TIME]
+        cruising = cruise_angle > 0
+        left_motor.run(cruise_motor_speed if cruising else motor_speed)
+        right_motor.run(cruise_motor_speed if cruising else motor_speed)
 
         # Keep checking sensors and stop each wheel independently
         left_stopped = False
         right_stopped = False
+        left_stop_angle = 0
+        right_stop_angle = 0
+        loops = 0
+        max_period = 0
+        last_time = 0
 
         while not (left_stopped and right_stopped):
-            # Read reflection values (0-100%, lower = darker)
-            left_reflection = left_sensor.reflection()
-            right_reflection = right_sensor.reflection()
-
-            # Stop left wheel if it sees black and hasn't stopped yet
-            if not left_stopped and left_reflection < black_threshold:
-                left_motor.stop()
+            # Read reflection (0-100%, lower = darker), then the wheel angles
+            left = left_convert((yield left_read()))
+            right = right_convert((yield right_read()))
+            snapshot(state)
+
+            # Hold (not coast) as soon as a sensor sees black to keep overshoot small
+            if not left_stopped and left < black_threshold:
+                left_motor.hold()
+                left_stop_angle = state[SNAP_LEFT_ANGLE]
                 left_stopped = True
-                print(f"  Left wheel stopped (reflection: {left_reflection}%)")
 
-            # Stop right wheel if it sees black and hasn't stopped yet
-            if not right_stopped and right_reflection < black_threshold:
-                right_motor.stop()
+            if not right_stopped and right < black_threshold:
+                right_motor.hold()
+                right_stop_angle = state[SNAP_RIGHT_ANGLE]
                 right_stopped = True
-                print(f"  Right wheel stopped (reflection: {right_reflection}%)")
-
-            # Optional: Print values for debugging
-            # Uncomment this line to see what your sensors are reading:
-            # print(f"Left: {left_reflection}% | Right: {right_reflection}%")
 
-            # Small delay to prevent overwhelming the sensors
-            wait(10)
+            if cruising or max_angle:
+                travelled = state[SNAP_LEFT_ANGLE] + state[SNAP_RIGHT_ANGLE] - start_angle
+                if cruising and travelled >= cruise_angle:
+                    # Inside the capture window: slow down to find the line precisely
+                    cruising = False
+                    if not left_stopped:
+                        left_motor.run(motor_speed)
+                    if not right_stopped:
+                        right_motor.run(motor_speed)
+                if max_angle and travelled >= max_angle:
+                    left_motor.hold()
+                    right_motor.hold()
+                    raise LineNotFoundError(f"No line found within {max_distance} mm")
+
+            time = state[SNAP_TIME] - start_time
+            if time - last_time > max_period:
+                max_period = time - last_time
+            last_time = time
+            loops += 1
+
+            # Sample as fast as possible (wait(0) only lets other tasks run)
+            yield wait(0)
+
+        mm_per_degree = wheel_circumference / 360
+        stats = {
+            "loops": loops,
+            "average_period": last_time / loops if loops else 0,
+            "max_period": max_period,
+            "left_overshoot": None,
+            "right_overshoot": None,
+            "line_distance": (left_stop_angle + right_stop_angle - start_angle) * mm_per_degree / 2,
+        }
+
+        # Overshoot: how far each wheel rolled after its sensor saw black. Waiting
+        # for the wheels to stop delays alignment, so only when asked for.
+        if measure_overshoot or debug:
+            settle = StopWatch()
+            while (abs(left_motor.speed()) > 10 or abs(right_motor.speed()) > 10) and settle.time() < 200:
+                yield wait(5)
+            stats["left_overshoot"] = (left_motor.angle() - left_stop_angle) * mm_per_degree
+            stats["right_overshoot"] = (right_motor.angle() - right_stop_angle) * mm_per_degree
+
+        if debug:
+            print(f"  Both wheels on the line: {loops} loops, avg {stats['average_period']:.1f} ms, "
+                  f"max {max_period} ms")
+            print(f"  Overshoot - Left: {stats['left_overshoot']:.1f} mm | "
+                  f"Right: {stats['right_overshoot']:.1f} mm")
 
         # Phase 2: Align robot so both sensors read equally (actually square on line)
-        print("  Aligning robot to square on line...")
-
-        tolerance = 0  # Sensors must be within 3% of each other
-        max_alignment_attempts = 20  # Prevent infinite loop
-        alignment_speed = motor_speed // 4  # Use slower speed for fine adjustment (25% of drive speed)
-
-        # Proportional control: distance to move is proportional to error
-        # Bigger difference = bigger movement (up to a max)
-        angle_per_percent = 5  # Move 5 degrees per 1% reflection difference
-        max_adjustment_angle = 30  # Cap maximum movement at 30 degrees
-
-        attempt = 0
-        while attempt < max_alignment_attempts:
-            # Read current sensor values
-            left_reflection = left_sensor.reflection()
-            right_reflection = right_sensor.reflection()
-
-            # Calculate difference
-            difference = abs(left_reflection - right_reflection)
-
-            # If sensors are close enough, we're aligned!
-            if difference <= tolerance:
-                print(f"  ✓ Aligned! Difference: {difference}%")
-                break
-
-            # STRATEGY: Use the DARKER sensor (lower reflection) as the target
-            # This is likely the better position on the line (first one that hit)
-            # Move the LIGHTER sensor BACKWARD to match the darker one
-            target_reflection = min(left_reflection, right_reflection)
-
-            # Calculate how much each sensor differs from target
-            left_error = left_reflection - target_reflection
-            right_error = right_reflection - target_reflection
-
-            # Proportional control: movement proportional to error
-            # Negative angle = backward movement
-            if left_error > tolerance:
-                # Left is lighter, needs to move BACKWARD
-                movement = min(int(left_error * angle_per_percent), max_adjustment_angle)
-                left_motor.run_angle(alignment_speed, -movement, wait=False)
-                print(f"  Adjusting left backward {movement}° (L:{left_reflection}% → target:{target_reflection}%)")
-
-            if right_error > tolerance:
-                # Right is lighter, needs to move BACKWARD
-                movement = min(int(right_error * angle_per_percent), max_adjustment_angle)
-                right_motor.run_angle(alignment_speed, -movement, wait=False)
-                print(f"  Adjusting right backward {movement}° (R:{right_reflection}% → target:{target_reflection}%)")
-
-            wait(150)  # Wait for adjustment to complete
-            attempt += 1
-
-        # Final check
-        if attempt >= max_alignment_attempts:
-            print(f"  ⚠ Reached max alignment attempts, difference: {difference}%")
+        # Both wheels are controlled at the same time: each runs forward while its
+        # sensor is brighter than the threshold and backward while it is darker,
+        # at a speed proportional to the error, until both are within tolerance.
+        if debug:
+            print("  Aligning robot to square on line...")
+
+        kp = self.config.get('square_kp', 8)
+        max_speed = motor_speed // 2
+        period = 5
+        settle = StopWatch()
+        timer.reset()
+        aligned = False
+
+        while now() < timeout:
+            left_error = left_convert((yield left_read())) - black_threshold
+            right_error = right_convert((yield right_read())) - black_threshold
+
+            if -tolerance <= left_error <= tolerance and -tolerance <= right_error <= tolerance:
+                left_motor.hold()
+                right_motor.hold()
+                if settle.time() >= settle_ms:
+                    aligned = True
+                    break
+            else:
+                settle.reset()
+                left_motor.run(max(-max_speed, min(max_speed, kp * left_error)))
+                right_motor.run(max(-max_speed, min(max_speed, kp * right_error)))
+
+            yield wait(period)
 
         # Make sure everything is fully stopped
-        left_motor.stop()
-        right_motor.stop()
-        self.drivebase.stop()
+        left_motor.hold()
+        right_motor.hold()
+
+        left_reflection = left_convert((yield left_read()))
+        right_reflection = right_convert((yield right_read()))
+        stats["aligned"] = aligned
+        stats["alignment_error"] = abs(left_reflection - right_reflection)
+        stats["alignment_time"] = now()
 
         # Final readings
-        left_reflection = left_sensor.reflection()
-        right_reflection = right_sensor.reflection()
-        print(f"✓ Robot squared on line!")
-        print(f"  Final readings - Left: {left_reflection}% | Right: {right_reflection}%")
-        print(f"  Difference: {abs(left_reflection - right_reflection)}%")
-        print()
+        if info:
+            if aligned:
+                print(f"✓ Robot squared on line!")
+            else:
+                print(f"⚠ Alignment timed out after {timeout} ms")
+            print(f"  Final readings - Left: {left_reflection}% | Right: {right_reflection}%")
+            print(f"  Difference: {stats['alignment_error']}% after {stats['alignment_time']} ms")
+            print(f"  Detection loop: avg {stats['average_period']:.1f} ms, max {stats['max_period']} ms")
+            if stats["left_overshoot"] is not None:
+                print(f"  Overshoot L {stats['left_overshoot']:.1f} mm / R {stats['right_overshoot']:.1f} mm")
+            print(f"  Line found after {stats['line_distance']:.0f} mm")
+
+        return stats
+
+    def follow_line_edge(self, distance, speed=None, sensor='left', target_reflection=None,
+                         edge='left', kp=None, ki=None, kd=None):
+        """
+        Follow the edge of a line with a PID controller for a set distance
+
+        The sensor rides on the boundary between black and white, where it
+        reads about target_reflection. Too bright means it drifted off the
+        line, too dark means it drifted onto it, and the robot steers back.
+
+        The loop runs at a fixed period (LINE_LOOP_PERIOD) so the gains
+        behave the same at every speed. The faster the robot drives, the
+        further it moves between two corrections: raise the speed until it
+        starts to wobble off the line, then back off a little.
+
+        Args:
+            distance: Distance to follow the line in mm (measured by the drivebase)
+            speed: Speed along the line in mm/s (default: LINE_SPEED from config)
+            sensor: 'left' or 'right' color sensor
+            target_reflection: Reflection % on the edge (default: LINE_TARGET from config)
+            edge: Which edge of the line to follow: 'left' (white on the left)
+                  or 'right' (white on the right)
+            kp, ki, kd: PID gains (default: LINE_KP, LINE_KI, LINE_KD from config)
+
+        Returns:
+            Dictionary with loop statistics:
+                loops: Number of control loops
+                average_period: Average loop period in ms
+                max_period: Longest loop period in ms
+                overruns: Loops that took longer than LINE_LOOP_PERIOD
+
+        Example usage:
+            line_moves = LineMovements(robot)
+
+            # Follow the left edge of a line for 500 mm with the left sensor
+            stats = line_moves.follow_line_edge(distance=500, speed=150, sensor='left')
+            print(stats['average_period'])
+        """
+        return run_steps(self._follow_line_edge_steps(distance, speed, sensor, target_reflection,
+                                                      edge, kp, ki, kd))
+
+    async def follow_line_edge_async(self, distance, speed=None, sensor='left', target_reflection=None,
+                                     edge='left', kp=None, ki=None, kd=None):
+        """Async version of follow_line_edge() for use with run_parallel()/multitask"""
+        return await run_steps_async(self._follow_line_edge_steps(distance, speed, sensor,
+                                                                  target_reflection, edge, kp, ki, kd))
+
+    def _follow_line_edge_steps(self, distance, speed, sensor, target_reflection, edge, kp, ki, kd):
+        """Step generator shared by follow_line_edge() and follow_line_edge_async()"""
+        if not self.robot.is_initialized:
+            raise RuntimeError("Robot not initialized. Call robot.initialize() first!")
+
+        color_sensor, side = self._pick_sensor(sensor)
+
+        config = self.config
+        if speed is None:
+            speed = config.get('line_speed', 150)
+        if target_reflection is None:
+            target_reflection = config.get('line_target', 45)
+        if kp is None:
+            kp = config.get('line_kp', 2.0)
+        if ki is None:
+            ki = config.get('line_ki', 0.0)
+        if kd is None:
+            kd = config.get('line_kd', 8.0)
+        max_turn = config.get('line_max_turn', 200)
+        period = config.get('line_loop_period', 10)
+
+        # Left edge: white is on the left, so "too bright" means steer right (positive)
+        if edge == 'right':
+            kp, ki, kd = -kp, -ki, -kd
+        elif edge != 'left':
+            raise ValueError(f"edge must be 'left' or 'right', not {edge}")
+
+        info = self.robot.log_level >= LogLevel.INFO
+        debug = self.robot.log_level >= LogLevel.DEBUG
+
+        if debug:
+            print(f"=== Follow Line Edge ===")
+            print(f"{distance} mm at {speed} mm/s, {sensor} sensor on the {edge} edge")
+            print(f"Target: {target_reflection}%  kp={kp} ki={ki} kd={kd}  period={period} ms")
+
+        # Distance comes from one preallocated snapshot; bind the rest to locals
+        state, snapshot = self._motion_snapshot()
+        read = color_sensor.reflection
+        convert = self._converter(side)
+        drive = self.drivebase.drive
+        timer = StopWatch()
+        now = timer.time
+
+        # Integral is limited so it alone can never ask for more than max_turn
+        integral_limit = abs(max_turn / ki) if ki else 0
+        start = snapshot(state)[SNAP_DISTANCE]
+        distance = abs(distance)
+        integral = 0
+        last_error = convert((yield read())) - target_reflection
+        loops = 0
+        overruns = 0
+        max_period = 0
+        last_time = 0
+        deadline = period
+
+        while abs(snapshot(state)[SNAP_DISTANCE] - start) < distance:
+            error = convert((yield read())) - target_reflection
+            if ki:
+                integral = max(-integral_limit, min(integral_limit, integral + error))
+            turn = kp * error + ki * integral + kd * (error - last_error)
+            last_error = error
+            drive(speed, max(-max_turn, min(max_turn, turn)))
+
+            # Keep a fixed period; if a loop ran late, start timing again from now
+            time = now()
+            loops += 1
+            if time - last_time > max_period:
+                max_period = time - last_time
+            if time >= deadline:
+                overruns += 1
+                deadline = time + period
+            else:
+                yield wait(deadline - time)
+                deadline += period
+            last_time = time
+
+        self.drivebase.stop()
+
+        stats = {
+            "loops": loops,
+            "average_period": timer.time() / loops if loops else 0,
+            "max_period": max_period,
+            "overruns": overruns,
+        }
+        if info:
+            print(f"✓ Followed line {distance} mm: {loops} loops, "
+                  f"avg {stats['average_period']:.1f} ms, max {max_period} ms, {overruns} overruns")
+            if overruns * 10 > loops:
+                print(f"  ⚠ Loop can't keep up with {period} ms - raise LINE_LOOP_PERIOD")
+        return stats
+
+    def drive_until_line(self, count=1, sensor='left', speed=None, slow_speed=None,
+                         black_threshold=None, white_threshold=None, debounce=None,
+                         windows=None, max_distance=None, stop=True, expected_distance=None):
+        """
+        Drive straight and count black lines crossed, until the Nth line
+
+        A line only counts once the sensor has gone properly dark
+        (below black_threshold) after having been properly bright (above
+        white_threshold), and at least `debounce` mm after the previous
+        line - so a noisy edge or a smudge on the mat isn't counted twice.
+
+        After the second-to-last line (or on entering the last window, or
+        LINE_CAPTURE_WINDOW mm before expected_distance) the robot slows to
+        slow_speed so it finds the Nth line precisely. With count=1 and no
+        window or expected_distance there is nothing to cruise past, so the
+        whole approach runs at slow_speed.
+
+        Args:
+            count: Which line to stop at (1 = the first line crossed)
+            sensor: 'left' or 'right' color sensor
+            speed: Speed between lines in mm/s (default: LINE_CRUISE_SPEED)
+            slow_speed: Speed to find the last line in mm/s (default: drive_speed)
+            black_threshold: Reflection below which the sensor is on a line (default: BLACK_THRESHOLD)
+            white_threshold: Reflection above which it is off the line again (default: LINE_WHITE_THRESHOLD)
+            debounce: Minimum mm between two counted lines (default: LINE_DEBOUNCE)
+            windows: Optional list of (from_mm, to_mm), one per line: a line only
+                counts inside its window, and missing a window raises LineNotFoundError
+            max_distance: Raise LineNotFoundError after this many mm (default: no limit)
+            stop: True to stop on the Nth line, False to keep driving at slow_speed
+                (e.g. straight into square_on_line())
+            expected_distance: Roughly where the Nth line is in mm: cruise at speed
+                until LINE_CAPTURE_WINDOW mm before it (max_distance then defaults
+                to expected_distance + LINE_CAPTURE_WINDOW)
+
+        Returns:
+            List of distances (mm from the start) where each line was found
+
+        Raises:
+            LineNotFoundError: A window or max_distance passed without the line (robot stopped)
+
+        Example usage:
+            line_moves = LineMovements(robot)
+
+            # Cross two lines fast and stop on the third
+            line_moves.drive_until_line(count=3, sensor='right', speed=400)
+
+            # Lines expected at about 150, 420 and 700 mm
+            line_moves.drive_until_line(count=3, windows=[(120, 180), (390, 450), (670, 730)])
+
+            # One line about 500 mm away: fast to 440 mm, then slow
+            line_moves.drive_until_line(expected_distance=500)
+        """
+        return run_steps(self._drive_until_line_steps(count, sensor, speed, slow_speed, black_threshold,
+                                                      white_threshold, debounce, windows, max_distance, stop,
+                                                      expected_distance))
+
+    async def drive_until_line_async(self, count=1, sensor='left', speed=None, slow_speed=None,
+                                     black_threshold=None, white_threshold=None, debounce=None,
+                                     windows=None, max_distance=None, stop=True, expected_distance=None):
+        """Async version of drive_until_line() for use with run_parallel()/multitask"""
+        return await run_steps_async(self._drive_until_line_steps(count, sensor, speed, slow_speed,
+                                                                  black_threshold, white_threshold,
+                                                                  debounce, windows, max_distance, stop,
+                                                                  expected_distance))
+
+    def _drive_until_line_steps(self, count, sensor, speed, slow_speed, black_threshold, white_threshold,
+                                debounce, windows, max_distance, stop, expected_distance):
+        """Step generator shared by drive_until_line() and drive_until_line_async()"""
+        if not self.robot.is_initialized:
+            raise RuntimeError("Robot not initialized. Call robot.initialize() first!")
+
+        color_sensor, side = self._pick_sensor(sensor)
+
+        if windows is not None and len(windows) < count:
+            raise ValueError(f"Need a window for each of the {count} lines, got {len(windows)}")
+
+        config = self.config
+        if speed is None:
+            speed = config.get('line_cruise_speed', 400)
+        if slow_speed is None:
+            slow_speed = config.get('drive_speed', 200)
+        if black_threshold is None:
+            black_threshold = config.get('black_threshold', 20)
+        if white_threshold is None:
+            white_threshold = config.get('line_white_threshold', 50)
+        if debounce is None:
+            debounce = config.get('line_debounce', 25)
+        # Distance after which to slow down for the last line (None = no hint)
+        capture = None
+        if expected_distance is not None:
+            capture_window = config.get('line_capture_window', 60)
+            capture = expected_distance - capture_window
+            if max_distance is None:
+                max_distance = expected_distance + capture_window
+
+        info = self.robot.log_level >= LogLevel.INFO
+        debug = self.robot.log_level >= LogLevel.DEBUG
+
+        if debug:
+            print(f"=== Drive Until Line {count} ===")
+            print(f"{sensor} sensor, {speed} mm/s between lines, {slow_speed} mm/s for the last one")
+
+        state, snapshot = self._motion_snapshot()
+        read = color_sensor.reflection
+        convert = self._converter(side)
+        drive = self.drivebase.drive
+        start = snapshot(state)[SNAP_DISTANCE]
+
+        crossings = []
+        on_line = convert((yield read())) < black_threshold    # Already on a line: wait until it's left
+        last_line = -debounce
+        slow = count == 1 and windows is None and capture is None
+        drive(slow_speed if slow else speed, 0)
+
+        while len(crossings) < count:
+            value = convert((yield read()))
+            distance = snapshot(state)[SNAP_DISTANCE] - start
+            window = windows[len(crossings)] if windows is not None else None
+
+            if window is not None:
+                if distance > window[1]:
+                    self.drivebase.stop()
+                    raise LineNotFoundError(f"Line {len(crossings) + 1} not found between "
+                                            f"{window[0]} and {window[1]} mm")
+                # Inside the last line's window: slow down to find it
+                if not slow and len(crossings) == count - 1 and distance >= window[0]:
+                    slow = True
+                    drive(slow_speed, 0)
+
+            # Close to the expected last line: slow down to find it
+            if capture is not None and not slow and distance >= capture:
+                slow = True
+                drive(slow_speed, 0)
+
+            if on_line:
+                if value > white_threshold:
+                    on_line = False
+                    # Off the second-to-last line: slow down for the last one
+                    if not slow and window is None and capture is None and len(crossings) == count - 1:
+                        slow = True
+                        drive(slow_speed, 0)
+            elif value < black_threshold and distance - last_line >= debounce:
+                on_line = True
+                # Lines before their window (e.g. a mat graphic) are passed without counting
+                if window is None or distance >= window[0]:
+                    crossings.append(distance)
+                    last_line = distance
+                    if debug:
+                        print(f"  Line {len(crossings)} at {distance} mm")
+
+            if max_distance is not None and distance > max_distance:
+                self.drivebase.stop()
+                raise LineNotFoundError(f"Only {len(crossings)} of {count} lines found within {max_distance} mm")
+
+            yield wait(0)
+
+        if stop:
+            self.drivebase.brake()
+
+        if info:
+            print(f"✓ Line {count} found at {crossings[-1]} mm")
+        return crossings
+
+    def follow_line(self, distance, max_speed=None, min_speed=None, feed_forward=0, kp=None, kd=None):
+        """
+        Follow a line with BOTH color sensors straddling it, as fast as the line allows
+
+        The robot steers on the difference between the sensors: on a
+        straight line both read the same. If the robot drifts right, the
+        left sensor moves over the line and reads darker, so it steers left.
+
+        Speed follows a schedule: the robot slows down when the steering
+        error grows (curves) and speeds up again, a bit every loop, once
+        the line is straight. feed_forward adds a constant turn rate for
+        lines with a known curve, so the controller only corrects the rest.
+
+        Args:
+            distance: Distance to follow in mm (measured by the drivebase)
+            max_speed: Speed on straight segments in mm/s (default: FOLLOW_MAX_SPEED)
+            min_speed: Slowest speed in curves in mm/s (default: FOLLOW_MIN_SPEED)
+            feed_forward: Constant turn rate in deg/s for a curved line (default: 0)
+            kp, kd: Steering gains (default: FOLLOW_KP, FOLLOW_KD from config)
+
+        Returns:
+            Dictionary with:
+                average_speed: Distance / time in mm/s
+                average_error: Average left-right difference in %
+                max_error: Largest left-right difference in %
+                time: Total time in ms
+                loops, overruns: Control loop count and late loops
+
+        Example usage:
+            line_moves = LineMovements(robot)
+
+            # Start with the line between the sensors
+            result = line_moves.follow_line(800)
+            print(result["average_speed"], result["average_error"])
+        """
+        return run_steps(self._follow_line_steps(distance, max_speed, min_speed, feed_forward, kp, kd))
+
+    async def follow_line_async(self, distance, max_speed=None, min_speed=None, feed_forward=0, kp=None, kd=None):
+        """Async version of follow_line() for use with run_parallel()/multitask"""
+        return await run_steps_async(self._follow_line_steps(distance, max_speed, min_speed,
+                                                             feed_forward, kp, kd))
+
+    def _follow_line_steps(self, distance, max_speed, min_speed, feed_forward, kp, kd):
+        """Step generator shared by follow_line() and follow_line_async()"""
+        if not self.robot.is_initialized:
+            raise RuntimeError("Robot not initialized. Call robot.initialize() first!")
+
+        left_sensor, _ = self._pick_sensor('left')
+        right_sensor, _ = self._pick_sensor('right')
+
+        config = self.config
+        if max_speed is None:
+            max_speed = config.get('follow_max_speed', 400)
+        if min_speed is None:
+            min_speed = config.get('follow_min_speed', 120)
+        if kp is None:
+            kp = config.get('follow_kp', 1.5)
+        if kd is None:
+            kd = config.get('follow_kd', 6.0)
+        slowdown = config.get('follow_slowdown', 6)
+        speed_up = config.get('follow_speed_up', 10)
+        max_turn = config.get('line_max_turn', 200)
+        period = config.get('line_loop_period', 10)
+
+        info = self.robot.log_level >= LogLevel.INFO
+        debug = self.robot.log_level >= LogLevel.DEBUG
+
+        if debug:
+            print(f"=== Follow Line (two sensors) ===")
+            print(f"{distance} mm, {min_speed}-{max_speed} mm/s, kp={kp} kd={kd} feed forward={feed_forward}")
+
+        # Distance comes from one preallocated snapshot, both sensors right after it
+        state, snapshot = self._motion_snapshot()
+        left_read = left_sensor.reflection
+        right_read = right_sensor.reflection
+        left_convert = self._converter(LEFT)
+        right_convert = self._converter(RIGHT)
+        drive = self.drivebase.drive
+        timer = StopWatch()
+        now = timer.time
+
+        start = snapshot(state)[SNAP_DISTANCE]
+        distance = abs(distance)
+        last_error = left_convert((yield left_read())) - right_convert((yield right_read()))
+        smoothed = 0            # |error| averaged over ~4 loops, x4 (integer)
+        error_total = 0
+        max_error = 0
+        speed = min_speed
+        loops = 0
+        overruns = 0
+        deadline = period
+
+        while abs(snapshot(state)[SNAP_DISTANCE] - start) < distance:
+            error = left_convert((yield left_read())) - right_convert((yield right_read()))
+            turn = feed_forward + kp * error + kd * (error - last_error)
+            last_error = error
+
+            # Speed schedule: slow down as soon as the error grows, speed up gently
+            size = error if error >= 0 else -error
+            smoothed += size - (smoothed >> 2)
+            target = max_speed - slowdown * (smoothed >> 2)
+            if target < min_speed:
+                target = min_speed
+            if target < speed:
+                speed = target
+            elif speed + speed_up < target:
+                speed += speed_up
+            else:
+                speed = target
+
+            drive(speed, max(-max_turn, min(max_turn, turn)))
+
+            error_total += size
+            if size > max_error:
+                max_error = size
+            loops += 1
+
+            # Keep a fixed period; if a loop ran late, start timing again from now
+            time = now()
+            if time >= deadline:
+                overruns += 1
+                deadline = time + period
+            else:
+                yield wait(deadline - time)
+                deadline += period
+
+        self.drivebase.stop()
+
+        elapsed = timer.time()
+        result = {
+            "average_speed": abs(snapshot(state)[SNAP_DISTANCE] - start) * 1000 / elapsed if elapsed else 0,
+            "average_error": error_total / loops if loops else 0,
+            "max_error": max_error,
+            "time": elapsed,
+            "loops": loops,
+            "overruns": overruns,
+        }
+        if info:
+            print(f"✓ Followed line {distance} mm in {elapsed} ms: avg {result['average_speed']:.0f} mm/s, "
+                  f"error avg {result['average_error']:.1f}% max {max_error}%")
+        return result
+
+    def drive_until_zone(self, zone, sensor='left', speed=None, max_distance=None, confirm=2, stop=True):
+        """
+        Drive straight until a color sensor is over a mat zone
+
+        Zones are taught once per event with menu option "Z" (see
+        color_zones.py). The sensor is sampled as fast as possible and the
+        zone must be seen `confirm` times in a row, so one odd reading on a
+        color boundary doesn't stop the robot.
+
+        Args:
+            zone: Zone number to look for (see Zones in season_config.py)
+            sensor: 'left' or 'right' color sensor
+            speed: Speed in mm/s (default: drive_speed from config)
+            max_distance: Raise ZoneNotFoundError after this many mm (default: no limit)
+            confirm: Readings in a row that must show the zone
+            stop: True to stop in the zone, False to keep driving
+
+        Returns:
+            Distance in mm from the start to where the zone was confirmed
+
+        Raises:
+            ZoneNotFoundError: max_distance passed without the zone (robot stopped)
+
+        Example usage:
+            from season_config import Zones
+
+            line_moves = LineMovements(robot)
+            line_moves.drive_until_zone(Zones.RED, speed=300, max_distance=600)
+        """
+        return run_steps(self._drive_until_zone_steps(zone, sensor, speed, max_distance, confirm, stop))
+
+    async def drive_until_zone_async(self, zone, sensor='left', speed=None, max_distance=None, confirm=2,
+                                     stop=True):
+        """Async version of drive_until_zone() for use with run_parallel()/multitask"""
+        return await run_steps_async(self._drive_until_zone_steps(zone, sensor, speed, max_distance,
+                                                                  confirm, stop))
+
+    def _drive_until_zone_steps(self, zone, sensor, speed, max_distance, confirm, stop):
+        """Step generator shared by drive_until_zone() and drive_until_zone_async()"""
+        if not self.robot.is_initialized:
+            raise RuntimeError("Robot not initialized. Call robot.initialize() first!")
+
+        color_sensor, _ = self._pick_sensor(sensor)
+
+        if self.zones is None:
+            self.zones = ColorZones(self.robot.hub)
+        if not self.zones.is_trained:
+            raise RuntimeError("No color zones taught yet - use menu option Z first")
+
+        if speed is None:
+            speed = self.config.get('drive_speed', 200)
+
+        info = self.robot.log_level >= LogLevel.INFO
+
+        # Only the zone and the distance are needed: read just those, as fast as possible
+        hsv = color_sensor.hsv
+        classify = self.zones.classify
+        travelled = self.drivebase.distance
+        start = travelled()
+        seen = 0
+
+        self.drivebase.drive(speed, 0)
+        while seen < confirm:
+            color = yield hsv()
+            if classify(color.h, color.s, color.v) == zone:
+                seen += 1
+            else:
+                seen = 0
+            if max_distance is not None and abs(travelled() - start) > max_distance:
+                self.drivebase.stop()
+                raise ZoneNotFoundError(f"Zone {zone} not found within {max_distance} mm")
+            yield wait(0)
+
+        distance = travelled() - start
+        if stop:
+            self.drivebase.brake()
+
+        if info:
+            print(f"✓ Zone {zone} found at {distance} mm")
+        return distance
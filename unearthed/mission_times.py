@@ -0,0 +1,136 @@
+"""
+Mission Times
+Last, best and average run time of every launch, kept in hub storage
+
+Times survive turning the hub off (see Storage in season_config.py), so the
+team can check whether a tuning change really made a launch faster.
+
+Each slot also stores a short id of the launch's module name. When a launch
+is renamed or the menu is reordered, the old times no longer match and the
+slot starts over instead of mixing two launches.
+"""
+
+from ustruct import pack, unpack
+from season_config import Storage
+
+# Each slot: last, best, average (in 10 ms units) and number of runs
+SLOT_FORMAT = "<HHHH"
+SLOT_SIZE = 8
+MAX_TIME = 0xFFFF       # Largest stored time (10 ms units) and run count; empty slots read as zeros
+ID_FORMAT = "<H"
+ID_SIZE = 2
+
+
+def launch_id(name):
+    """16-bit id of a launch module name (never 0, which fresh storage reads as)"""
+    ident = 0
+    for char in name:
+        ident = (ident * 31 + ord(char)) & 0xFFFF
+    return ident or 1
+
+
+class MissionTimes:
+    """Reads and updates per-launch timing statistics in hub storage"""
+
+    def __init__(self, hub):
+        """
+        Args:
+            hub: PrimeHub instance
+        """
+        self.hub = hub
+
+    def _offset(self, slot):
+        if not 0 <= slot < Storage.MISSION_TIME_SLOTS:
+            return None
+        return Storage.MISSION_TIMES + slot * SLOT_SIZE
+
+    def _matches(self, slot, name):
+        """True if the slot's times belong to this launch (always True without a name)"""
+        if name is None:
+            return True
+        stored = self.hub.system.storage(Storage.MISSION_IDS + slot * ID_SIZE, read=ID_SIZE)
+        return unpack(ID_FORMAT, stored)[0] == launch_id(name)
+
+    def load(self, slot, name=None):
+        """
+        Get stored times for one launch
+
+        Args:
+            slot: Launch slot (menu key - 1)
+            name: Launch module name; times stored for another launch count as none
+
+        Returns:
+            Tuple (last_ms, best_ms, average_ms, runs); runs is 0 if never timed
+        """
+        offset = self._offset(slot)
+        if offset is None or not self._matches(slot, name):
+            return (0, 0, 0, 0)
+
+        last, best, average, runs = unpack(SLOT_FORMAT, self.hub.system.storage(offset, read=SLOT_SIZE))
+        if runs == 0 or best == 0:
+            # Fresh storage reads as zeros
+            return (0, 0, 0, 0)
+        return (last * 10, best * 10, average * 10, runs)
+
+    def record(self, slot, time_ms, name=None):
+        """
+        Store a new run time for one launch
+
+        Args:
+            slot: Launch slot (menu key - 1)
+            time_ms: Duration of the run in milliseconds
+            name: Launch module name; a slot holding another launch's times starts over
+
+        Returns:
+            True if this run is a new best time
+        """
+        offset = self._offset(slot)
+        if offset is None:
+            return False
+
+        last, best, average, runs = self.load(slot, name)
+        time = min(time_ms // 10, MAX_TIME - 1)
+        if runs == 0:
+            best = average = time
+        else:
+            best = best // 10
+            average = average // 10
+            average += (time - average) // min(runs + 1, 20)     # Recent runs weigh more after 20
+
+        new_best = runs == 0 or time < best
+        if new_best:
+            best = time
+        runs = min(runs + 1, MAX_TIME)
+
+        self.hub.system.storage(offset, write=pack(SLOT_FORMAT, time, best, average, runs))
+        if name is not None:
+            self.hub.system.storage(Storage.MISSION_IDS + slot * ID_SIZE,
+                                    write=pack(ID_FORMAT, launch_id(name)))
+        return new_best
+
+    def clear(self):
+        """Forget all stored times"""
+        self.hub.system.storage(Storage.MISSION_TIMES, write=bytes(SLOT_SIZE * Storage.MISSION_TIME_SLOTS))
+        self.hub.system.storage(Storage.MISSION_IDS, write=bytes(ID_SIZE * Storage.MISSION_TIME_SLOTS))
+
+    def summary(self, slot, name=None):
+        """Short text for the menu list, e.g. 'last 21.3s best 20.9s'"""
+        last, best, average, runs = self.load(slot, name)
+        if runs == 0:
+            return "not timed yet"
+        return f"last {last / 1000:.1f}s best {best / 1000:.1f}s"
+
+    def print_table(self, missions):
+        """
+        Print a compact timing table for all launches
+
+        Args:
+            missions: The menu's missions dictionary (key -> {"name": ..., "module": ...})
+        """
+        print("Key  Last    Best    Avg     Runs  Name")
+        for key in sorted(missions):
+            last, best, average, runs = self.load(int(key) - 1, missions[key].get("module"))
+            if runs:
+                print(f"{key:<4}{last / 1000:6.1f}s {best / 1000:6.1f}s {average / 1000:6.1f}s {runs:5}  {missions[key]['name']}")
+            else:
+                print(f"{key:<4}{'-':>7} {'-':>7} {'-':>7} {0:5}  {missions[key]['name']}")
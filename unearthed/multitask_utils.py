@@ -0,0 +1,75 @@
+"""
+Multitask Utilities
+Run robot actions at the same time (e.g. lower an arm while driving)
+
+Helpers in this season write their timed loops as "step" generators that
+yield every wait(), motion call and sensor read. Outside multitasking those
+calls block like normal; inside run_task() they return something to await.
+That lets the same code run both ways:
+
+    run_steps(steps)              # normal (blocking) code
+    await run_steps_async(steps)  # inside an async mission task
+
+The result of each call is sent back into the generator, so a sensor read
+inside a step generator looks like this (never call sensor.reflection() or
+sensor.hsv() directly there - under run_task() that is not a number yet):
+
+    value = yield sensor.reflection()
+"""
+
+from pybricks.tools import multitask, run_task
+
+
+def run_steps(steps):
+    """
+    Run a step generator to completion in normal (blocking) code
+
+    Args:
+        steps: Generator that yields wait()/motion calls and sensor reads
+
+    Returns:
+        The value the generator returns
+    """
+    value = None
+    try:
+        while True:
+            # Blocking calls already returned their result: hand it straight back
+            value = steps.send(value)
+    except StopIteration as done:
+        return done.value
+
+
+async def run_steps_async(steps):
+    """
+    Run a step generator inside a multitask/run_task task
+
+    Args:
+        steps: Generator that yields wait()/motion calls and sensor reads
+
+    Returns:
+        The value the generator returns
+    """
+    value = None
+    try:
+        while True:
+            step = steps.send(value)
+            # Await the call and hand its result (e.g. a reflection reading) back
+            value = None if step is None else await step
+    except StopIteration as done:
+        return done.value
+
+
+def run_parallel(*tasks):
+    """
+    Run several async tasks at the same time and wait until all are done
+
+    Example:
+        run_parallel(
+            robot.straight_async(500),
+            robot.attachment_async("left", 200, -105),
+        )
+
+    Args:
+        *tasks: Coroutines, e.g. robot.straight_async(500)
+    """
+    run_task(multitask(*tasks))
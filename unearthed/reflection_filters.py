@@ -0,0 +1,213 @@
+"""
+Reflection Filters
+Smooth noisy sensor readings without allocating memory on every sample
+
+Every filter keeps its history in a preallocated array('h') ring buffer and
+only does integer math in update(), so it is safe to use in fast control
+loops. More smoothing always means more delay (latency), so pick the
+smallest filter that removes the noise you actually see:
+
+    MovingAverage(size)   Average of the last `size` samples
+                          delay: about (size - 1) / 2 samples
+    Median(size)          Middle value of the last `size` samples (odd size)
+                          removes single-sample spikes, delay: (size - 1) / 2 samples
+    Exponential(shift)    new = old + (sample - old) / 2**shift
+                          delay: about 2**shift - 1 samples, no buffer at all
+
+Example:
+    from reflection_filters import MovingAverage, FilteredSensor
+
+    # Any helper that reads sensor.reflection() now gets smoothed values
+    smooth_left = FilteredSensor(robot.left_color_sensor, MovingAverage(3))
+    line_moves.square_on_line(left_sensor=smooth_left)
+
+    # Or filter every sensor read inside LineMovements
+    line_moves = LineMovements(robot, reflection_filter=lambda: Median(3))
+"""
+
+from array import array
+
+
+class MovingAverage:
+    """Average of the last `size` samples (running sum, O(1) per sample)"""
+
+    def __init__(self, size=4):
+        """
+        Args:
+            size: Number of samples to average
+        """
+        self.size = size
+        self.buffer = array('h', [0] * size)
+        self.reset()
+
+    def reset(self):
+        """Forget all samples"""
+        for i in range(self.size):
+            self.buffer[i] = 0
+        self.index = 0
+        self.count = 0
+        self.total = 0
+
+    def update(self, sample):
+        """Add a sample and return the filtered value"""
+        buffer = self.buffer
+        index = self.index
+        self.total += sample - buffer[index]
+        buffer[index] = sample
+        index += 1
+        self.index = 0 if index == self.size else index
+        if self.count < self.size:
+            self.count += 1
+        return self.total // self.count
+
+
+class Median:
+    """Middle value of the last `size` samples - ignores short spikes completely"""
+
+    def __init__(self, size=3):
+        """
+        Args:
+            size: Number of samples (odd: 3 or 5 is usually enough)
+        """
+        self.size = size
+        self.buffer = array('h', [0] * size)
+        self.sorted = array('h', [0] * size)
+        self.reset()
+
+    def reset(self):
+        """Forget all samples"""
+        for i in range(self.size):
+            self.buffer[i] = 0
+        self.index = 0
+        self.count = 0
+
+    def update(self, sample):
+        """Add a sample and return the filtered value"""
+        buffer = self.buffer
+        index = self.index
+        buffer[index] = sample
+        index += 1
+        self.index = 0 if index == self.size else index
+        if self.count < self.size:
+            self.count += 1
+        count = self.count
+
+        # Insertion sort into the scratch array (tiny N, no allocation)
+        ordered = self.sorted
+        for i in range(count):
+            value = buffer[i]
+            j = i - 1
+            while j >= 0 and ordered[j] > value:
+                ordered[j + 1] = ordered[j]
+                j -= 1
+            ordered[j + 1] = value
+        return ordered[count // 2]
+
+
+class Exponential:
+    """Exponential smoothing: each sample moves the output 1/2**shift of the way"""
+
+    def __init__(self, shift=2):
+        """
+        Args:
+            shift: Smoothing strength (1 = light, 3 = heavy)
+        """
+        self.shift = shift
+        self.reset()
+
+    def reset(self):
+        """Forget all samples"""
+        self.value = None
+
+    def update(self, sample):
+        """Add a sample and return the filtered value"""
+        # Kept with 8 extra fraction bits so small steps don't round away
+        if self.value is None:
+            self.value = sample << 8
+        else:
+            self.value += ((sample << 8) - self.value) >> self.shift
+        return (self.value + 128) >> 8
+
+
+class FilteredSensor:
+    """
+    Wraps a ColorSensor so reflection() returns filtered values
+
+    Blocking code only: under multitask the sensor returns something to
+    await, not a number. Use LineMovements(robot, reflection_filter=...)
+    for the async line methods.
+    """
+
+    def __init__(self, sensor, reflection_filter):
+        """
+        Args:
+            sensor: ColorSensor (or anything with reflection())
+            reflection_filter: MovingAverage, Median or Exponential instance
+        """
+        self.sensor = sensor
+        self.filter = reflection_filter
+
+    def reflection(self):
+        return self.filter.update(self.sensor.reflection())
+
+
+def filtered(read, reflection_filter):
+    """
+    Wrap a read function (e.g. sensor.reflection) with a filter
+
+    Returns:
+        Function with no arguments returning the filtered reading
+    """
+    update = reflection_filter.update
+
+    def read_filtered():
+        return update(read())
+    return read_filtered
+
+
+def record(read, samples=200, period=5):
+    """
+    Record a reading on the hub and print it, for testing filters on a computer
+
+    Copy the printed line into a text file and pass it to
+    test_reflection_filters.py.
+
+    Args:
+        read: Function returning a reading, e.g. robot.left_color_sensor.reflection
+        samples: Number of samples
+        period: ms between samples
+
+    Returns:
+        array('h') of samples
+    """
+    from pybricks.tools import wait
+
+    data = array('h', [0] * samples)
+    for i in range(samples):
+        data[i] = read()
+        wait(period)
+    print(",".join(str(value) for value in data))
+    return data
+
+
+def benchmark(reflection_filter, samples=2000):
+    """
+    Measure the cost of one update() on the hub
+
+    Args:
+        reflection_filter: Filter instance to time
+        samples: Number of updates to time
+
+    Returns:
+        Microseconds per sample
+    """
+    from pybricks.tools import StopWatch
+
+    update = reflection_filter.update
+    timer = StopWatch()
+    for i in range(samples):
+        update(i & 127)
+    per_sample = timer.time() * 1000 // samples
+    reflection_filter.reset()
+    print(f"{type(reflection_filter).__name__}: {per_sample} us per sample")
+    return per_sample
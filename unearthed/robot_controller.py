@@ -3,13 +3,43 @@ Robot Controller
 Common robot initialization and control functions for season missions
 """
 
+from array import array
+
 from pybricks.hubs import PrimeHub
 from pybricks.pupdevices import Motor
 from pybricks.robotics import DriveBase
-from pybricks.tools import wait
-from pybricks.parameters import Stop
+from pybricks.tools import wait, StopWatch
+from pybricks.parameters import Stop, Button
+from umath import sin, cos, tan, atan2, sqrt, pi
+
+from multitask_utils import run_steps, run_steps_async, run_parallel
+from season_config import Ports, Directions, Specifications, SeasonDefaults, Storage, LogLevel
+from sensor_calibration import SensorCalibration, LEFT, RIGHT
+
+# Bits of the cached device map (which optional ports had a device last boot)
+DEVICE_LEFT_ATTACHMENT = 1
+DEVICE_RIGHT_ATTACHMENT = 2
+DEVICE_LEFT_COLOR_SENSOR = 4
+DEVICE_RIGHT_COLOR_SENSOR = 8
+DEVICE_MAP_MARKER = 0xA5     # Marks the stored map as valid (fresh storage reads as zeros)
+
+# Layout of snapshot buffers (see RobotController.snapshot)
+SNAP_LEFT_REFLECTION = 0     # Calibrated reflection, -1 without a sensor
+SNAP_RIGHT_REFLECTION = 1
+SNAP_DISTANCE = 2            # Drivebase distance (mm)
+SNAP_ANGLE = 3               # Drivebase heading (deg)
+SNAP_LEFT_ANGLE = 4          # Wheel angles (deg)
+SNAP_RIGHT_ANGLE = 5
+SNAP_LEFT_SPEED = 6          # Wheel speeds (deg/s)
+SNAP_RIGHT_SPEED = 7
+SNAP_TIME = 8                # ms since begin_mission()
+SNAP_SIZE = 9
+
+
+def no_reading():
+    """Stand-in reader for a sensor a snapshot should skip"""
+    return -1
 
-from season_config import Ports, Directions, Specifications, SeasonDefaults
 
 class RobotInitializationError(Exception):
     """Custom exception for robot initialization errors with enhanced debugging"""
@@ -50,8 +80,27 @@ class RobotController:
         self.right_color_sensor = None
         self.drivebase = None
         
-        # Merge configuration
-        self.config = self._merge_config(base_config or SeasonDefaults, mission_overrides or {})
+        # Merge configuration (base kept so later missions can re-merge their overrides)
+        self.base_config = base_config or SeasonDefaults
+        self.config = self._merge_config(self.base_config, mission_overrides or {})
+        self.log_level = self.config.get('log_level', LogLevel.INFO)
+
+        # Per-sensor black/white calibration from hub storage (menu option "C")
+        self.calibration = SensorCalibration(self.hub)
+
+        # Timing checkpoints recorded by missions with mark()
+        self.mission_timer = StopWatch()
+        self.marks = []
+
+        # Built on first snapshot() (devices only exist after initialize)
+        self._snapshot = None
+
+        # Field pose (see set_pose): x/y in mm, heading in degrees clockwise
+        self.x = 0.0
+        self.y = 0.0
+        self.heading = 0.0
+        self._odometry_distance = 0
+        self._odometry_angle = 0
         
         self.is_initialized = False
     
@@ -70,27 +119,49 @@ class RobotController:
         
         return config
     
-    def initialize(self):
-        """Initialize all robot components with detailed debugging"""
+    def initialize(self, reprobe=False):
+        """
+        Initialize all robot components with detailed debugging
+
+        Args:
+            reprobe: Ignore the cached device map and probe every optional port.
+                Holding the hub's LEFT button during startup does the same.
+        """
+        info = self.log_level >= LogLevel.INFO
+        debug = self.log_level >= LogLevel.DEBUG
+
         if self.is_initialized:
-            print("Robot already initialized, skipping...")
+            if debug:
+                print("Robot already initialized, skipping...")
             return
+
+        if reprobe or Button.LEFT in self.hub.buttons.pressed():
+            if info:
+                print("Re-probing all ports (cached device map ignored)")
+            self._device_map = None
+        else:
+            self._device_map = self._load_device_map()
+        self._found_devices = 0
         
-        print("=== Robot Initialization Debug Info ===")
-        print(f"Left wheel port: {Ports.LEFT_WHEEL}, direction: {Directions.LEFT_WHEEL}")
-        print(f"Right wheel port: {Ports.RIGHT_WHEEL}, direction: {Directions.RIGHT_WHEEL}")
-        print(f"Left attachment port: {Ports.LEFT_ATTACHMENT}, direction: {Directions.LEFT_ATTACHMENT}")
-        print(f"Right attachment port: {Ports.RIGHT_ATTACHMENT}, direction: {Directions.RIGHT_ATTACHMENT}")
-        print(f"Wheel diameter: {Specifications.WHEEL_DIAMETER}mm")
-        print(f"Axle track: {Specifications.AXLE_TRACK}mm")
+        if debug:
+            print("=== Robot Initialization Debug Info ===")
+            print(f"Left wheel port: {Ports.LEFT_WHEEL}, direction: {Directions.LEFT_WHEEL}")
+            print(f"Right wheel port: {Ports.RIGHT_WHEEL}, direction: {Directions.RIGHT_WHEEL}")
+            print(f"Left attachment port: {Ports.LEFT_ATTACHMENT}, direction: {Directions.LEFT_ATTACHMENT}")
+            print(f"Right attachment port: {Ports.RIGHT_ATTACHMENT}, direction: {Directions.RIGHT_ATTACHMENT}")
+            print(f"Wheel diameter: {Specifications.WHEEL_DIAMETER}mm")
+            print(f"Axle track: {Specifications.AXLE_TRACK}mm")
         
         try:
             # Initialize left wheel motor
-            print("Initializing left wheel motor...")
+            if debug:
+                print("Initializing left wheel motor...")
             try:
                 self.left_wheel = Motor(Ports.LEFT_WHEEL, Directions.LEFT_WHEEL)
-                print("✓ Left wheel motor initialized successfully")
+                if debug:
+                    print("✓ Left wheel motor initialized successfully")
             except Exception as e:
+                self.forget_device_map()
                 raise RobotInitializationError(
                     "Failed to initialize left wheel motor",
                     component="left_wheel",
@@ -99,11 +170,14 @@ class RobotController:
                 )
             
             # Initialize right wheel motor
-            print("Initializing right wheel motor...")
+            if debug:
+                print("Initializing right wheel motor...")
             try:
                 self.right_wheel = Motor(Ports.RIGHT_WHEEL, Directions.RIGHT_WHEEL)
-                print("✓ Right wheel motor initialized successfully")
+                if debug:
+                    print("✓ Right wheel motor initialized successfully")
             except Exception as e:
+                self.forget_device_map()
                 raise RobotInitializationError(
                     "Failed to initialize right wheel motor",
                     component="right_wheel",
@@ -111,58 +185,31 @@ class RobotController:
                     original_error=e
                 )
             
-            # Initialize left attachment motor (OPTIONAL - won't fail if not connected)
-            print("Initializing left attachment motor (optional)...")
-            try:
-                self.left_attachment = Motor(Ports.LEFT_ATTACHMENT, Directions.LEFT_ATTACHMENT)
-                # Set control settings for faster acceleration
-                # Note: Values must be realistic for SPIKE motors
-                self.left_attachment.control.limits(acceleration=2000)
-                print("✓ Left attachment motor initialized successfully")
-                print(f"  Acceleration: 2000 deg/s²")
-            except Exception as e:
-                self.left_attachment = None
-                print("⚠ Left attachment not connected (this is okay!)")
-                print(f"  If you need it later, check Port {Ports.LEFT_ATTACHMENT}")
-
-            # Initialize right attachment motor (OPTIONAL - won't fail if not connected)
-            print("Initializing right attachment motor (optional)...")
-            try:
-                self.right_attachment = Motor(Ports.RIGHT_ATTACHMENT, Directions.RIGHT_ATTACHMENT)
-                # Set control settings for faster acceleration
-                # Note: Values must be realistic for SPIKE motors
-                self.right_attachment.control.limits(acceleration=2000)
-                print("✓ Right attachment motor initialized successfully")
-                print(f"  Acceleration: 2000 deg/s²")
-            except Exception as e:
-                self.right_attachment = None
-                print("⚠ Right attachment not connected (this is okay!)")
-                print(f"  If you need it later, check Port {Ports.RIGHT_ATTACHMENT}")
-
-            # Initialize left color sensor (OPTIONAL - won't fail if not connected)
-            print("Initializing left color sensor (optional)...")
-            try:
-                from pybricks.pupdevices import ColorSensor
-                self.left_color_sensor = ColorSensor(Ports.LEFT_COLOR_SENSOR)
-                print("✓ Left color sensor initialized successfully")
-            except Exception as e:
-                self.left_color_sensor = None
-                print("⚠ Left color sensor not connected (this is okay!)")
-                print(f"  If you need it later, check Port {Ports.LEFT_COLOR_SENSOR}")
-
-            # Initialize right color sensor (OPTIONAL - won't fail if not connected)
-            print("Initializing right color sensor (optional)...")
-            try:
-                from pybricks.pupdevices import ColorSensor
-                self.right_color_sensor = ColorSensor(Ports.RIGHT_COLOR_SENSOR)
-                print("✓ Right color sensor initialized successfully")
-            except Exception as e:
-                self.right_color_sensor = None
-                print("⚠ Right color sensor not connected (this is okay!)")
-                print(f"  If you need it later, check Port {Ports.RIGHT_COLOR_SENSOR}")
+            # Optional devices (won't fail if not connected). Ports the cached
+            # device map remembers as empty are skipped instead of waiting for
+            # a failing constructor to time out.
+            from pybricks.pupdevices import ColorSensor
+            self.left_attachment = self._probe_optional(
+                "Left attachment motor", DEVICE_LEFT_ATTACHMENT, Ports.LEFT_ATTACHMENT,
+                lambda: self._create_attachment(Ports.LEFT_ATTACHMENT, Directions.LEFT_ATTACHMENT)
+            )
+            self.right_attachment = self._probe_optional(
+                "Right attachment motor", DEVICE_RIGHT_ATTACHMENT, Ports.RIGHT_ATTACHMENT,
+                lambda: self._create_attachment(Ports.RIGHT_ATTACHMENT, Directions.RIGHT_ATTACHMENT)
+            )
+            self.left_color_sensor = self._probe_optional(
+                "Left color sensor", DEVICE_LEFT_COLOR_SENSOR, Ports.LEFT_COLOR_SENSOR,
+                lambda: ColorSensor(Ports.LEFT_COLOR_SENSOR)
+            )
+            self.right_color_sensor = self._probe_optional(
+                "Right color sensor", DEVICE_RIGHT_COLOR_SENSOR, Ports.RIGHT_COLOR_SENSOR,
+                lambda: ColorSensor(Ports.RIGHT_COLOR_SENSOR)
+            )
+            self._save_device_map(self._found_devices)
 
             # Create drivebase
-            print("Creating drivebase...")
+            if debug:
+                print("Creating drivebase...")
             try:
                 self.drivebase = DriveBase(
                     self.left_wheel, 
@@ -170,7 +217,8 @@ class RobotController:
                     Specifications.WHEEL_DIAMETER, 
                     Specifications.AXLE_TRACK
                 )
-                print("✓ Drivebase created successfully")
+                if debug:
+                    print("✓ Drivebase created successfully")
             except Exception as e:
                 raise RobotInitializationError(
                     "Failed to create drivebase",
@@ -179,25 +227,12 @@ class RobotController:
                 )
             
             # Configure drivebase settings
-            print("Configuring drivebase settings...")
+            if debug:
+                print("Configuring drivebase settings...")
             try:
-                drive_speed = self.config.get('drive_speed', SeasonDefaults.DRIVE_SPEED)
-                drive_accel = self.config.get('drive_acceleration', SeasonDefaults.DRIVE_ACCELERATION)
-                turn_rate = self.config.get('turn_rate', SeasonDefaults.TURN_RATE)
-                turn_accel = self.config.get('turn_acceleration', SeasonDefaults.TURN_ACCELERATION)
-                
-                print(f"  Drive speed: {drive_speed} mm/s")
-                print(f"  Drive acceleration: {drive_accel} mm/s²")
-                print(f"  Turn rate: {turn_rate} °/s")
-                print(f"  Turn acceleration: {turn_accel} °/s²")
-                
-                self.drivebase.settings(
-                    straight_speed=drive_speed,
-                    straight_acceleration=drive_accel,
-                    turn_rate=turn_rate,
-                    turn_acceleration=turn_accel
-                )
-                print("✓ Drivebase settings configured successfully")
+                self._apply_drive_settings()
+                if debug:
+                    print("✓ Drivebase settings configured successfully")
             except Exception as e:
                 raise RobotInitializationError(
                     "Failed to configure drivebase settings",
@@ -206,29 +241,42 @@ class RobotController:
                 )
             
             # Enable gyro for accurate turns
-            print("Enabling gyro...")
+            if debug:
+                print("Enabling gyro...")
             try:
                 self.drivebase.use_gyro(True)
-                print("✓ Gyro enabled successfully")
+                if debug:
+                    print("✓ Gyro enabled successfully")
             except Exception as e:
-                print(f"⚠ Warning: Failed to enable gyro: {e}")
-                print("  Continuing without gyro (turns may be less accurate)")
+                if info:
+                    print(f"⚠ Warning: Failed to enable gyro: {e}")
+                    print("  Continuing without gyro (turns may be less accurate)")
             
+            # The gyro heading drifts if it is used before the IMU has settled
+            self.wait_for_imu_ready()
+
             # Reset measurements
-            print("Resetting measurements...")
+            if debug:
+                print("Resetting measurements...")
             try:
                 self.reset_measurements()
-                print("✓ Measurements reset successfully")
+                if debug:
+                    print("✓ Measurements reset successfully")
             except Exception as e:
-                print(f"⚠ Warning: Failed to reset measurements: {e}")
+                if info:
+                    print(f"⚠ Warning: Failed to reset measurements: {e}")
             
             # Signal successful initialization
             self.hub.light.on(SeasonDefaults.MISSION_START_COLOR)
             self.hub.speaker.beep(500, 100)
             
             self.is_initialized = True
-            print("✓ Robot initialization completed successfully!")
-            print("=" * 40)
+            self._snapshot = None
+            if debug:
+                print("✓ Robot initialization completed successfully!")
+                print("=" * 40)
+            elif info:
+                print("✓ Robot initialized")
             
         except RobotInitializationError:
             # Re-raise our custom error as-is
@@ -244,15 +292,832 @@ class RobotController:
                 original_error=e
             )
     
+    def _create_attachment(self, port, direction):
+        """Create an attachment motor with faster acceleration limits"""
+        motor = Motor(port, direction)
+        # Set control settings for faster acceleration
+        # Note: Values must be realistic for SPIKE motors
+        motor.control.limits(acceleration=2000)
+        return motor
+
+    def _probe_optional(self, name, device_bit, port, create):
+        """
+        Create an optional device unless the cached device map says its port is empty
+
+        Args:
+            name: Human-readable device name for debug output
+            device_bit: DEVICE_* bit for this device in the device map
+            port: Port the device is expected on
+            create: Function that constructs the device
+
+        Returns:
+            The device, or None if it is not connected
+        """
+        info = self.log_level >= LogLevel.INFO
+        debug = self.log_level >= LogLevel.DEBUG
+
+        if debug:
+            print(f"Initializing {name.lower()} (optional)...")
+        if self._device_map is not None and not self._device_map & device_bit:
+            if debug:
+                print(f"⚠ {name} skipped (Port {port} remembered as empty)")
+                print("  Hold LEFT while starting to re-probe all ports")
+            return None
+
+        try:
+            device = create()
+            self._found_devices |= device_bit
+            if debug:
+                print(f"✓ {name} initialized successfully")
+            return device
+        except Exception as e:
+            if info:
+                print(f"⚠ {name} not connected (this is okay!)")
+                print(f"  If you need it later, check Port {port}")
+            return None
+
+    def _load_device_map(self):
+        """
+        Read the cached optional-device map from hub persistent storage
+
+        Returns:
+            Bitmask of DEVICE_* bits, or None if nothing valid is stored
+        """
+        try:
+            data = self.hub.system.storage(Storage.DEVICE_MAP, read=2)
+        except Exception:
+            return None
+        if data[0] != DEVICE_MAP_MARKER:
+            return None
+        return data[1]
+
+    def _save_device_map(self, device_map):
+        """Store the optional-device map found on this boot (only if it changed)"""
+        if device_map == self._device_map:
+            return
+        try:
+            self.hub.system.storage(Storage.DEVICE_MAP, write=bytes((DEVICE_MAP_MARKER, device_map)))
+        except Exception as e:
+            print(f"⚠ Warning: Failed to save device map: {e}")
+
+    def forget_device_map(self):
+        """Clear the cached device map so the next initialize() probes every port"""
+        try:
+            self.hub.system.storage(Storage.DEVICE_MAP, write=bytes(2))
+        except Exception as e:
+            print(f"⚠ Warning: Failed to clear device map: {e}")
+
+    def _apply_drive_settings(self):
+        """Push the current speed/acceleration config to the drivebase"""
+        drive_speed = self.config.get('drive_speed', SeasonDefaults.DRIVE_SPEED)
+        drive_accel = self.config.get('drive_acceleration', SeasonDefaults.DRIVE_ACCELERATION)
+        turn_rate = self.config.get('turn_rate', SeasonDefaults.TURN_RATE)
+        turn_accel = self.config.get('turn_acceleration', SeasonDefaults.TURN_ACCELERATION)
+
+        if self.log_level >= LogLevel.DEBUG:
+            print(f"  Drive speed: {drive_speed} mm/s")
+            print(f"  Drive acceleration: {drive_accel} mm/s²")
+            print(f"  Turn rate: {turn_rate} °/s")
+            print(f"  Turn acceleration: {turn_accel} °/s²")
+
+        self.drivebase.settings(
+            straight_speed=drive_speed,
+            straight_acceleration=drive_accel,
+            turn_rate=turn_rate,
+            turn_acceleration=turn_accel
+        )
+
+    def wait_for_imu_ready(self, timeout=None):
+        """
+        Wait until the IMU is calibrated and the robot is standing still
+
+        Runs once in initialize() instead of a fixed startup delay: it
+        returns as soon as the hub reports the IMU ready and the robot has
+        been stationary for IMU_SETTLE_TIME, so the gyro heading starts
+        without drift.
+
+        Args:
+            timeout: Longest wait in ms (default: IMU_READY_TIMEOUT)
+
+        Returns:
+            True if the IMU is ready, False if the wait timed out
+        """
+        if timeout is None:
+            timeout = self.config.get('imu_ready_timeout', 3000)
+        settle_time = self.config.get('imu_settle_time', 300)
+
+        imu = self.hub.imu
+        # imu.ready() needs recent firmware; without it, stationary is all we can check
+        ready = getattr(imu, "ready", None)
+        timer = StopWatch()
+        still = StopWatch()
+        while timer.time() < timeout:
+            if not imu.stationary():
+                still.reset()
+            elif still.time() >= settle_time and (ready is None or ready()):
+                if self.log_level >= LogLevel.DEBUG:
+                    print(f"✓ IMU ready after {timer.time()} ms")
+                return True
+            wait(10)
+
+        if self.log_level >= LogLevel.INFO:
+            print("⚠ Warning: IMU not ready - keep the robot still while it starts")
+        return False
+
+    def begin_mission(self, mission_overrides=None):
+        """
+        Prepare an already-initialized robot for the next mission (session mode)
+
+        Only the mission's config differences are applied: the config is rebuilt
+        from the base settings plus the new overrides, drivebase settings are
+        re-sent and odometry is reset. Hardware stays open between missions.
+
+        Args:
+            mission_overrides: Dictionary of mission-specific setting overrides
+        """
+        self.config = self._merge_config(self.base_config, mission_overrides or {})
+        self.log_level = self.config.get('log_level', LogLevel.INFO)
+        self.mission_timer.reset()
+        self.marks = []
+
+        if not self.is_initialized:
+            self.initialize()
+            return
+
+        self.drivebase.stop()
+        self._apply_drive_settings()
+        self.reset_measurements()
+
+    def end_mission(self):
+        """Stop all motion after a mission but keep hardware ready for the next one"""
+        if self.drivebase:
+            self.drivebase.stop()
+        if self.left_attachment:
+            self.left_attachment.stop()
+        if self.right_attachment:
+            self.right_attachment.stop()
+
+    def mark(self, label):
+        """
+        Record a timing checkpoint inside a mission
+
+        The menu prints every checkpoint (time since the mission started)
+        after the launch, e.g. robot.mark("brush down").
+
+        Args:
+            label: Short name for this point in the mission
+        """
+        self.marks.append((label, self.mission_timer.time()))
+
+    def run_sequence(self, segments):
+        """
+        Drive a chain of moves, carrying speed from one segment into the next
+
+        Moves use then=Stop.NONE so the robot does not brake between them.
+        It only comes to a full stop before a ("stop",) or ("wait", ms) marker
+        and after the last segment.
+
+        Args:
+            segments: Sequence of tuples:
+                ("straight", distance_mm)
+                ("turn", angle_deg)
+                ("arc", radius_mm, angle_deg)
+                ("stop",)           - stop (and hold) here
+                ("wait", time_ms)   - stop here and wait
+
+        Example:
+            robot.run_sequence((
+                ("straight", 210),
+                ("turn", -40),
+                ("straight", 145),
+                ("stop",),
+                ("straight", -240),
+            ))
+        """
+        run_steps(self._sequence_steps(segments))
+
+    async def run_sequence_async(self, segments):
+        """Async version of run_sequence() for use with run_parallel()/multitask"""
+        await run_steps_async(self._sequence_steps(segments))
+
+    def _sequence_steps(self, segments):
+        """Step generator shared by run_sequence() and run_sequence_async()"""
+        count = len(segments)
+        for index in range(count):
+            segment = segments[index]
+            op = segment[0]
+
+            if op == "stop":
+                continue
+            if op == "wait":
+                yield wait(segment[1])
+                continue
+
+            # Keep rolling unless the next entry is a stop point
+            if index + 1 < count and segments[index + 1][0] not in ("stop", "wait"):
+                then = Stop.NONE
+            else:
+                then = Stop.HOLD
+
+            if op == "straight":
+                yield self.drivebase.straight(segment[1], then=then)
+            elif op == "turn":
+                yield self.drivebase.turn(segment[1], then=then)
+            elif op == "arc":
+                yield self.drivebase.arc(segment[1], segment[2], then=then)
+            else:
+                raise ValueError(f"Unknown sequence segment: {op}")
+            # One pose update per segment, while the robot rolls into the next one
+            self.update_pose()
+
+    async def straight_async(self, distance, then=Stop.HOLD):
+        """Async drivebase.straight() for use with run_parallel()/multitask"""
+        await self.drivebase.straight(distance, then=then)
+
+    async def turn_async(self, angle, then=Stop.HOLD):
+        """Async drivebase.turn() for use with run_parallel()/multitask"""
+        await self.drivebase.turn(angle, then=then)
+
+    async def arc_async(self, radius, angle, then=Stop.HOLD):
+        """Async drivebase.arc() for use with run_parallel()/multitask"""
+        await self.drivebase.arc(radius, angle, then=then)
+
+    async def attachment_async(self, side, speed, angle, then=Stop.HOLD):
+        """
+        Async attachment run_angle() for use with run_parallel()/multitask
+
+        Args:
+            side: "left" or "right" attachment
+            speed: Motor speed in deg/s
+            angle: Angle to turn in degrees
+            then: What to do when the move is done
+        """
+        motor = self.left_attachment if side == "left" else self.right_attachment
+        if motor is None:
+            raise RuntimeError(f"No {side} attachment connected")
+        await motor.run_angle(speed, angle, then=then)
+
+    def run_parallel(self, *tasks):
+        """
+        Run several async actions at the same time and wait for all of them
+
+        Example:
+            # Lower the left arm while driving forward
+            robot.run_parallel(
+                robot.straight_async(500),
+                robot.attachment_async("left", 200, -105),
+            )
+        """
+        run_parallel(*tasks)
+
     def reset_measurements(self):
-        """Reset all distance and angle measurements"""
+        """Reset all distance and angle measurements (and the field pose to 0, 0, 0)"""
         if self.drivebase:
             self.drivebase.reset()
         if self.left_attachment:
             self.left_attachment.reset_angle(0)
         if self.right_attachment:
             self.right_attachment.reset_angle(0)
-    
+        self.x = 0.0
+        self.y = 0.0
+        self.heading = 0.0
+        self._odometry_distance = 0
+        self._odometry_angle = 0
+
+    def straight_hold(self, distance, speed=None, heading=None):
+        """
+        Drive straight while holding a gyro heading
+
+        The heading is locked at the start of the move (or given) and every
+        loop steers back toward it: drive(speed, HOLD_KP * error). Drift from
+        a wheel slipping or the robot brushing a model is corrected while
+        driving instead of showing up as an angle at the end, so long legs
+        can run faster than with straight(). Speed ramps down with
+        drive_acceleration before the target distance.
+
+        Args:
+            distance: Distance in mm (negative = backward)
+            speed: Cruise speed in mm/s (default: drive_speed)
+            heading: Drivebase angle to hold in degrees (default: the current one)
+
+        Returns:
+            Largest heading error during the move in degrees (for tuning HOLD_KP)
+
+        Example:
+            robot.straight_hold(-1000, speed=400)
+        """
+        return run_steps(self._hold_steps(distance, speed, heading))
+
+    async def straight_hold_async(self, distance, speed=None, heading=None):
+        """Async version of straight_hold() for use with run_parallel()/multitask"""
+        return await run_steps_async(self._hold_steps(distance, speed, heading))
+
+    def _hold_steps(self, distance, speed, heading):
+        """Step generator shared by straight_hold() and straight_hold_async()"""
+        if speed is None:
+            speed = self.config.get('drive_speed', 200)
+        kp = self.config.get('hold_kp', 3.0)
+        min_speed = self.config.get('hold_min_speed', 50)
+        period = self.config.get('hold_loop_period', 10)
+        accel2 = 2 * self.config.get('drive_acceleration', 800)
+
+        drivebase = self.drivebase
+        angle = drivebase.angle
+        travelled = drivebase.distance
+        drive = drivebase.drive
+        if heading is None:
+            heading = angle()
+        direction = 1 if distance >= 0 else -1
+        target = travelled() + distance
+        max_error = 0
+
+        while True:
+            remaining = (target - travelled()) * direction
+            if remaining <= 0:
+                break
+            # Slow down so the robot can stop at the target: v = sqrt(2 * a * d)
+            ramp = min_speed + sqrt(accel2 * remaining)
+            error = heading - angle()
+            if abs(error) > max_error:
+                max_error = abs(error)
+            drive(direction * (speed if ramp > speed else ramp), kp * error)
+            yield wait(period)
+            # The heading wanders a little while it is corrected: integrate every loop
+            self.update_pose()
+
+        drivebase.brake()
+        self.update_pose()
+        if self.log_level >= LogLevel.DEBUG:
+            print(f"straight_hold({distance}): largest heading error {max_error:.1f} deg")
+        return max_error
+
+    def square_on_wall(self, direction=-1, speed=None, heading=None, x=None, y=None):
+        """
+        Drive into a wall until both wheels stall, then reset the pose
+
+        Each wheel motor runs on its own (not through the drivebase) with
+        tight temporary stall tolerances. A wheel stops and holds as soon as
+        it stalls against the wall while the other keeps pushing, so the
+        robot pivots until it is square. This takes a fraction of a second
+        at a normal speed instead of a long, slow straight() into the wall.
+
+        Once both wheels stalled, the drivebase heading and distance are reset
+        and the field pose is set: field walls run along x and y, so by default the heading
+        snaps to the nearest multiple of 90 degrees.
+
+        Args:
+            direction: -1 to back into the wall, 1 to drive forward into it
+            speed: Speed in mm/s (default: WALL_SPEED)
+            heading: Field heading the robot faces when square (default: nearest 90)
+            x, y: Field coordinate(s) the wall fixes (default: keep the current one)
+
+        Returns:
+            Dictionary with:
+                aligned: True if both wheels stalled before WALL_TIMEOUT
+                left_time, right_time: ms until each wheel stalled (None if it did not)
+                time: ms in total
+
+        Example:
+            # Back into the south wall: now facing +y, with the wheels 40 mm out
+            robot.square_on_wall(-1, heading=0, y=40)
+        """
+        if speed is None:
+            speed = self.config.get('wall_speed', 150)
+        timeout = self.config.get('wall_timeout', 2000)
+        stall_speed = self.config.get('wall_stall_speed', 50)
+        stall_time = self.config.get('wall_stall_time', 60)
+
+        self.drivebase.stop()
+        self.update_pose()
+
+        # Wheel speed in deg/s for the requested mm/s
+        wheel_speed = direction * speed * 360 / (pi * Specifications.WHEEL_DIAMETER)
+        wheels = (self.left_wheel, self.right_wheel)
+        tolerances = [wheel.control.stall_tolerances() for wheel in wheels]
+        for wheel in wheels:
+            wheel.control.stall_tolerances(stall_speed, stall_time)
+
+        left_stalled = self.left_wheel.stalled
+        right_stalled = self.right_wheel.stalled
+        stall_times = [None, None]
+        timer = StopWatch()
+        try:
+            self.left_wheel.run(wheel_speed)
+            self.right_wheel.run(wheel_speed)
+            while timer.time() < timeout:
+                if stall_times[LEFT] is None and left_stalled():
+                    self.left_wheel.hold()
+                    stall_times[LEFT] = timer.time()
+                if stall_times[RIGHT] is None and right_stalled():
+                    self.right_wheel.hold()
+                    stall_times[RIGHT] = timer.time()
+                if stall_times[LEFT] is not None and stall_times[RIGHT] is not None:
+                    break
+                wait(5)
+        finally:
+            for wheel in wheels:
+                wheel.stop()
+            # Tolerances can only change while the motors are stopped
+            for i in range(2):
+                wheels[i].control.stall_tolerances(*tolerances[i])
+
+        result = {
+            "aligned": stall_times[LEFT] is not None and stall_times[RIGHT] is not None,
+            "left_time": stall_times[LEFT],
+            "right_time": stall_times[RIGHT],
+            "time": timer.time(),
+        }
+
+        self.update_pose()
+        if not result["aligned"]:
+            if self.log_level >= LogLevel.INFO:
+                print("⚠ Warning: Wall not found (a wheel never stalled) - pose not reset")
+            return result
+
+        if heading is None:
+            heading = round(self.heading / 90) * 90
+        self.drivebase.reset()
+        self.set_pose(self.x if x is None else x, self.y if y is None else y, heading)
+        if self.log_level >= LogLevel.INFO:
+            print(f"✓ Squared on wall in {result['time']} ms")
+        return result
+
+    # Field odometry
+    #
+    # Field coordinates are in mm: x to the right, y away from the team
+    # (seen from the launch area). Heading uses the drivebase convention:
+    # degrees, clockwise positive, 0 = facing +y, 90 = facing +x.
+
+    def set_pose(self, x, y, heading=0):
+        """
+        Tell the robot where it is on the field (e.g. its launch position)
+
+        Args:
+            x, y: Position in mm
+            heading: Direction in degrees (0 = facing +y, clockwise positive)
+        """
+        self.x = float(x)
+        self.y = float(y)
+        self.heading = float(heading)
+        self._odometry_distance = self.drivebase.distance()
+        self._odometry_angle = self.drivebase.angle()
+
+    def update_pose(self):
+        """
+        Add the motion since the last update to the field pose
+
+        The drivebase distance and (gyro) heading change since the last call
+        are treated as one arc of constant curvature. Its chord is exact for
+        straight(), turn() and arc() moves, so calling this once after each
+        move keeps the pose exact up to wheel slip. goto(), face(),
+        follow_path(), run_sequence(), straight_hold() and plan steps do that
+        themselves; after your own robot.drivebase.straight()/turn()/arc()
+        calls, call robot.update_pose() before the next goto()/face()/
+        follow_path(), or all those moves are counted as one arc.
+
+        Returns:
+            (x, y, heading) tuple
+        """
+        distance = self.drivebase.distance()
+        angle = self.drivebase.angle()
+        moved = distance - self._odometry_distance
+        turned = angle - self._odometry_angle
+        self._odometry_distance = distance
+        self._odometry_angle = angle
+
+        if moved:
+            turned_rad = turned * pi / 180
+            if -0.001 < turned_rad < 0.001:
+                chord = moved
+            else:
+                chord = 2 * moved / turned_rad * sin(turned_rad / 2)
+            direction = (self.heading + turned / 2) * pi / 180
+            self.x += chord * sin(direction)
+            self.y += chord * cos(direction)
+        self.heading += turned
+        return (self.x, self.y, self.heading)
+
+    def face(self, heading):
+        """
+        Turn in place (the short way round) to a field heading
+
+        Args:
+            heading: Direction in degrees (0 = facing +y, clockwise positive)
+        """
+        self.update_pose()
+        turn = (heading - self.heading + 180) % 360 - 180
+        if turn:
+            self.drivebase.turn(turn)
+        self.update_pose()
+
+    def goto(self, x, y, heading=None, mode="auto", reverse=True):
+        """
+        Drive to a field position
+
+        Modes:
+            "turn": turn toward the point, then drive straight to it (backward
+                    if the point is behind and reverse is allowed - less turning)
+            "arc":  one arc that starts in the current direction and ends on
+                    the point (only for points in front of the robot)
+            "auto": whichever of the two is estimated to be faster
+
+        Args:
+            x, y: Target position in mm
+            heading: Optional final heading (turns in place at the end)
+            mode: "auto", "turn" or "arc"
+            reverse: Allow driving backward in "turn" mode
+
+        Example:
+            robot.set_pose(150, 100, 0)      # Launch position
+            robot.goto(600, 900)
+            robot.goto(600, 400, heading=180)
+
+            robot.drivebase.straight(200)    # Own move: update the pose first
+            robot.update_pose()
+            robot.goto(150, 100)
+        """
+        self.update_pose()
+        dx = x - self.x
+        dy = y - self.y
+        distance = sqrt(dx * dx + dy * dy)
+        if distance < 1:
+            if heading is not None:
+                self.face(heading)
+            return
+
+        # Bearing of the target relative to where the robot is facing (-180..180)
+        bearing = atan2(dx, dy) * 180 / pi
+        offset = (bearing - self.heading + 180) % 360 - 180
+
+        if mode == "auto":
+            speed = self.config.get('drive_speed', 200)
+            turn_rate = self.config.get('turn_rate', 60)
+            turn_needed = abs(offset)
+            if reverse and turn_needed > 90:
+                turn_needed = 180 - turn_needed
+            turn_time = turn_needed / turn_rate + distance / speed
+            mode = "turn"
+            if abs(offset) < 90 and offset:
+                arc_length = distance / sin(abs(offset) * pi / 180) * abs(offset) * pi / 180
+                if arc_length / speed < turn_time:
+                    mode = "arc"
+
+        if mode == "arc":
+            if abs(offset) >= 90:
+                raise ValueError("goto(mode='arc') needs the target in front of the robot")
+            if offset:
+                # Circle tangent to the current heading through the target:
+                # turning angle is twice the bearing offset (positive radius = right)
+                radius = distance / (2 * sin(abs(offset) * pi / 180))
+                self.drivebase.arc(radius if offset > 0 else -radius, 2 * abs(offset))
+            else:
+                self.drivebase.straight(distance)
+        elif mode == "turn":
+            # Pose is updated after the turn: each update must cover one kind of move
+            if reverse and abs(offset) > 90:
+                self.drivebase.turn(offset - 180 if offset > 0 else offset + 180)
+                self.update_pose()
+                self.drivebase.straight(-distance)
+            else:
+                if offset:
+                    self.drivebase.turn(offset)
+                    self.update_pose()
+                self.drivebase.straight(distance)
+        else:
+            raise ValueError(f"Unknown goto mode: {mode}")
+
+        self.update_pose()
+        if heading is not None:
+            self.face(heading)
+
+    def follow_path(self, points, corner_radius=None, speed=None):
+        """
+        Drive through a list of field positions without stopping at the corners
+
+        Every corner is rounded with an arc, so the robot flows from one leg
+        into the next instead of braking, turning in place and accelerating
+        again. Straight legs run at full speed, holding their heading like
+        straight_hold(). Each arc is limited so its own sideways acceleration
+        stays below PATH_LATERAL_ACCELERATION (v = sqrt(a * r)): wheels slip
+        less and the pose stays accurate. The robot slows down with
+        drive_acceleration just before an arc that needs a lower speed, and
+        before the end of the path.
+
+        A corner whose legs are too short for the radius gets a tighter arc
+        (it may use half of a leg between two corners, or all of the first
+        or last leg).
+
+        Args:
+            points: Sequence of (x, y) field positions in mm
+            corner_radius: Arc radius in mm (default: PATH_CORNER_RADIUS)
+            speed: Highest speed in mm/s (default: drive_speed)
+
+        Returns:
+            (x, y, heading) tuple at the end of the path
+
+        Example:
+            robot.set_pose(150, 100, 0)
+            robot.follow_path(((150, 700), (600, 700), (600, 300)))
+        """
+        return run_steps(self._path_steps(points, corner_radius, speed))
+
+    async def follow_path_async(self, points, corner_radius=None, speed=None):
+        """Async version of follow_path() for use with run_parallel()/multitask"""
+        return await run_steps_async(self._path_steps(points, corner_radius, speed))
+
+    def _path_steps(self, points, corner_radius, speed):
+        """Step generator shared by follow_path() and follow_path_async()"""
+        if corner_radius is None:
+            corner_radius = self.config.get('path_corner_radius', 100)
+        if speed is None:
+            speed = self.config.get('drive_speed', 200)
+        lateral_accel = self.config.get('path_lateral_acceleration', 400)
+
+        # Legs as (length, bearing), skipping repeated points
+        self.update_pose()
+        legs = []
+        x = self.x
+        y = self.y
+        for point in points:
+            dx = point[0] - x
+            dy = point[1] - y
+            length = sqrt(dx * dx + dy * dy)
+            if length >= 1:
+                legs.append((length, atan2(dx, dy) * 180 / pi))
+                x = point[0]
+                y = point[1]
+        if not legs:
+            return (self.x, self.y, self.heading)
+
+        # Corner i joins leg i and leg i + 1. Its arc may use half of a leg
+        # that has corners at both ends, or all of the first/last leg.
+        # Moves are (op, length or signed radius, angle, speed limit).
+        last = len(legs) - 1
+        moves = []
+        used = 0
+        for i in range(last + 1):
+            length = legs[i][0] - used
+            used = 0
+            turn = 0
+            if i < last:
+                turn = (legs[i + 1][1] - legs[i][1] + 180) % 360 - 180
+            if abs(turn) >= 1:
+                half = tan(min(abs(turn), 179) * pi / 360)
+                room_in = legs[i][0] if i == 0 else legs[i][0] / 2
+                room_out = legs[i + 1][0] if i + 1 == last else legs[i + 1][0] / 2
+                used = min(corner_radius * half, room_in, room_out)
+                radius = used / half
+                length -= used
+            if length >= 1:
+                moves.append(("straight", length, 0, speed))
+            if used:
+                moves.append(("arc", radius if turn > 0 else -radius, abs(turn),
+                              min(speed, sqrt(lateral_accel * radius))))
+
+        if self.log_level >= LogLevel.INFO:
+            corners = [move[3] for move in moves if move[0] == "arc"]
+            slowest = f", corners at {min(corners):.0f} mm/s or more" if corners else ""
+            print(f"Path: {len(legs)} legs at {speed:.0f} mm/s, {len(corners)} corners{slowest}")
+
+        # Face along the first leg
+        turn = (legs[0][1] - self.heading + 180) % 360 - 180
+        if abs(turn) >= 1:
+            yield self.drivebase.turn(turn)
+            self.update_pose()
+
+        # drive() takes a new speed every loop (settings() can't change while
+        # moving), so every move gets its own speed, like straight_hold()
+        kp = self.config.get('hold_kp', 3.0)
+        min_speed = self.config.get('hold_min_speed', 50)
+        period = self.config.get('hold_loop_period', 10)
+        accel2 = 2 * self.config.get('drive_acceleration', 800)
+        drivebase = self.drivebase
+        angle = drivebase.angle
+        travelled = drivebase.distance
+        drive = drivebase.drive
+        heading = angle()       # Drivebase angle along the current leg
+
+        for index in range(len(moves)):
+            op, size, turn, limit = moves[index]
+            # Arrive at the end of this move no faster than the next one allows
+            exit_speed = moves[index + 1][3] if index < len(moves) - 1 else min_speed
+            exit2 = exit_speed * exit_speed
+            if op == "straight":
+                target = travelled() + size
+                while True:
+                    remaining = target - travelled()
+                    if remaining <= 0:
+                        break
+                    ramp = sqrt(exit2 + accel2 * remaining)
+                    drive(limit if ramp > limit else ramp, kp * (heading - angle()))
+                    yield wait(period)
+                    self.update_pose()
+            else:
+                # Turn rate follows the speed, so the radius stays the same while slowing
+                direction = 1 if size > 0 else -1
+                radius = size * direction
+                rate = direction * 180 / pi / radius      # deg/s of turning per mm/s
+                heading += direction * turn
+                while True:
+                    remaining = (heading - angle()) * direction * pi / 180 * radius
+                    if remaining <= 0:
+                        break
+                    ramp = sqrt(exit2 + accel2 * remaining)
+                    current = limit if ramp > limit else ramp
+                    drive(current, current * rate)
+                    yield wait(period)
+                    self.update_pose()
+
+        drivebase.brake()
+        self.update_pose()
+        return (self.x, self.y, self.heading)
+
+    def new_snapshot(self):
+        """
+        Allocate a buffer for snapshot() - do this once, before the loop
+
+        Returns:
+            array of SNAP_SIZE ints, read with the SNAP_* indexes
+        """
+        return array('l', [0] * SNAP_SIZE)
+
+    def snapshot_function(self, left_reflection=None, right_reflection=None):
+        """
+        Build a function that fills a snapshot buffer in one pass
+
+        Every device method is bound once here, so filling the buffer in a
+        loop allocates nothing (looking up robot.drivebase.distance creates a
+        new bound-method object on every call in MicroPython).
+
+        The reflection readers are plain calls, which only works in blocking
+        code: under multitask/run_task a color sensor returns something to
+        await. Step generators pass no_reading for both sides and read the
+        sensors with raw = yield sensor.reflection() (see multitask_utils.py).
+
+        Args:
+            left_reflection: Function to read the left reflection (default: the
+                calibrated left color sensor; no_reading to skip it)
+            right_reflection: Same for the right side
+
+        Returns:
+            fill(buffer) function that updates and returns the buffer
+        """
+        if left_reflection is None:
+            sensor = self.left_color_sensor
+            left_reflection = self.calibration.reader(sensor, LEFT) if sensor else no_reading
+        if right_reflection is None:
+            sensor = self.right_color_sensor
+            right_reflection = self.calibration.reader(sensor, RIGHT) if sensor else no_reading
+
+        distance = self.drivebase.distance
+        heading = self.drivebase.angle
+        left_angle = self.left_wheel.angle
+        right_angle = self.right_wheel.angle
+        left_speed = self.left_wheel.speed
+        right_speed = self.right_wheel.speed
+        time = self.mission_timer.time
+
+        def fill(buffer):
+            buffer[SNAP_LEFT_REFLECTION] = left_reflection()
+            buffer[SNAP_RIGHT_REFLECTION] = right_reflection()
+            # The gyro heading (and distance on some firmware) can be a float
+            buffer[SNAP_DISTANCE] = int(distance())
+            buffer[SNAP_ANGLE] = int(heading())
+            buffer[SNAP_LEFT_ANGLE] = left_angle()
+            buffer[SNAP_RIGHT_ANGLE] = right_angle()
+            buffer[SNAP_LEFT_SPEED] = left_speed()
+            buffer[SNAP_RIGHT_SPEED] = right_speed()
+            buffer[SNAP_TIME] = time()
+            return buffer
+        return fill
+
+    def snapshot(self, buffer):
+        """
+        Fill a preallocated buffer with everything a control loop needs
+
+        All values are read back to back, so they belong together, and
+        nothing is allocated (unlike get_measurements(), which builds a dict).
+        Blocking code only (see snapshot_function()).
+
+        Example:
+            from robot_controller import SNAP_DISTANCE, SNAP_LEFT_REFLECTION
+
+            state = robot.new_snapshot()
+            while robot.snapshot(state)[SNAP_DISTANCE] < 500:
+                if state[SNAP_LEFT_REFLECTION] < 20:
+                    break
+                wait(5)
+
+        Args:
+            buffer: Buffer from new_snapshot()
+
+        Returns:
+            The same buffer, filled
+        """
+        if self._snapshot is None:
+            self._snapshot = self.snapshot_function()
+        return self._snapshot(buffer)
+
     def get_measurements(self):
         """Get current robot measurements"""
         if not self.is_initialized:
@@ -291,31 +1156,43 @@ class RobotController:
     
     def cleanup(self):
         """Clean up robot state and stop all motors with proper resource release"""
-        print("=== Robot Cleanup Debug Info ===")
+        info = self.log_level >= LogLevel.INFO
+        debug = self.log_level >= LogLevel.DEBUG
+
+        if debug:
+            print("=== Robot Cleanup Debug Info ===")
         
         # Stop and reset drivebase first
         if self.drivebase:
-            print("Stopping and resetting drivebase...")
+            if debug:
+                print("Stopping and resetting drivebase...")
             try:
                 self.drivebase.stop()
-                print("✓ Drivebase stopped")
+                if debug:
+                    print("✓ Drivebase stopped")
             except Exception as e:
-                print(f"⚠ Warning: Failed to stop drivebase: {e}")
+                if info:
+                    print(f"⚠ Warning: Failed to stop drivebase: {e}")
             
             try:
                 self.drivebase.use_gyro(False)
-                print("✓ Gyro disabled")
+                if debug:
+                    print("✓ Gyro disabled")
             except Exception as e:
-                print(f"⚠ Warning: Failed to disable gyro: {e}")
+                if info:
+                    print(f"⚠ Warning: Failed to disable gyro: {e}")
             
             try:
                 self.drivebase.reset()
-                print("✓ Drivebase reset (also calls stop)")
+                if debug:
+                    print("✓ Drivebase reset (also calls stop)")
             except Exception as e:
-                print(f"⚠ Warning: Failed to reset drivebase: {e}")
+                if info:
+                    print(f"⚠ Warning: Failed to reset drivebase: {e}")
             
             self.drivebase = None
-            print("✓ Drivebase reference cleared")
+            if debug:
+                print("✓ Drivebase reference cleared")
         
         # Close each motor and sensor properly to release hardware resources
         motors_to_close = [
@@ -332,47 +1209,62 @@ class RobotController:
         
         for motor_name, motor in motors_to_close:
             if motor:
-                print(f"Stopping and closing {motor_name}...")
+                if debug:
+                    print(f"Stopping and closing {motor_name}...")
                 try:
                     motor.stop()
-                    print(f"✓ {motor_name} stopped")
+                    if debug:
+                        print(f"✓ {motor_name} stopped")
                 except Exception as e:
-                    print(f"⚠ Warning: Failed to stop {motor_name}: {e}")
+                    if info:
+                        print(f"⚠ Warning: Failed to stop {motor_name}: {e}")
                 
                 try:
                     motor.close()  # This is the key addition - properly releases hardware!
-                    print(f"✓ {motor_name} closed and hardware released")
+                    if debug:
+                        print(f"✓ {motor_name} closed and hardware released")
                 except Exception as e:
-                    print(f"⚠ Warning: Failed to close {motor_name}: {e}")
+                    if info:
+                        print(f"⚠ Warning: Failed to close {motor_name}: {e}")
                 
                 # Clear the reference
                 setattr(self, motor_name, None)
-                print(f"✓ {motor_name} reference cleared")
+                if debug:
+                    print(f"✓ {motor_name} reference cleared")
 
         # Clear sensor references (ColorSensor objects don't have a close() method)
         for sensor_name, sensor in sensors_to_close:
             if sensor:
-                print(f"Clearing {sensor_name}...")
+                if debug:
+                    print(f"Clearing {sensor_name}...")
                 # ColorSensor objects in PyBricks don't need explicit closing
                 # Just clear the reference to release them
                 setattr(self, sensor_name, None)
-                print(f"✓ {sensor_name} reference cleared")
+                if debug:
+                    print(f"✓ {sensor_name} reference cleared")
 
         # Turn off display and light
         try:
             self.hub.display.off()
             self.hub.light.off()
-            print("✓ Display and light turned off")
+            if debug:
+                print("✓ Display and light turned off")
         except Exception as e:
-            print(f"⚠ Warning: Failed to turn off display/light: {e}")
+            if info:
+                print(f"⚠ Warning: Failed to turn off display/light: {e}")
         
         # Reset initialization flag
         self.is_initialized = False
-        print("✓ Initialization flag reset")
+        self._snapshot = None
+        if debug:
+            print("✓ Initialization flag reset")
         
         wait(100)  # Brief pause for cleanup
-        print("✓ Robot cleanup completed with proper hardware release")
-        print("=" * 55)
+        if debug:
+            print("✓ Robot cleanup completed with proper hardware release")
+            print("=" * 55)
+        elif info:
+            print("✓ Robot cleaned up")
     
     def get_system_info(self):
         """Get system diagnostic information"""
@@ -29,6 +29,13 @@ class Specifications:
     WHEEL_DIAMETER = 56  # mm
     AXLE_TRACK = 80          # mm
 
+# Output detail levels (every print goes out over BLE/USB and slows the hub)
+class LogLevel:
+    """How much helper classes print - compare with >= (e.g. level >= LogLevel.INFO)"""
+    SILENT = 0      # No output at all: fastest init/cleanup and control loops
+    INFO = 1        # One-line summaries and warnings
+    DEBUG = 2       # Full step-by-step debug output (slow!)
+
 # Season-wide Default Settings
 class SeasonDefaults:
     """Default settings that can be overridden by individual missions"""
@@ -37,9 +44,66 @@ class SeasonDefaults:
     DRIVE_ACCELERATION = 800    # mm/s²
     TURN_ACCELERATION = 120     # degrees/s²
 
+    # Output detail (LogLevel.SILENT for competition runs)
+    LOG_LEVEL = LogLevel.INFO
+
     # Line following settings
     BLACK_THRESHOLD = 20        # Reflection % below which is considered black (0-100)
 
+    # Color sensor calibration sweep (menu option "C", once per event)
+    CALIBRATION_DISTANCE = 120  # mm driven over the line and back
+    CALIBRATION_SPEED = 60      # mm/s while sweeping
+
+    # Line squaring alignment (LineMovements.square_on_line)
+    SQUARE_KP = 8               # deg/s of wheel speed per % reflection error
+    SQUARE_TOLERANCE = 3        # % each sensor may be off BLACK_THRESHOLD when square
+    SQUARE_SETTLE = 100         # ms both sensors must stay within tolerance
+    SQUARE_TIMEOUT = 1500       # ms before alignment gives up
+
+    # Fast line search (square_on_line with expected_distance)
+    LINE_CRUISE_SPEED = 400     # mm/s until the robot is close to the expected line
+    LINE_CAPTURE_WINDOW = 60    # mm before the expected line to slow down to drive_speed
+
+    # Line counting (LineMovements.drive_until_line)
+    LINE_WHITE_THRESHOLD = 50   # Reflection % above which the sensor has left a line again
+    LINE_DEBOUNCE = 25          # mm - minimum gap between two counted lines (about a line's width)
+
+    # Line edge follower (LineMovements.follow_line_edge)
+    LINE_TARGET = 45            # Reflection % on the edge of the line (half black, half white)
+    LINE_SPEED = 150            # mm/s along the line
+    LINE_KP = 2.0               # deg/s of steering per % reflection error
+    LINE_KI = 0.0               # deg/s per % of error summed over loops
+    LINE_KD = 8.0               # deg/s per % change since the previous loop
+    LINE_MAX_TURN = 200         # deg/s steering limit
+    LINE_LOOP_PERIOD = 10       # ms per control loop (fixed, so the gains mean the same at any speed)
+
+    # Two-sensor line follower (LineMovements.follow_line, uses LINE_MAX_TURN/LINE_LOOP_PERIOD too)
+    FOLLOW_MAX_SPEED = 400      # mm/s on straight line segments
+    FOLLOW_MIN_SPEED = 120      # mm/s in the tightest curves
+    FOLLOW_SLOWDOWN = 6         # mm/s slower per % of (smoothed) left-right difference
+    FOLLOW_SPEED_UP = 10        # mm/s faster per loop at most when the line gets straight again
+    FOLLOW_KP = 1.5             # deg/s of steering per % left-right difference
+    FOLLOW_KD = 6.0             # deg/s per % change since the previous loop
+
+    # Path following with rounded corners (robot.follow_path, ShapeMovements)
+    PATH_CORNER_RADIUS = 100    # mm - arc radius at each corner
+    PATH_LATERAL_ACCELERATION = 400  # mm/s² sideways in corners (speed = sqrt(accel * radius))
+
+    # Heading-hold straight drive (robot.straight_hold, straight legs of robot.follow_path)
+    HOLD_KP = 3.0               # deg/s of steering per degree off the locked heading
+    HOLD_MIN_SPEED = 50         # mm/s when arriving at the target distance
+    HOLD_LOOP_PERIOD = 10       # ms per control loop
+
+    # IMU startup check (robot.wait_for_imu_ready, runs in initialize)
+    IMU_SETTLE_TIME = 300       # ms the robot must stand still before the gyro is used
+    IMU_READY_TIMEOUT = 3000    # ms to wait at most (then continue with a warning)
+
+    # Wall squaring (robot.square_on_wall)
+    WALL_SPEED = 150            # mm/s into the wall
+    WALL_STALL_SPEED = 50       # deg/s - a wheel slower than this while pushing is stalled
+    WALL_STALL_TIME = 60        # ms it must stay that slow (shorter than the motor default)
+    WALL_TIMEOUT = 2000         # ms before giving up if a wheel never reaches the wall
+
     # Display settings
     DISPLAY_DELAY = 500         # ms between display updates
     COMPLETION_BEEP_FREQ = 800  # Hz
@@ -51,6 +115,37 @@ class SeasonDefaults:
     MISSION_ERROR_COLOR = Color.RED
     MISSION_RUNNING_COLOR = Color.YELLOW
 
+# Hub persistent storage layout (hub.system.storage, 512 bytes in total)
+class Storage:
+    """Byte offsets of data kept in the hub's persistent storage"""
+    DEVICE_MAP = 0              # 2 bytes: valid marker + optional device bitmask
+    MISSION_TIMES = 2           # 8 bytes per launch: last/best/average time + runs
+    MISSION_TIME_SLOTS = 10     # Launches with menu keys 1-10
+    CALIBRATION = 82            # 5 bytes: valid marker + black/white of each color sensor
+    COLOR_ZONES = 87            # 385 bytes: valid marker + HSV zone lookup table
+    MISSION_IDS = 472           # 2 bytes per launch: id of the launch whose times are stored
+
+# Mat color zones (color_zones.py) - 0 always means "not a known zone"
+class Zones:
+    """Zone numbers the HSV classifier can learn (menu option "Z" teaches TEACH_ORDER)"""
+    UNKNOWN = 0
+    WHITE = 1
+    BLACK = 2
+    BASE = 3
+    RED = 4
+    YELLOW = 5
+    GREEN = 6
+    BLUE = 7
+    TEACH_ORDER = (BASE, RED, YELLOW, GREEN, BLUE, BLACK, WHITE)
+
+# Match mode (menu option "M")
+class Match:
+    """Back-to-back launch order and start trigger for a full match"""
+    ORDER = ("1", "2", "3", "4", "5")   # Menu keys in the order they run in a match
+    DURATION = 150000           # ms - match length, shown as a bar between launches
+    PLACED_TIME = 600           # ms the robot must sit still after being picked up
+                                # and put down to start the next launch (0 = buttons only)
+
 # Season Information
 class SeasonInfo:
     """Season metadata"""
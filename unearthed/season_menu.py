@@ -5,53 +5,55 @@ Main menu for selecting and running season missions
 
 from pybricks.tools import hub_menu
 from pybricks.hubs import PrimeHub
-from pybricks.parameters import Color
-from pybricks.tools import wait
-
-# Import all mission modules (flat structure for PyBricks compatibility)
-import launch_01_surface_brushing
-import launch_02_ship_wreck_Left1st
-import launch_03_whats_on_scale
-import launch_04_silo
-import launch_05_heavy_lifting
-import mission_04_warm_up
-from season_config import SeasonInfo, SeasonDefaults
+from pybricks.parameters import Color, Button
+from pybricks.tools import wait, StopWatch
+import gc
+import sys
+
+# Missions are registered by module name and imported only when selected
+# (flat structure for PyBricks compatibility)
+from season_config import SeasonInfo, SeasonDefaults, LogLevel, Match, Zones
+from mission_times import MissionTimes
 
 class SeasonMenu:
     """Main season menu controller"""
 
     def __init__(self):
         self.hub = PrimeHub()
+        self.robot = None      # Shared RobotController for the whole session
+        self.display = None
+        self.verbose = SeasonDefaults.LOG_LEVEL >= LogLevel.INFO
+        self.times = MissionTimes(self.hub)
         self.missions = {
             "1": {
                 "name": "Surface Brushing",
                 "description": "Missions 01, 02, and 14",
-                "run_function": launch_01_surface_brushing
+                "module": "launch_01_surface_brushing"
             },
             "2": {
                 "name": "Ship Wreck",
                 "description": "Misions 12 and 15",
-                "run_function": launch_02_ship_wreck_Left1st
+                "module": "launch_02_ship_wreck_Left1st"
             },
             "3": {
                 "name": "Silo",
                 "description": "Missions 08, 05, 06",
-                "run_function": launch_04_silo
+                "module": "launch_04_silo"
             },
             "4": {
                 "name": "What's On Scale",
                 "description": "Missions 09, 10, and 03",
-                "run_function": launch_03_whats_on_scale
+                "module": "launch_03_whats_on_scale"
             },
             "5": {
                 "name": "Heavy Lifting",
                 "description": "Mission 07", 
-                "run_function": launch_05_heavy_lifting
+                "module": "launch_05_heavy_lifting"
             },
             "6": {
                 "name": "warm_up",
                 "description": "Prepares robot for first run by warming up motors",
-                "run_function": mission_04_warm_up
+                "module": "mission_04_warm_up"
             }
         }
 
@@ -70,106 +72,380 @@ class SeasonMenu:
         print("\nAvailable Missions:")
         print("-" * 30)
         for key, mission in sorted(self.missions.items()):
-            print(f"{key}. {mission['name']}")
+            print(f"{key}. {mission['name']}  ({self.times.summary(int(key) - 1, mission['module'])})")
             print(f"   {mission['description']}")
+        print("M. Match mode (" + " > ".join(Match.ORDER) + ")")
+        print("C. Calibrate color sensors")
+        print("Z. Teach mat color zones")
+        print("T. Show launch times")
         print("Q. Quit")
         print("-" * 30)
 
+    def report_time(self, mission_key, run_ms, marks):
+        """
+        Store a launch's run time and print it with its checkpoints
+
+        Args:
+            mission_key: Key of the mission that ran
+            run_ms: How long run() took in milliseconds
+            marks: (label, time_ms) checkpoints recorded with robot.mark()
+        """
+        new_best = self.times.record(int(mission_key) - 1, run_ms,
+                                     self.missions[mission_key]["module"])
+        if not self.verbose:
+            return
+        print(f"Run time: {run_ms / 1000:.2f}s{' (new best!)' if new_best else ''}")
+        for label, time_ms in marks:
+            print(f"  {time_ms / 1000:6.2f}s  {label}")
+
+    def load_mission(self, module_name):
+        """
+        Import a mission module on demand
+
+        Args:
+            module_name: Name of the mission module (file name without .py)
+
+        Returns:
+            The imported mission module
+        """
+        gc.collect()
+        if self.verbose:
+            print(f"Free memory before loading {module_name}: {gc.mem_free()} bytes")
+        return __import__(module_name)
+
+    def unload_mission(self, module_name):
+        """
+        Remove a mission module from sys.modules and reclaim its RAM
+
+        Args:
+            module_name: Name of the mission module (file name without .py)
+        """
+        if module_name in sys.modules:
+            del sys.modules[module_name]
+        gc.collect()
+        if self.verbose:
+            print(f"Free memory after unloading {module_name}: {gc.mem_free()} bytes")
+
+    def start_session(self):
+        """
+        Initialize robot hardware once for the whole menu session
+
+        Missions reuse this RobotController and only apply their own
+        MISSION_CONFIG differences, so launches start without re-creating
+        every Motor/ColorSensor/DriveBase.
+        """
+        if self.robot is not None and self.robot.is_initialized:
+            return
+
+        from robot_controller import RobotController
+        from display_patterns import DisplayPatterns
+
+        self.robot = RobotController(SeasonDefaults)
+        self.robot.initialize()
+        self.display = DisplayPatterns(self.robot.hub)
+
+    def end_session(self):
+        """Fully tear down robot hardware (quit or after an error)"""
+        if self.robot is not None:
+            self.robot.cleanup()
+        self.robot = None
+        self.display = None
+
     def run_mission(self, mission_key):
         """
         Run a specific mission
 
         Args:
             mission_key: Key of the mission to run
+
+        Returns:
+            True if the mission completed, False if it failed
         """
+        completed = False
         if mission_key in self.missions:
             mission = self.missions[mission_key]
 
-            print(f"\n=== Starting Mission {mission_key}: {mission['name']} ===")
-            print(f"Description: {mission['description']}")
+            if self.verbose:
+                print(f"\n=== Starting Mission {mission_key}: {mission['name']} ===")
+                print(f"Description: {mission['description']}")
 
             # Show mission number on display
             self.hub.display.number(int(mission_key))
-            wait(1000)
 
-            # Import required classes for mission execution
-            from robot_controller import RobotController
-            from display_patterns import DisplayPatterns
-
-            # Get mission config (if the mission defines one)
-            mission_module = mission["run_function"]
-            mission_config = getattr(mission_module, 'MISSION_CONFIG', {})
-
-            # Initialize robot with mission-specific config
-            robot = RobotController(SeasonDefaults, mission_config)
+            # Measures launch turnaround: selection -> start, and finish -> menu
+            turnaround = StopWatch()
+            setup_ms = 0
 
             try:
-                # Initialize robot hardware
-                robot.initialize()
+                # Import the mission only now that it was selected
+                mission_module = self.load_mission(mission["module"])
+                mission_config = getattr(mission_module, 'MISSION_CONFIG', {})
 
-                # Create display helper
-                display = DisplayPatterns(robot.hub)
+                # Hardware is only initialized the first time (or after an error)
+                self.start_session()
+                robot = self.robot
+
+                # Apply this mission's settings and reset odometry
+                robot.begin_mission(mission_config)
 
                 # Signal mission start
                 robot.mission_start_signal()
+                setup_ms = turnaround.time()
 
                 # Execute the mission (pass initialized robot and display)
-                mission["run_function"].run(robot, display)
+                run_timer = StopWatch()
+                mission_module.run(robot, self.display)
+                run_ms = run_timer.time()
+                turnaround.reset()
+
+                # Stop motion but keep hardware ready for the next launch
+                robot.end_mission()
 
                 # Success feedback
                 robot.mission_success_signal()
-                print(f"Mission {mission_key} completed successfully!")
+                if self.verbose:
+                    print(f"Mission {mission_key} completed successfully!")
+                self.report_time(mission_key, run_ms, robot.marks)
+                completed = True
 
             except Exception as e:
                 # Error feedback
-                print(f"Mission {mission_key} failed: {e}")
-                robot.mission_error_signal()
+                if self.verbose:
+                    print(f"Mission {mission_key} failed: {e}")
+                self.hub.light.on(SeasonDefaults.MISSION_ERROR_COLOR)
+                self.hub.speaker.beep(200, 500)
 
                 # Show error on display
-                from display_patterns import DisplayPatterns
-                display = DisplayPatterns(robot.hub)
-                display.show_error_x()
+                if self.display is not None:
+                    self.display.show_error_x()
 
-            finally:
-                # Always clean up robot state
-                robot.cleanup()
-
-                # Brief pause before returning to menu
-                wait(2000)
+                # Full teardown so the next launch starts from fresh hardware
+                self.end_session()
                 self.hub.light.off()
                 self.hub.display.off()
+
+            finally:
+                # Drop the mission's bytecode so the next one has room
+                mission_module = None
+                self.unload_mission(mission["module"])
+                if self.verbose:
+                    print(f"Turnaround: setup {setup_ms} ms, teardown {turnaround.time()} ms")
         else:
             print(f"Invalid mission: {mission_key}")
             self.hub.speaker.beep(300, 100)
+        return completed
+
+    def calibrate_sensors(self):
+        """
+        Sweep both color sensors over a black line and store their range
+
+        Run this once per event (new table, new lighting). Place the robot
+        with both sensors on white just before a black line first.
+        """
+        if self.verbose:
+            print("\n=== Sensor calibration: both sensors on white, just before a black line ===")
+        try:
+            self.start_session()
+            self.robot.begin_mission()
+            self.robot.mission_start_signal()
+            self.robot.calibration.calibrate(self.robot)
+            self.robot.end_mission()
+            self.robot.mission_success_signal()
+            if self.verbose:
+                print("✓ Calibration saved")
+        except Exception as e:
+            if self.verbose:
+                print(f"Calibration failed: {e}")
+            self.hub.light.on(SeasonDefaults.MISSION_ERROR_COLOR)
+            self.hub.speaker.beep(200, 500)
+            self.end_session()
+
+    def teach_zones(self):
+        """
+        Teach the mat color zones in Zones.TEACH_ORDER with the left sensor
+
+        For each zone the display shows its number: hold the sensor over
+        that zone and press RIGHT (LEFT skips it). The table is saved on the
+        hub afterwards.
+        """
+        from color_zones import ColorZones
+
+        if self.verbose:
+            print("\n=== Teach zones: put the LEFT sensor over the zone shown, press RIGHT (LEFT = skip) ===")
+        try:
+            self.start_session()
+            sensor = self.robot.left_color_sensor
+            if not sensor:
+                raise RuntimeError("Teaching zones needs the left color sensor")
+
+            zones = ColorZones(self.hub)
+            zones.clear()
+            for zone in Zones.TEACH_ORDER:
+                self.hub.display.number(zone)
+                while not self.hub.buttons.pressed():
+                    wait(10)
+                pressed = self.hub.buttons.pressed()
+                while self.hub.buttons.pressed():
+                    wait(10)
+                if Button.RIGHT in pressed:
+                    zones.teach(sensor, zone)
+                    self.hub.speaker.beep(800, 50)
+            zones.build()
+            zones.save()
+            self.hub.display.off()
+            if self.verbose:
+                print("✓ Zones saved")
+        except Exception as e:
+            if self.verbose:
+                print(f"Teaching zones failed: {e}")
+            self.hub.light.on(SeasonDefaults.MISSION_ERROR_COLOR)
+            self.hub.speaker.beep(200, 500)
+            self.end_session()
+
+    def wait_for_launch(self, mission_key, match_timer, started):
+        """
+        Wait until the driver starts the preselected launch
+
+        The display switches between the launch number and a bar showing
+        how much of the match has gone by.
+
+        Start triggers:
+            RIGHT button: start now
+            Robot picked up and put down again (still for Match.PLACED_TIME)
+            LEFT button: skip this launch
+
+        Args:
+            mission_key: Key of the preselected launch
+            match_timer: StopWatch started at the first launch
+            started: False until the first launch has run (bar stays empty)
+
+        Returns:
+            True to start the launch, False to skip it
+        """
+        buttons = self.hub.buttons
+        imu = self.hub.imu
+        still = StopWatch()
+        blink = StopWatch()
+        show_number = True
+        self.hub.display.number(int(mission_key))
+
+        # Only arm the placed trigger once the robot has settled after the last launch
+        settled = False
+        picked_up = False
+
+        while True:
+            pressed = buttons.pressed()
+            if Button.RIGHT in pressed or Button.LEFT in pressed:
+                start = Button.RIGHT in pressed
+                while buttons.pressed():
+                    wait(10)
+                return start
+
+            if Match.PLACED_TIME:
+                if not imu.stationary():
+                    picked_up = settled
+                    still.reset()
+                elif still.time() >= Match.PLACED_TIME:
+                    if picked_up:
+                        return True
+                    settled = True
+
+            if blink.time() >= SeasonDefaults.DISPLAY_DELAY:
+                blink.reset()
+                show_number = not show_number
+                if show_number:
+                    self.hub.display.number(int(mission_key))
+                elif self.display is not None:
+                    elapsed = match_timer.time() if started else 0
+                    self.display.show_progress_bar(min(100, elapsed * 100 // Match.DURATION))
+            wait(10)
+
+    def run_match(self):
+        """
+        Run the launches in Match.ORDER back to back
+
+        After each launch the next one is preselected and starts on a single
+        button press or when the robot is put down in base. A failed launch
+        stays selected so it can be run again (LEFT skips it).
+        """
+        if self.verbose:
+            print("\n=== Match mode: RIGHT = start, LEFT = skip, or pick up and place the robot ===")
+        match_timer = StopWatch()
+        started = False
+        index = 0
+
+        while index < len(Match.ORDER):
+            mission_key = Match.ORDER[index]
+            if self.verbose:
+                print(f"Next: {mission_key}. {self.missions[mission_key]['name']}")
+
+            if not self.wait_for_launch(mission_key, match_timer, started):
+                if self.verbose:
+                    print(f"Skipped {mission_key}")
+                index += 1
+                continue
+
+            if not started:
+                match_timer.reset()
+                started = True
+
+            if self.run_mission(mission_key):
+                index += 1
+            if self.verbose:
+                print(f"Match time: {match_timer.time() / 1000:.1f}s")
+
+        if started and self.verbose:
+            print(f"Match finished in {match_timer.time() / 1000:.1f}s")
+        self.hub.display.off()
 
     def main_loop(self):
         """Main menu loop"""
         self.show_welcome()
 
+        # Initialize hardware up front so the first launch starts immediately
+        try:
+            self.start_session()
+        except Exception as e:
+            if self.verbose:
+                print(f"Robot initialization failed, will retry on launch: {e}")
+            self.end_session()
+
         while True:
             self.show_mission_list()
 
             # Get user selection
             print(f"\nSelect mission (1-5) or Q to quit:")
-            selected = hub_menu("1", "2", "3", "4", "4", "5", "Q")
+            selected = hub_menu("1", "2", "3", "4", "4", "5", "M", "C", "Z", "T", "Q")
 
             if selected == "Q":
                 print("\nExiting season menu...")
+                self.end_session()
                 self.hub.display.text("BYE")
                 wait(1000)
                 self.hub.display.off()
                 self.hub.light.off()
                 break
+            elif selected == "M":
+                self.run_match()
+            elif selected == "C":
+                self.calibrate_sensors()
+            elif selected == "Z":
+                self.teach_zones()
+            elif selected == "T":
+                self.times.print_table(self.missions)
             else:
                 self.run_mission(selected)
 
 def main():
     """Main function to start the season menu"""
+    menu = None
     try:
         menu = SeasonMenu()
         menu.main_loop()
     except Exception as e:
         print(f"Season menu error: {e}")
+        if menu is not None:
+            menu.end_session()
         # Emergency cleanup
         hub = PrimeHub()
         hub.light.on(Color.RED)
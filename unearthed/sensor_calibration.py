@@ -0,0 +1,194 @@
+"""
+Sensor Calibration
+Black/white range of each color sensor, kept in hub storage
+
+No two ColorSensors read the same: one may see the line as 8% and the mat
+as 92%, the other 14% and 78%. After calibrating once per event (menu
+option "C") every LineMovements method works with normalized reflection,
+where 0 is this sensor's black and 100 its white, so one threshold fits
+both sensors.
+"""
+
+from pybricks.tools import wait
+from season_config import Storage, LogLevel
+
+LEFT = 0
+RIGHT = 1
+
+CALIBRATION_MARKER = 0xC5   # Marks stored calibration as valid (fresh storage reads as zeros)
+CALIBRATION_SIZE = 5        # Marker + black/white per sensor
+MIN_SPAN = 20               # Smallest black-to-white difference that counts as a calibration
+
+
+class SensorCalibration:
+    """Loads, stores and applies per-sensor black/white calibration"""
+
+    def __init__(self, hub):
+        """
+        Args:
+            hub: PrimeHub instance
+        """
+        self.hub = hub
+        # (black, scale) per sensor: normalized = ((raw - black) * scale) >> 8
+        self.ranges = [(0, 256), (0, 256)]
+        self.is_calibrated = False
+        self.load()
+
+    def load(self):
+        """Read calibration from hub storage (identity transform if none is stored)"""
+        try:
+            data = self.hub.system.storage(Storage.CALIBRATION, read=CALIBRATION_SIZE)
+        except Exception:
+            return
+        if data[0] != CALIBRATION_MARKER:
+            return
+        self._set_ranges(data[1], data[2], data[3], data[4])
+
+    def _set_ranges(self, left_black, left_white, right_black, right_white):
+        self.ranges = [
+            (left_black, (100 << 8) // max(1, left_white - left_black)),
+            (right_black, (100 << 8) // max(1, right_white - right_black)),
+        ]
+        self.is_calibrated = True
+
+    def save(self, left_black, left_white, right_black, right_white):
+        """
+        Store a new calibration and use it right away
+
+        Args:
+            left_black, left_white: Lowest/highest raw reflection of the left sensor
+            right_black, right_white: Lowest/highest raw reflection of the right sensor
+        """
+        self.hub.system.storage(Storage.CALIBRATION, write=bytes(
+            (CALIBRATION_MARKER, left_black, left_white, right_black, right_white)))
+        self._set_ranges(left_black, left_white, right_black, right_white)
+
+    def clear(self):
+        """Forget the stored calibration (back to raw reflection)"""
+        self.hub.system.storage(Storage.CALIBRATION, write=bytes(CALIBRATION_SIZE))
+        self.ranges = [(0, 256), (0, 256)]
+        self.is_calibrated = False
+
+    def normalize(self, side, raw):
+        """
+        Convert one raw reflection reading to 0 (black) - 100 (white)
+
+        Args:
+            side: LEFT or RIGHT
+            raw: Raw reflection() value
+        """
+        black, scale = self.ranges[side]
+        value = ((raw - black) * scale) >> 8
+        return 0 if value < 0 else (100 if value > 100 else value)
+
+    def reader(self, sensor, side):
+        """
+        Get a function that reads normalized reflection from a sensor
+
+        Without calibration this is just sensor.reflection, so uncalibrated
+        robots pay nothing extra. With calibration the transform uses only
+        integer math (no float allocations in fast loops).
+
+        Args:
+            sensor: ColorSensor to read
+            side: LEFT or RIGHT (which calibration to apply)
+
+        Returns:
+            Function with no arguments returning 0-100
+        """
+        reflection = sensor.reflection
+        black, scale = self.ranges[side]
+        if black == 0 and scale == 256:
+            return reflection
+
+        def read():
+            value = ((reflection() - black) * scale) >> 8
+            return 0 if value < 0 else (100 if value > 100 else value)
+        return read
+
+    def converter(self, side):
+        """
+        Get a function that normalizes raw reflection readings of one sensor
+
+        For step generators, which read the sensor themselves
+        (raw = yield sensor.reflection(), see multitask_utils.py) and
+        convert the reading afterwards.
+
+        Args:
+            side: LEFT or RIGHT (which calibration to apply)
+
+        Returns:
+            Function raw -> 0-100, or None without calibration (use the raw value)
+        """
+        black, scale = self.ranges[side]
+        if black == 0 and scale == 256:
+            return None
+
+        def convert(raw):
+            value = ((raw - black) * scale) >> 8
+            return 0 if value < 0 else (100 if value > 100 else value)
+        return convert
+
+    def calibrate(self, robot, distance=None, speed=None):
+        """
+        Sweep both sensors over a black line and store their ranges
+
+        Place the robot so both sensors are on white just before a black
+        line. The robot drives forward over the line and back again while
+        recording the darkest and brightest reading of each sensor.
+
+        Args:
+            robot: RobotController object (already initialized)
+            distance: How far to drive over the line in mm (default: CALIBRATION_DISTANCE)
+            speed: Sweep speed in mm/s (default: CALIBRATION_SPEED)
+
+        Returns:
+            ((left_black, left_white), (right_black, right_white)) raw values
+
+        Raises:
+            RuntimeError: A sensor is missing or did not see both black and white
+        """
+        left_sensor = robot.left_color_sensor
+        right_sensor = robot.right_color_sensor
+        if not (left_sensor and right_sensor):
+            raise RuntimeError("Calibration needs both color sensors!")
+
+        if distance is None:
+            distance = robot.config.get('calibration_distance', 120)
+        if speed is None:
+            speed = robot.config.get('calibration_speed', 60)
+
+        left_reflect = left_sensor.reflection
+        right_reflect = right_sensor.reflection
+        left_black = right_black = 100
+        left_white = right_white = 0
+
+        drivebase = robot.drivebase
+        drivebase.settings(straight_speed=speed)
+        for move in (distance, -distance):
+            drivebase.straight(move, wait=False)
+            while not drivebase.done():
+                left = left_reflect()
+                right = right_reflect()
+                if left < left_black:
+                    left_black = left
+                if left > left_white:
+                    left_white = left
+                if right < right_black:
+                    right_black = right
+                if right > right_white:
+                    right_white = right
+                wait(5)
+        robot._apply_drive_settings()
+
+        if robot.log_level >= LogLevel.INFO:
+            print(f"Left sensor:  black {left_black}%  white {left_white}%")
+            print(f"Right sensor: black {right_black}%  white {right_white}%")
+
+        if left_white - left_black < MIN_SPAN or right_white - right_black < MIN_SPAN:
+            raise RuntimeError("A sensor did not see both black and white - start just before a line")
+
+        self.save(left_black, left_white, right_black, right_white)
+        # robot.snapshot() caches readers built with the old ranges
+        robot._snapshot = None
+        return ((left_black, left_white), (right_black, right_white))
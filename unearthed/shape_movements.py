@@ -4,7 +4,9 @@ Common geometric movement functions for robot missions
 """
 
 from pybricks.tools import wait
+from pybricks.parameters import Stop
 import umath as math
+from season_config import LogLevel
 
 
 class ShapeMovements:
@@ -19,212 +21,336 @@ class ShapeMovements:
         """
         self.robot = robot_controller
         self.drivebase = robot_controller.drivebase
+        self.verbose = robot_controller.log_level >= LogLevel.INFO
     
-    def drive_square(self, side_length=300, pause_at_corners=True):
+    def _to_field(self, points):
         """
-        Drive robot in a square pattern
-        
+        Convert points relative to the robot into field positions
+
         Args:
-            side_length: Length of each side in mm
-            pause_at_corners: Whether to pause briefly at each corner
+            points: Sequence of (right, forward) offsets in mm from where the
+                robot is now (forward = the way it is facing)
+        """
+        x, y, heading = self.robot.update_pose()
+        s = math.sin(heading * math.pi / 180)
+        c = math.cos(heading * math.pi / 180)
+        return [(x + right * c + forward * s, y - right * s + forward * c)
+                for right, forward in points]
+
+    def _pose_error(self, x, y, heading):
+        """
+        How far the robot's pose ended up from where a shape should end
+
+        Args:
+            x, y, heading: Planned end pose (field coordinates)
+
+        Returns:
+            (distance_mm, heading_deg) tuple - heading error is -180..180
+        """
+        end_x, end_y, end_heading = self.robot.update_pose()
+        dx = end_x - x
+        dy = end_y - y
+        error = (math.sqrt(dx * dx + dy * dy), (end_heading - heading + 180) % 360 - 180)
+        if self.verbose:
+            print(f"Pose error: {error[0]:.0f} mm, {error[1]:.1f} deg")
+        return error
+
+    def _curve_speed(self, radius, speed=None):
+        """
+        Set the drivebase speed for arcs of a radius and return it
+
+        Same limit as robot.follow_path: sideways acceleration in the arc
+        stays below PATH_LATERAL_ACCELERATION. Call while stopped, and
+        robot._apply_drive_settings() afterwards.
+        """
+        if speed is None:
+            speed = self.robot.config.get('drive_speed', 200)
+        lateral_accel = self.robot.config.get('path_lateral_acceleration', 400)
+        speed = min(speed, math.sqrt(lateral_accel * radius))
+        self.drivebase.settings(straight_speed=speed, turn_rate=speed / radius * 180 / math.pi)
+        return speed
+
+    def drive_polygon(self, points, corner_radius=None):
+        """
+        Drive a closed shape through corners given relative to the robot
+
+        The robot should start in the middle of the first side, facing along
+        it. The path goes through every corner (rounded with an arc, see
+        robot.follow_path) and back to the start, so it ends where it began,
+        facing the same way.
+
+        Args:
+            points: Corners as (right, forward) offsets in mm from the start
+            corner_radius: Arc radius at each corner in mm (default: PATH_CORNER_RADIUS)
+
+        Returns:
+            (distance_mm, heading_deg) pose error at the end
         """
         if not self.robot.is_initialized:
             raise RuntimeError("Robot not initialized")
-        
-        print(f"Driving square with {side_length}mm sides")
-        
-        for corner in range(4):
-            # Drive straight for one side
-            self.drivebase.straight(side_length)
-            
-            if pause_at_corners:
-                wait(500)
-            
-            # Turn 90 degrees clockwise
-            self.drivebase.turn(-90)
-            
-            if pause_at_corners:
-                wait(500)
-        
-        print("Square drive complete")
-    
-    def drive_rectangle(self, width=300, height=200, pause_at_corners=True):
+        start = self.robot.update_pose()
+        self.robot.follow_path(self._to_field(list(points) + [(0, 0)]), corner_radius)
+        return self._pose_error(*start)
+
+    def drive_square(self, side_length=300, corner_radius=None, clockwise=False):
+        """
+        Drive robot in a square pattern
+
+        Starts and ends in the middle of the first side without stopping at
+        the corners.
+
+        Args:
+            side_length: Length of each side in mm
+            corner_radius: Arc radius at each corner in mm (default: PATH_CORNER_RADIUS)
+            clockwise: Turn right at the corners instead of left
+
+        Returns:
+            (distance_mm, heading_deg) pose error at the end
+        """
+        if self.verbose:
+            print(f"Driving square with {side_length}mm sides")
+
+        error = self.drive_rectangle(side_length, side_length, corner_radius, clockwise)
+
+        if self.verbose:
+            print("Square drive complete")
+        return error
+
+    def drive_rectangle(self, width=300, height=200, corner_radius=None, clockwise=False):
         """
         Drive robot in a rectangle pattern
-        
+
+        Starts and ends in the middle of the first (width) side without
+        stopping at the corners.
+
         Args:
-            width: Width of rectangle in mm
+            width: Width of rectangle in mm (the side the robot starts on)
             height: Height of rectangle in mm
-            pause_at_corners: Whether to pause briefly at each corner
+            corner_radius: Arc radius at each corner in mm (default: PATH_CORNER_RADIUS)
+            clockwise: Turn right at the corners instead of left
+
+        Returns:
+            (distance_mm, heading_deg) pose error at the end
         """
-        if not self.robot.is_initialized:
-            raise RuntimeError("Robot not initialized")
-        
-        print(f"Driving rectangle {width}mm x {height}mm")
-        
-        for side in range(2):
-            # Drive width
-            self.drivebase.straight(width)
-            if pause_at_corners:
-                wait(500)
-            self.drivebase.turn(-90)
-            if pause_at_corners:
-                wait(500)
-            
-            # Drive height
-            self.drivebase.straight(height)
-            if pause_at_corners:
-                wait(500)
-            self.drivebase.turn(-90)
-            if pause_at_corners:
-                wait(500)
-        
-        print("Rectangle drive complete")
-    
-    def drive_triangle(self, side_length=300, pause_at_corners=True):
+        if self.verbose:
+            print(f"Driving rectangle {width}mm x {height}mm")
+
+        side = height if clockwise else -height
+        error = self.drive_polygon((
+            (0, width / 2),
+            (side, width / 2),
+            (side, -width / 2),
+            (0, -width / 2),
+        ), corner_radius)
+
+        if self.verbose:
+            print("Rectangle drive complete")
+        return error
+
+    def drive_triangle(self, side_length=300, corner_radius=None, clockwise=False):
         """
         Drive robot in an equilateral triangle pattern
-        
+
+        Starts and ends in the middle of the first side without stopping at
+        the corners.
+
         Args:
             side_length: Length of each side in mm
-            pause_at_corners: Whether to pause briefly at each corner
+            corner_radius: Arc radius at each corner in mm (default: PATH_CORNER_RADIUS)
+            clockwise: Turn right at the corners instead of left
+
+        Returns:
+            (distance_mm, heading_deg) pose error at the end
         """
-        if not self.robot.is_initialized:
-            raise RuntimeError("Robot not initialized")
-        
-        print(f"Driving triangle with {side_length}mm sides")
-        
-        for corner in range(3):
-            # Drive straight for one side
-            self.drivebase.straight(side_length)
-            
-            if pause_at_corners:
-                wait(500)
-            
-            # Turn 120 degrees clockwise (exterior angle of equilateral triangle)
-            self.drivebase.turn(-120)
-            
-            if pause_at_corners:
-                wait(500)
-        
-        print("Triangle drive complete")
-    
-    def drive_circle(self, radius=150, clockwise=True):
+        if self.verbose:
+            print(f"Driving triangle with {side_length}mm sides")
+
+        # Apex of the triangle, opposite the starting side
+        apex = side_length * math.sqrt(3) / 2
+        error = self.drive_polygon((
+            (0, side_length / 2),
+            (apex if clockwise else -apex, 0),
+            (0, -side_length / 2),
+        ), corner_radius)
+
+        if self.verbose:
+            print("Triangle drive complete")
+        return error
+
+    def drive_circle(self, radius=150, clockwise=True, speed=None):
         """
         Drive robot in a circle pattern
-        
+
+        One drivebase.arc() of 360 degrees: the drivebase tracks the angle
+        itself, so the circle closes no matter how fast the robot
+        accelerates. Speed is limited like robot.follow_path corners.
+
         Args:
             radius: Circle radius in mm
             clockwise: Direction of circle (True for clockwise)
+            speed: Highest speed in mm/s (default: drive_speed)
+
+        Returns:
+            (distance_mm, heading_deg) pose error back at the start
         """
         if not self.robot.is_initialized:
             raise RuntimeError("Robot not initialized")
-        
-        print(f"Driving circle with {radius}mm radius")
-        
-        # Calculate circumference
-        circumference = 2 * math.pi * radius
-        
-        # Calculate the turn rate needed for the circle
-        # For a smooth circle, we need to turn while moving
-        # Turn rate = (speed / radius) * (180 / pi) to convert to degrees/second
-        drive_speed = self.robot.config.get('drive_speed', 200)
-        turn_rate = (drive_speed / radius) * (180 / math.pi)
-        
-        # Adjust direction
-        if not clockwise:
-            turn_rate = -turn_rate
-        
-        # Drive in circle by combining straight movement with turning
-        duration = (circumference / drive_speed) * 1000  # Convert to milliseconds
-        
-        self.drivebase.drive(drive_speed, turn_rate)
-        wait(int(duration))
-        self.drivebase.stop()
-        
-        print("Circle drive complete")
-    
-    def drive_figure_eight(self, radius=100):
+
+        if self.verbose:
+            print(f"Driving circle with {radius}mm radius")
+
+        start = self.robot.update_pose()
+        self._curve_speed(radius, speed)
+        self.drivebase.arc(radius if clockwise else -radius, 360)
+        self.robot._apply_drive_settings()
+        error = self._pose_error(*start)
+
+        if self.verbose:
+            print("Circle drive complete")
+        return error
+
+    def drive_figure_eight(self, radius=100, speed=None):
         """
         Drive robot in a figure-eight pattern
-        
+
+        A clockwise circle flows straight into a counter-clockwise one
+        (then=Stop.NONE), so the robot does not stop at the crossing.
+
         Args:
             radius: Radius of each circle in the figure-eight
+            speed: Highest speed in mm/s (default: drive_speed)
+
+        Returns:
+            (distance_mm, heading_deg) pose error back at the start
         """
         if not self.robot.is_initialized:
             raise RuntimeError("Robot not initialized")
-        
-        print(f"Driving figure-eight with {radius}mm radius circles")
-        
-        # First circle (clockwise)
-        self.drive_circle(radius, clockwise=True)
-        
-        # Brief pause at intersection
-        wait(500)
-        
-        # Second circle (counter-clockwise)
-        self.drive_circle(radius, clockwise=False)
-        
-        print("Figure-eight drive complete")
-    
-    def drive_zigzag(self, segment_length=200, angle=45, segments=6):
+
+        if self.verbose:
+            print(f"Driving figure-eight with {radius}mm radius circles")
+
+        start = self.robot.update_pose()
+        self._curve_speed(radius, speed)
+        # Pose is updated after each circle: each update must cover one arc
+        self.drivebase.arc(radius, 360, then=Stop.NONE)
+        self.robot.update_pose()
+        self.drivebase.arc(-radius, 360)
+        self.robot._apply_drive_settings()
+        error = self._pose_error(*start)
+
+        if self.verbose:
+            print("Figure-eight drive complete")
+        return error
+
+    def drive_zigzag(self, segment_length=200, angle=45, segments=6, corner_radius=None):
         """
         Drive robot in a zigzag pattern
-        
+
+        Same segments and turns as before, but the corners are rounded
+        (robot.follow_path), so the robot no longer stops to turn in place.
+
         Args:
             segment_length: Length of each zigzag segment in mm
-            angle: Angle of zigzag turns in degrees
+            angle: Angle of zigzag turns in degrees (first turn to the right)
             segments: Number of segments to drive
+            corner_radius: Arc radius at each corner in mm (default: PATH_CORNER_RADIUS)
+
+        Returns:
+            (distance_mm, heading_deg) pose error at the end
         """
         if not self.robot.is_initialized:
             raise RuntimeError("Robot not initialized")
-        
-        print(f"Driving zigzag with {segments} segments")
-        
-        # Start with first segment
-        self.drivebase.straight(segment_length)
-        
-        for segment in range(segments - 1):
-            # Alternate turn direction
-            turn_angle = angle if segment % 2 == 0 else -angle
-            self.drivebase.turn(turn_angle)
-            
-            # Drive next segment
-            self.drivebase.straight(segment_length)
-        
-        print("Zigzag drive complete")
-    
-    def drive_spiral(self, start_radius=50, end_radius=200, turns=3):
+
+        if self.verbose:
+            print(f"Driving zigzag with {segments} segments")
+
+        # Corners as (right, forward) offsets, turning +angle, -angle, ...
+        points = []
+        right = forward = 0
+        direction = 0
+        for segment in range(segments):
+            if segment:
+                direction += angle if segment % 2 == 1 else -angle
+            right += segment_length * math.sin(direction * math.pi / 180)
+            forward += segment_length * math.cos(direction * math.pi / 180)
+            points.append((right, forward))
+
+        start_heading = self.robot.update_pose()[2]
+        points = self._to_field(points)
+        self.robot.follow_path(points, corner_radius)
+        end = points[-1]
+        error = self._pose_error(end[0], end[1], start_heading + direction)
+
+        if self.verbose:
+            print("Zigzag drive complete")
+        return error
+
+    def drive_spiral(self, start_radius=50, end_radius=200, turns=3, clockwise=True, speed=None):
         """
         Drive robot in an outward spiral pattern
-        
+
+        The radius grows smoothly with the angle turned (an Archimedean
+        spiral). Every loop reads the drivebase heading, works out the radius
+        for that angle and sets the turn rate to match, so the shape only
+        depends on how far the robot has turned - not on time.
+
         Args:
             start_radius: Starting radius in mm
             end_radius: Ending radius in mm
             turns: Number of complete turns in the spiral
+            clockwise: Direction of the spiral (True for clockwise)
+            speed: Speed in mm/s (default: drive_speed, limited in the tightest part)
+
+        Returns:
+            (distance_mm, heading_deg) pose error against the planned spiral end
         """
         if not self.robot.is_initialized:
             raise RuntimeError("Robot not initialized")
-        
-        print(f"Driving spiral from {start_radius}mm to {end_radius}mm")
-        
-        drive_speed = self.robot.config.get('drive_speed', 200)
-        
-        # Calculate spiral parameters
-        radius_increment = (end_radius - start_radius) / turns
-        
-        for turn in range(turns):
-            current_radius = start_radius + (turn * radius_increment)
-            
-            # Calculate turn rate for current radius
-            turn_rate = (drive_speed / current_radius) * (180 / math.pi)
-            
-            # Drive one complete turn at current radius
-            circumference = 2 * math.pi * current_radius
-            duration = (circumference / drive_speed) * 1000
-            
-            self.drivebase.drive(drive_speed, -turn_rate)  # Negative for clockwise
-            wait(int(duration))
-        
-        self.drivebase.stop()
-        print("Spiral drive complete")
+
+        if self.verbose:
+            print(f"Driving spiral from {start_radius}mm to {end_radius}mm")
+
+        if speed is None:
+            speed = self.robot.config.get('drive_speed', 200)
+        lateral_accel = self.robot.config.get('path_lateral_acceleration', 400)
+        speed = min(speed, math.sqrt(lateral_accel * min(start_radius, end_radius)))
+        total = 360 * turns
+        growth = (end_radius - start_radius) / total     # mm of radius per degree
+        sign = 1 if clockwise else -1
+
+        # Planned end pose: add up the spiral in 2 degree arcs
+        x, y, heading = self.robot.update_pose()
+        pieces = int(total / 2) + 1
+        step = total / pieces
+        for i in range(pieces):
+            middle = (i + 0.5) * step
+            chord = 2 * (start_radius + growth * middle) * math.sin(step * math.pi / 360)
+            direction = (heading + sign * middle) * math.pi / 180
+            x += chord * math.sin(direction)
+            y += chord * math.cos(direction)
+        heading += sign * total
+
+        # deg/s of turn rate = speed / radius in rad/s
+        rate = sign * speed * 180 / math.pi
+        angle = self.drivebase.angle
+        drive = self.drivebase.drive
+        update_pose = self.robot.update_pose
+        start_angle = angle()
+        while True:
+            turned = abs(angle() - start_angle)
+            if turned >= total:
+                break
+            drive(speed, rate / (start_radius + growth * turned))
+            update_pose()
+            wait(10)
+
+        # Let the robot come to rest so the error includes the overshoot
+        self.drivebase.brake()
+        while abs(self.drivebase.state()[1]) > 5:
+            update_pose()
+            wait(10)
+        error = self._pose_error(x, y, heading)
+
+        if self.verbose:
+            print("Spiral drive complete")
+        return error
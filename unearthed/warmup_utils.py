@@ -4,9 +4,11 @@ Helps get consistent motor performance by warming up before missions
 """
 
 from pybricks.tools import wait, StopWatch
+from season_config import LogLevel
+from robot_controller import SNAP_LEFT_SPEED, SNAP_RIGHT_SPEED, no_reading
 
 
-def warm_up_until_stable(robot, target_speed=200, readings_needed=5, timeout_ms=3000):
+def warm_up_until_stable(robot, target_speed=200, readings_needed=5, timeout_ms=3000, speed_filter=None):
     """
     Run motors until speed is consistent.
 
@@ -15,11 +17,17 @@ def warm_up_until_stable(robot, target_speed=200, readings_needed=5, timeout_ms=
         target_speed: Target drive speed in mm/s (default 200)
         readings_needed: How many stable readings in a row (default 5)
         timeout_ms: Maximum warm-up time in milliseconds (default 3000)
+        speed_filter: Optional filter for the measured speed, e.g. Median(3)
+            from reflection_filters.py, so one noisy reading doesn't reset the count
 
     Returns:
         True if stable, False if timed out
     """
-    print("=== Motor Warm-Up Starting ===")
+    info = robot.log_level >= LogLevel.INFO
+    debug = robot.log_level >= LogLevel.DEBUG
+
+    if info:
+        print("=== Motor Warm-Up Starting ===")
     timer = StopWatch()
     stable_readings = 0
 
@@ -32,37 +40,48 @@ def warm_up_until_stable(robot, target_speed=200, readings_needed=5, timeout_ms=
     wheel_diameter = Specifications.WHEEL_DIAMETER
     expected_deg_s = target_speed * 360 / (3.14159 * wheel_diameter)
 
-    print(f"Target: {target_speed} mm/s = {expected_deg_s:.0f} deg/s at wheels")
+    if debug:
+        print(f"Target: {target_speed} mm/s = {expected_deg_s:.0f} deg/s at wheels")
+
+    # Both wheel speeds are read together into one preallocated snapshot
+    state = robot.new_snapshot()
+    snapshot = robot.snapshot_function(no_reading, no_reading)
 
     while stable_readings < readings_needed:
         wait(50)  # Check every 50ms
 
         # Get actual motor speeds
-        left_speed = robot.left_wheel.speed()
-        right_speed = robot.right_wheel.speed()
-        avg_speed = (abs(left_speed) + abs(right_speed)) / 2
+        snapshot(state)
+        left_speed = state[SNAP_LEFT_SPEED]
+        right_speed = state[SNAP_RIGHT_SPEED]
+        avg_speed = (abs(left_speed) + abs(right_speed)) // 2
+        if speed_filter is not None:
+            avg_speed = speed_filter.update(avg_speed)
 
         # Check if we're close to target (within 5%)
         tolerance = expected_deg_s * 0.05
 
         if abs(avg_speed - expected_deg_s) < tolerance:
             stable_readings += 1
-            print(f"Stable: {stable_readings}/{readings_needed} ({avg_speed:.0f} deg/s)")
+            if debug:
+                print(f"Stable: {stable_readings}/{readings_needed} ({avg_speed:.0f} deg/s)")
         else:
             stable_readings = 0  # Reset if not stable
-            print(f"Warming: {avg_speed:.0f} deg/s (need {expected_deg_s:.0f})")
+            if debug:
+                print(f"Warming: {avg_speed:.0f} deg/s (need {expected_deg_s:.0f})")
 
         # Safety timeout
         if timer.time() > timeout_ms:
-            print("Timeout reached - proceeding anyway")
             robot.drivebase.stop()
             wait(200)
-            print("=== Warm-Up Complete (timed out) ===")
+            if info:
+                print("=== Warm-Up Complete (timed out) ===")
             return False
 
     robot.drivebase.stop()
     wait(200)
-    print("=== Warm-Up Complete (stable!) ===")
+    if info:
+        print("=== Warm-Up Complete (stable!) ===")
     return True
 
 
@@ -76,7 +95,10 @@ def quick_warm_up(robot, duration_ms=1000):
 
     This is simpler than warm_up_until_stable() but usually works well!
     """
-    print("=== Quick Warm-Up ===")
+    info = robot.log_level >= LogLevel.INFO
+
+    if info:
+        print("=== Quick Warm-Up ===")
     half_time = duration_ms // 2
 
     # Drive forward
@@ -90,7 +112,8 @@ def quick_warm_up(robot, duration_ms=1000):
     # Stop and settle
     robot.drivebase.stop()
     wait(200)
-    print("=== Warm-Up Complete ===")
+    if info:
+        print("=== Warm-Up Complete ===")
 
 
 # Example usage (when running this file directly)